@@ -0,0 +1,66 @@
+"""Add payment_webhook_events inbox table
+
+Revision ID: 015_add_payment_webhook_events
+Revises: 014_change_product_image_url_to_text
+Create Date: 2025-02-03 10:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "015_add_payment_webhook_events"
+down_revision: str = "014_change_product_image_url_to_text"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_webhook_events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "provider",
+            postgresql.ENUM("Stripe", "Razorpay", "Manual", name="paymentprovider", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("provider_event_id", sa.String(length=255), nullable=False),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("provider_reference", sa.String(length=255), nullable=True),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default=sa.text("'Pending'")),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("received_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("processed_date", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("provider", "provider_event_id", name="uq_payment_webhook_events_provider_event"),
+    )
+    # Workers only ever scan pending rows, oldest first
+    op.create_index(
+        "ix_payment_webhook_events_pending",
+        "payment_webhook_events",
+        ["received_date"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Pending'"),
+        if_not_exists=True,
+    )
+    # Webhooks look transactions up by the provider's intent/order ID
+    op.create_index(
+        "ix_payment_transactions_provider_payment_intent_id",
+        "payment_transactions",
+        ["provider_payment_intent_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_payment_transactions_provider_payment_intent_id", table_name="payment_transactions", if_exists=True
+    )
+    op.drop_index("ix_payment_webhook_events_pending", table_name="payment_webhook_events", if_exists=True)
+    op.drop_table("payment_webhook_events")
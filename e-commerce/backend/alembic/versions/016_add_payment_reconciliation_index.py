@@ -0,0 +1,33 @@
+"""Add partial index for payment reconciliation scans
+
+Revision ID: 016_add_payment_reconciliation_index
+Revises: 015_add_payment_webhook_events
+Create Date: 2025-02-04 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "016_add_payment_reconciliation_index"
+down_revision: str = "015_add_payment_webhook_events"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # Reconciliation pages open transactions per provider by (created_date, id)
+    op.create_index(
+        "ix_payment_transactions_open_provider_created",
+        "payment_transactions",
+        ["provider", "created_date", "id"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('Pending', 'Processing')"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_transactions_open_provider_created", table_name="payment_transactions", if_exists=True)
@@ -0,0 +1,49 @@
+"""Add discount_redemptions ledger
+
+Revision ID: 017_add_discount_redemptions
+Revises: 016_add_payment_reconciliation_index
+Create Date: 2025-02-05 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "017_add_discount_redemptions"
+down_revision: str = "016_add_payment_reconciliation_index"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "discount_redemptions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("discount_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("discounts.id"), nullable=False),
+        sa.Column("customer_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orders.id"), nullable=True),
+        sa.Column("discount_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("redeemed_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_discount_redemptions_tenant_id", "discount_redemptions", ["tenant_id"], unique=False)
+    op.create_index("ix_discount_redemptions_order_id", "discount_redemptions", ["order_id"], unique=False)
+    # Per-customer limits count a customer's redemptions of one discount
+    op.create_index(
+        "ix_discount_redemptions_discount_customer",
+        "discount_redemptions",
+        ["discount_id", "customer_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_discount_redemptions_discount_customer", table_name="discount_redemptions")
+    op.drop_index("ix_discount_redemptions_order_id", table_name="discount_redemptions")
+    op.drop_index("ix_discount_redemptions_tenant_id", table_name="discount_redemptions")
+    op.drop_table("discount_redemptions")
@@ -0,0 +1,52 @@
+"""Add per-tenant metal rates for jewelry pricing
+
+Revision ID: 018_add_metal_rates
+Revises: 017_add_discount_redemptions
+Create Date: 2025-02-06 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "018_add_metal_rates"
+down_revision: str = "017_add_discount_redemptions"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metal_rates",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("material", sa.String(length=100), nullable=False),
+        sa.Column("purity", sa.String(length=50), nullable=False),
+        sa.Column("rate_per_gram", sa.Numeric(10, 2), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False, server_default="INR"),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("modified_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("modified_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", "material", "purity", name="uq_metal_rates_tenant_material_purity"),
+    )
+    op.create_index("ix_metal_rates_tenant_id", "metal_rates", ["tenant_id"], unique=False)
+
+    # Repricing selects a tenant's products by metal and purity when a rate changes
+    op.create_index(
+        "ix_products_tenant_material_purity",
+        "products",
+        ["tenant_id", sa.text("lower(material)"), sa.text("lower(purity)")],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_tenant_material_purity", table_name="products")
+    op.drop_index("ix_metal_rates_tenant_id", table_name="metal_rates")
+    op.drop_table("metal_rates")
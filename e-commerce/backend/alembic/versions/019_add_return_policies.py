@@ -0,0 +1,52 @@
+"""Add per-tenant return policies
+
+Revision ID: 019_add_return_policies
+Revises: 018_add_metal_rates
+Create Date: 2025-02-07 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "019_add_return_policies"
+down_revision: str = "018_add_metal_rates"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "return_policies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("auto_approval_enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("auto_approve_max_amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("auto_approve_max_order_age_days", sa.Integer(), nullable=False),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("modified_by", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("modified_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", name="uq_return_policies_tenant"),
+    )
+    op.create_index("ix_return_policies_tenant_id", "return_policies", ["tenant_id"], unique=False)
+
+    # Auto-approval excludes customers with a rejected return
+    op.create_index(
+        "ix_return_requests_rejected_customer",
+        "return_requests",
+        ["tenant_id", "customer_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Rejected'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_return_requests_rejected_customer", table_name="return_requests")
+    op.drop_index("ix_return_policies_tenant_id", table_name="return_policies")
+    op.drop_table("return_policies")
@@ -0,0 +1,111 @@
+"""Add return SLA deadlines, per-tenant SLA policy and notification log
+
+Revision ID: 020_add_return_sla_tracking
+Revises: 019_add_return_policies
+Create Date: 2025-02-09 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = "020_add_return_sla_tracking"
+down_revision: str = "019_add_return_policies"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+SLA_COLUMNS = ("acknowledge_warning_date", "acknowledge_due_date", "resolve_warning_date", "resolve_due_date")
+
+BACKFILL_DEADLINES = sa.text(
+    """
+    UPDATE return_requests r
+    SET acknowledge_warning_date = r.created_date + make_interval(hours => p.ack_hours) * :warning_ratio,
+        acknowledge_due_date = r.created_date + make_interval(hours => p.ack_hours),
+        resolve_warning_date = r.created_date + make_interval(hours => p.resolve_hours) * :warning_ratio,
+        resolve_due_date = r.created_date + make_interval(hours => p.resolve_hours)
+    FROM (
+        SELECT t.tenant_id,
+               coalesce(rp.acknowledgement_sla_hours, :default_ack_hours) AS ack_hours,
+               coalesce(rp.resolution_sla_hours, :default_resolve_hours) AS resolve_hours
+        FROM (SELECT DISTINCT tenant_id FROM return_requests) t
+        LEFT JOIN return_policies rp ON rp.tenant_id = t.tenant_id
+    ) p
+    WHERE p.tenant_id = r.tenant_id AND r.status IN ('Pending', 'Approved')
+    """
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "return_policies",
+        sa.Column("acknowledgement_sla_hours", sa.Integer(), nullable=False, server_default="24"),
+    )
+    op.add_column(
+        "return_policies",
+        sa.Column("resolution_sla_hours", sa.Integer(), nullable=False, server_default="72"),
+    )
+
+    for column in SLA_COLUMNS:
+        op.add_column("return_requests", sa.Column(column, sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill open returns with the same defaults and warning ratio as the runtime settings
+    settings = get_settings()
+    op.execute(
+        BACKFILL_DEADLINES.bindparams(
+            warning_ratio=settings.return_sla_warning_ratio,
+            default_ack_hours=settings.return_acknowledgement_sla_hours,
+            default_resolve_hours=settings.return_resolution_sla_hours,
+        )
+    )
+    op.create_index(
+        "ix_return_requests_acknowledge_sla",
+        "return_requests",
+        ["acknowledge_warning_date"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Pending'"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_return_requests_resolve_sla",
+        "return_requests",
+        ["resolve_warning_date"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Approved'"),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "return_sla_notifications",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "return_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("return_requests.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("sla_type", sa.String(length=32), nullable=False),
+        sa.Column("level", sa.String(length=16), nullable=False),
+        sa.Column("notified_date", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("return_id", "sla_type", "level", name="uq_return_sla_notifications_return_type_level"),
+    )
+    op.create_index(
+        "ix_return_sla_notifications_tenant_id", "return_sla_notifications", ["tenant_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_return_sla_notifications_tenant_id", table_name="return_sla_notifications")
+    op.drop_table("return_sla_notifications")
+    op.drop_index("ix_return_requests_resolve_sla", table_name="return_requests")
+    op.drop_index("ix_return_requests_acknowledge_sla", table_name="return_requests")
+    for column in reversed(SLA_COLUMNS):
+        op.drop_column("return_requests", column)
+    op.drop_column("return_policies", "resolution_sla_hours")
+    op.drop_column("return_policies", "acknowledgement_sla_hours")
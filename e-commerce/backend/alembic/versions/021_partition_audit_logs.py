@@ -0,0 +1,99 @@
+"""Partition audit_logs by month on created_date
+
+Revision ID: 021_partition_audit_logs
+Revises: 020_add_return_sla_tracking
+Create Date: 2025-02-11 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = "021_partition_audit_logs"
+down_revision: str = "020_add_return_sla_tracking"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+COLUMNS = "id, entity_type, entity_id, tenant_id, action, actor_id, changes, ip_address, user_agent, created_date"
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity_type", sa.String(length=100), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("actor_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("changes", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("created_date", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table("audit_logs", "audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+    for index in ("ix_audit_logs_entity_type", "ix_audit_logs_entity_id", "ix_audit_logs_tenant_id", "ix_audit_logs_action"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.create_table(
+        "audit_logs",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_date", name="audit_logs_pkey"),
+        postgresql_partition_by="RANGE (created_date)",
+    )
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    # One partition per month from the oldest existing entry through the months
+    # AuditPartitionService.ensure_partitions keeps ahead; DO blocks take no bind parameters
+    months_ahead = int(get_settings().audit_partition_months_ahead)
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', coalesce((SELECT min(created_date) FROM audit_logs_legacy), now()))::date;
+            last_month date := (date_trunc('month', now()) + interval '{months_ahead} months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_legacy")
+    op.drop_table("audit_logs_legacy")
+
+    # Indexes on the parent cascade to every partition
+    op.create_index("ix_audit_logs_tenant_created", "audit_logs", ["tenant_id", "created_date"], unique=False)
+    op.create_index(
+        "ix_audit_logs_entity", "audit_logs", ["entity_type", "entity_id", "created_date"], unique=False
+    )
+    op.create_index("ix_audit_logs_created_date", "audit_logs", ["created_date"], unique=False)
+
+
+def downgrade() -> None:
+    op.rename_table("audit_logs", "audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    for index in ("ix_audit_logs_tenant_created", "ix_audit_logs_entity", "ix_audit_logs_created_date"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.create_table("audit_logs", *_columns(), sa.PrimaryKeyConstraint("id", name="audit_logs_pkey"))
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+
+    op.create_index("ix_audit_logs_entity_type", "audit_logs", ["entity_type"], unique=False)
+    op.create_index("ix_audit_logs_entity_id", "audit_logs", ["entity_id"], unique=False)
+    op.create_index("ix_audit_logs_tenant_id", "audit_logs", ["tenant_id"], unique=False)
+    op.create_index("ix_audit_logs_action", "audit_logs", ["action"], unique=False)
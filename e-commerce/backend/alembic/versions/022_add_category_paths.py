@@ -0,0 +1,51 @@
+"""Add materialized paths to categories
+
+Revision ID: 022_add_category_paths
+Revises: 021_partition_audit_logs
+Create Date: 2025-02-13 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "022_add_category_paths"
+down_revision: str = "021_partition_audit_logs"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.add_column("categories", sa.Column("path", sa.Text(), nullable=True))
+
+    # Backfill from parent_id; categories caught in a parent cycle fall back to roots
+    op.execute(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT id, '/' || id::text || '/' AS path
+            FROM categories
+            WHERE parent_id IS NULL
+            UNION ALL
+            SELECT c.id, tree.path || c.id::text || '/'
+            FROM categories c
+            JOIN tree ON c.parent_id = tree.id
+        )
+        UPDATE categories SET path = tree.path FROM tree WHERE tree.id = categories.id
+        """
+    )
+    op.execute("UPDATE categories SET path = '/' || id::text || '/', parent_id = NULL WHERE path IS NULL")
+    op.alter_column("categories", "path", nullable=False)
+    op.create_index(
+        "ix_categories_tenant_path",
+        "categories",
+        ["tenant_id", "path"],
+        unique=False,
+        postgresql_ops={"path": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categories_tenant_path", table_name="categories")
+    op.drop_column("categories", "path")
@@ -0,0 +1,74 @@
+"""Add composite and partial indexes matching the hot query shapes
+
+Revision ID: 023_add_query_shape_indexes
+Revises: 022_add_category_paths
+Create Date: 2025-02-15 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "023_add_query_shape_indexes"
+down_revision: str = "022_add_category_paths"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+NEWEST_FIRST = sa.text("created_date DESC")
+
+INDEXES = (
+    ("ix_orders_tenant_created", "orders", ["tenant_id", NEWEST_FIRST], {}),
+    ("ix_orders_tenant_customer_created", "orders", ["tenant_id", "customer_id", NEWEST_FIRST], {}),
+    ("ix_orders_tenant_status", "orders", ["tenant_id", "status"], {}),
+    (
+        "ix_orders_tenant_created_not_cancelled",
+        "orders",
+        ["tenant_id", "created_date"],
+        {
+            "postgresql_include": ["total_amount", "total_currency"],
+            "postgresql_where": sa.text("status <> 'Cancelled'"),
+        },
+    ),
+    ("ix_products_tenant_created", "products", ["tenant_id", NEWEST_FIRST], {}),
+    ("ix_return_requests_tenant_created", "return_requests", ["tenant_id", NEWEST_FIRST], {}),
+    (
+        "ix_return_requests_tenant_status_created",
+        "return_requests",
+        ["tenant_id", "status", NEWEST_FIRST],
+        {},
+    ),
+    ("ix_payment_transactions_order_status", "payment_transactions", ["order_id", "status"], {}),
+    ("ix_payment_transactions_tenant_status", "payment_transactions", ["tenant_id", "status"], {}),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so writes to these tables are not blocked while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **options
+            )
+        # Superseded by ix_payment_transactions_order_status
+        op.drop_index(
+            "ix_payment_transactions_order_id",
+            table_name="payment_transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payment_transactions_order_id",
+            "payment_transactions",
+            ["order_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,40 @@
+"""Scope product SKU, category slug and discount code uniqueness to the tenant
+
+Revision ID: 024_scope_unique_codes_to_tenant
+Revises: 023_add_query_shape_indexes
+Create Date: 2025-02-17 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "024_scope_unique_codes_to_tenant"
+down_revision: str = "023_add_query_shape_indexes"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+# (table, column, new constraint, old global unique index)
+SCOPED = (
+    ("products", "sku", "uq_products_tenant_sku", "ix_products_sku"),
+    ("categories", "slug", "uq_categories_tenant_slug", "ix_categories_slug"),
+    ("discounts", "code", "uq_discounts_tenant_code", "ix_discounts_code"),
+)
+
+
+def upgrade() -> None:
+    # Globally unique values are unique per tenant too, so existing rows always satisfy the new constraints
+    for table, column, constraint, _ in SCOPED:
+        op.create_unique_constraint(constraint, table, ["tenant_id", column])
+    op.execute("ALTER TABLE products DROP CONSTRAINT IF EXISTS products_sku_key")
+    for table, _, _, index in SCOPED:
+        op.drop_index(index, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    # Fails if two tenants have since reused the same value
+    for table, column, _, index in SCOPED:
+        op.create_index(index, table, [column], unique=True, if_not_exists=True)
+    for table, _, constraint, _ in reversed(SCOPED):
+        op.drop_constraint(constraint, table, type_="unique")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
@@ -24,6 +25,8 @@ async def list_audit_logs(
     entity_type: str | None = Query(None, description="Filter by entity type (e.g., Product, Order, User)"),
     entity_id: UUID | None = Query(None, description="Filter by specific entity ID"),
     action: AuditAction | None = Query(None, description="Filter by action type"),
+    date_from: datetime | None = Query(None, description="Entries at or after this time (default: lookback window)"),
+    date_to: datetime | None = Query(None, description="Entries before this time"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
     current_user: User = RequireTenantAdmin,
@@ -43,6 +46,8 @@ async def list_audit_logs(
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
+        date_from=date_from,
+        date_to=date_to,
         page=page,
         page_size=page_size,
     )
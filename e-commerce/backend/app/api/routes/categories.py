@@ -4,28 +4,42 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_cache import CATEGORIES, CatalogETag, EntityTag
 from app.core.security import get_request_actor
 from app.core.tenant import TenantContext, get_tenant_context
 from app.db.models.category import Category
 from app.db.session import get_session
-from app.schemas.category import CategoryCreate, CategoryListResponse, CategoryRead, CategoryUpdate
+from app.schemas.category import (
+    CategoryCreate,
+    CategoryListResponse,
+    CategoryRead,
+    CategoryTreeResponse,
+    CategoryUpdate,
+)
 from app.services.categories import CategoryService
+from app.services.category_tree import serialize_tree
 
 router = APIRouter(prefix="/api/v1/categories", tags=["Categories"])
 
 
 @router.get("", response_model=CategoryListResponse)
 async def list_categories(
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     page_size: int = Query(100, ge=1, le=200, alias="pageSize"),
     is_active: bool | None = Query(None, description="Filter by active status"),
+    etag: EntityTag = Depends(CatalogETag(CATEGORIES)),
 ):
     """List categories for the tenant."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = CategoryService(session)
     categories, total = await service.list_categories(
         tenant.tenant_id, page=page, page_size=page_size, is_active=is_active
@@ -38,13 +52,37 @@ async def list_categories(
     )
 
 
+@router.get("/tree", response_model=CategoryTreeResponse)
+async def get_category_tree(
+    response: Response,
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+    is_active: bool | None = Query(None, alias="isActive", description="Only include active categories"),
+    etag: EntityTag = Depends(CatalogETag(CATEGORIES)),
+):
+    """The tenant's full category hierarchy for navigation, nested by parent."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
+    service = CategoryService(session)
+    tree = await service.get_tree(tenant.tenant_id)
+    return CategoryTreeResponse(items=serialize_tree(tree.roots, is_active))
+
+
 @router.get("/{category_id}", response_model=CategoryRead)
 async def get_category(
     category_id: UUID,
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
+    etag: EntityTag = Depends(CatalogETag(CATEGORIES)),
 ):
     """Get category by ID."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = CategoryService(session)
     category = await service.get_category(tenant.tenant_id, category_id)
     return serialize_category(category)
@@ -93,4 +131,3 @@ def serialize_category(category: Category) -> CategoryRead:
             "modifiedDate": category.modified_date,
         },
     )
-
@@ -5,14 +5,17 @@ from __future__ import annotations
 from decimal import Decimal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_cache import DISCOUNT_USAGE, DISCOUNTS, CatalogETag, EntityTag
 from app.core.security import get_request_actor
 from app.core.tenant import TenantContext, get_tenant_context
 from app.db.models.discount import Discount, DiscountStatus
 from app.db.session import get_session
 from app.schemas.discount import (
+    CartPricingRequest,
+    CartPricingResponse,
     DiscountApplyRequest,
     DiscountApplyResponse,
     DiscountCreate,
@@ -20,21 +23,31 @@ from app.schemas.discount import (
     DiscountRead,
     DiscountUpdate,
 )
-from app.services.discounts import DiscountService
+from app.services.discount_engine import CartLine, discount_expiry_cache
+from app.services.discounts import DiscountService, effective_status
 
 router = APIRouter(prefix="/api/v1/discounts", tags=["Discounts"])
 
+# Reads work out expiry on the fly, so the tag also changes when the next discount lapses
+DISCOUNT_ETAG = CatalogETag(DISCOUNTS, DISCOUNT_USAGE, seed=discount_expiry_cache.etag_seed)
+
 
 @router.get("", response_model=DiscountListResponse)
 async def list_discounts(
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=200, alias="pageSize"),
     is_active: bool | None = Query(None, description="Filter by active status"),
     status_filter: DiscountStatus | None = Query(None, alias="status", description="Filter by status"),
+    etag: EntityTag = Depends(DISCOUNT_ETAG),
 ):
     """List discounts for the tenant."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = DiscountService(session)
     discounts, total = await service.list_discounts(
         tenant.tenant_id, page=page, page_size=page_size, is_active=is_active, status=status_filter
@@ -50,10 +63,16 @@ async def list_discounts(
 @router.get("/{discount_id}", response_model=DiscountRead)
 async def get_discount(
     discount_id: UUID,
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
+    etag: EntityTag = Depends(DISCOUNT_ETAG),
 ):
     """Get a discount by ID."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = DiscountService(session)
     discount = await service.get_discount(tenant.tenant_id, discount_id)
     return serialize_discount(discount)
@@ -100,6 +119,7 @@ async def delete_discount(
 @router.post("/apply", response_model=DiscountApplyResponse)
 async def apply_discount(
     payload: DiscountApplyRequest,
+    request: Request,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
 ):
@@ -111,6 +131,8 @@ async def apply_discount(
         payload.order_amount,
         payload.order_currency,
         payload.customer_id,
+        payload.order_id,
+        request.client.host if request.client else None,
     )
     final_amount = payload.order_amount - discount_amount
     return DiscountApplyResponse(
@@ -121,6 +143,32 @@ async def apply_discount(
     )
 
 
+@router.post("/price-cart", response_model=CartPricingResponse)
+async def price_cart(
+    payload: CartPricingRequest,
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+):
+    """Find the best discount for a cart without redeeming it."""
+    service = DiscountService(session)
+    pricing = await service.price_cart(
+        tenant.tenant_id,
+        payload.currency,
+        [CartLine(item.product_id, item.quantity, item.unit_price, item.category_id) for item in payload.items],
+        payload.codes,
+    )
+    return CartPricingResponse(
+        currency=pricing.currency,
+        subtotal=pricing.subtotal,
+        discount_amount=pricing.discount_amount,
+        final_amount=pricing.total,
+        discount_id=pricing.discount.discount_id if pricing.discount else None,
+        discount_code=pricing.discount.code if pricing.discount else None,
+        discount_name=pricing.discount.name if pricing.discount else None,
+        free_shipping_code=pricing.free_shipping.code if pricing.free_shipping else None,
+    )
+
+
 def serialize_discount(discount: Discount) -> DiscountRead:
     """Serialize discount model to schema."""
     # Convert product_ids from JSON array of strings to list of UUIDs
@@ -132,7 +180,9 @@ def serialize_discount(discount: Discount) -> DiscountRead:
         except (ValueError, TypeError):
             # Fallback to product_id if product_ids is invalid
             product_ids = [discount.product_id] if discount.product_id else None
-    
+
+    # Expiry is derived at read time; the sweeper persists it later
+    current_status = effective_status(discount)
     return DiscountRead(
         id=discount.id,
         code=discount.code,
@@ -151,8 +201,8 @@ def serialize_discount(discount: Discount) -> DiscountRead:
         max_uses_per_customer=discount.max_uses_per_customer,
         minimum_order_amount=discount.minimum_order_amount,
         minimum_order_currency=discount.minimum_order_currency,
-        is_active=discount.is_active,
-        status=discount.status,
+        is_active=discount.is_active and current_status != DiscountStatus.expired,
+        status=current_status,
         current_uses=discount.current_uses,
         audit={
             "created_by": discount.created_by,
@@ -16,7 +16,15 @@ from app.db.models.order import Order
 from app.db.models.user import User
 from app.db.session import get_session
 from app.schemas.checkout import CheckoutRequest, CheckoutResponse
-from app.schemas.order import OrderCancelRequest, OrderCreate, OrderRead, OrderUpdate
+from app.schemas.order import (
+    OrderCancelRequest,
+    OrderCreate,
+    OrderListResponse,
+    OrderRead,
+    OrderUpdate,
+    order_list_serializer,
+    order_serializer,
+)
 from app.schemas.payment import PaymentTransactionRead
 from app.schemas.shared import Money
 from app.services.checkout_saga import CheckoutSagaOrchestrator
@@ -65,7 +73,7 @@ async def create_order(
     return serialize_order(order)
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=OrderListResponse)
 async def list_orders(
     tenant: TenantContext = Depends(get_tenant_context),
     customer_id: UUID | None = Query(None, description="Filter by customer ID"),
@@ -91,12 +99,14 @@ async def list_orders(
         # Admin view - list all orders for tenant
         orders, total = await service.list_tenant_orders(tenant.tenant_id, page, page_size)
 
-    return {
-        "items": [serialize_order(order) for order in orders],
-        "total": total,
-        "page": page,
-        "pageSize": page_size,
-    }
+    return order_list_serializer.response(
+        OrderListResponse(
+            items=[serialize_order(order) for order in orders],
+            total=total,
+            page=page,
+            page_size=page_size,
+        )
+    )
 
 
 @router.get("/{order_id}", response_model=OrderRead)
@@ -119,7 +129,7 @@ async def get_order(
             detail="You can only view your own orders",
         )
 
-    return serialize_order(order)
+    return order_serializer.response(serialize_order(order))
 
 
 @router.put("/{order_id}", response_model=OrderRead)
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_cache import PAYMENT_METHODS, CatalogETag, EntityTag
 from app.core.security import get_request_actor
 from app.core.tenant import TenantContext, get_tenant_context
 from app.db.models.payment_method import PaymentMethod
@@ -19,13 +20,19 @@ router = APIRouter(prefix="/api/v1/payment-methods", tags=["Payment Methods"])
 
 @router.get("", response_model=PaymentMethodListResponse)
 async def list_payment_methods(
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
     page: int = Query(1, ge=1),
     page_size: int = Query(100, ge=1, le=200, alias="pageSize"),
     is_active: bool | None = Query(None, description="Filter by active status"),
+    etag: EntityTag = Depends(CatalogETag(PAYMENT_METHODS)),
 ):
     """List payment methods for the tenant."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = PaymentMethodService(session)
     payment_methods, total = await service.list_payment_methods(
         tenant.tenant_id, page=page, page_size=page_size, is_active=is_active
@@ -41,10 +48,16 @@ async def list_payment_methods(
 @router.get("/{payment_method_id}", response_model=PaymentMethodRead)
 async def get_payment_method(
     payment_method_id: UUID,
+    response: Response,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
+    etag: EntityTag = Depends(CatalogETag(PAYMENT_METHODS)),
 ):
     """Get payment method by ID."""
+    if etag.matched:
+        return etag.not_modified()
+    etag.apply(response)
+
     service = PaymentMethodService(session)
     payment_method = await service.get_payment_method(tenant.tenant_id, payment_method_id)
     return serialize_payment_method(payment_method)
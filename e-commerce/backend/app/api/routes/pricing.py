@@ -0,0 +1,99 @@
+"""Jewelry pricing API routes."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_request_actor
+from app.core.tenant import TenantContext, get_tenant_context
+from app.db.models.metal_rate import MetalRate
+from app.db.session import get_session
+from app.schemas.pricing import (
+    MetalRateListResponse,
+    MetalRateRead,
+    MetalRateUpdateResponse,
+    MetalRateUpsert,
+    PriceBreakdownRead,
+)
+from app.services.pricing import PricingService
+
+router = APIRouter(prefix="/api/v1/pricing", tags=["Pricing"])
+
+
+@router.get("/metal-rates", response_model=MetalRateListResponse)
+async def list_metal_rates(
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+):
+    """List the tenant's metal rates."""
+    service = PricingService(session)
+    rates = await service.list_rates(tenant.tenant_id)
+    return MetalRateListResponse(items=[serialize_metal_rate(rate) for rate in rates])
+
+
+@router.put("/metal-rates", response_model=MetalRateUpdateResponse)
+async def set_metal_rate(
+    payload: MetalRateUpsert,
+    tenant: TenantContext = Depends(get_tenant_context),
+    actor_id: UUID = Depends(get_request_actor),
+    session: AsyncSession = Depends(get_session),
+):
+    """Set the rate for a metal and purity and reprice the products made of it."""
+    service = PricingService(session)
+    rate, repriced = await service.set_rate(tenant.tenant_id, actor_id, payload)
+    return MetalRateUpdateResponse(rate=serialize_metal_rate(rate), repricedProducts=repriced)
+
+
+@router.delete("/metal-rates/{rate_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_metal_rate(
+    rate_id: UUID,
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+):
+    """Delete a metal rate; its products keep their current prices."""
+    service = PricingService(session)
+    await service.delete_rate(tenant.tenant_id, rate_id)
+
+
+@router.get("/products/{product_id}", response_model=PriceBreakdownRead)
+async def get_product_price(
+    product_id: UUID,
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the computed price breakdown of a product."""
+    service = PricingService(session)
+    breakdown = await service.get_price(tenant.tenant_id, product_id)
+    return PriceBreakdownRead(
+        productId=product_id,
+        currency=breakdown.currency,
+        rateBased=breakdown.rate_based,
+        ratePerGram=breakdown.rate_per_gram,
+        weight=breakdown.weight,
+        metalValue=breakdown.metal_value,
+        wastageValue=breakdown.wastage_value,
+        makingCharges=breakdown.making_charges,
+        stoneCharges=breakdown.stone_charges,
+        subtotal=breakdown.subtotal,
+        gstAmount=breakdown.gst_amount,
+        total=breakdown.total,
+    )
+
+
+def serialize_metal_rate(rate: MetalRate) -> MetalRateRead:
+    return MetalRateRead(
+        id=rate.id,
+        material=rate.material,
+        purity=rate.purity,
+        ratePerGram=rate.rate_per_gram,
+        currency=rate.currency,
+        audit={
+            "createdBy": rate.created_by,
+            "createdDate": rate.created_date,
+            "modifiedBy": rate.modified_by,
+            "modifiedDate": rate.modified_date,
+        },
+    )
@@ -8,11 +8,19 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_cache import CATEGORIES, PRODUCTS, CatalogETag, EntityTag
 from app.core.security import get_request_actor
 from app.core.tenant import TenantContext, get_tenant_context
 from app.db.models.product import Product
 from app.db.session import get_session
-from app.schemas.product import ProductCreate, ProductListResponse, ProductRead, ProductUpdate
+from app.schemas.product import (
+    ProductCreate,
+    ProductListResponse,
+    ProductRead,
+    ProductUpdate,
+    product_list_serializer,
+    product_serializer,
+)
 from app.schemas.shared import Money
 from app.services.products import ProductService
 
@@ -26,16 +34,30 @@ async def list_products(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=200, alias="pageSize"),
     search: str | None = None,
+    category_id: UUID | None = Query(None, alias="categoryId"),
+    include_subcategories: bool = Query(True, alias="includeSubcategories"),
+    etag: EntityTag = Depends(CatalogETag(PRODUCTS, CATEGORIES)),
 ):
+    if etag.matched:
+        return etag.not_modified()
+
     service = ProductService(session)
     products, total = await service.list_products(
-        tenant_id=tenant.tenant_id, page=page, page_size=page_size, search=search
-    )
-    return ProductListResponse(
-        items=[serialize_product(product) for product in products],
+        tenant_id=tenant.tenant_id,
         page=page,
         page_size=page_size,
-        total=total,
+        search=search,
+        category_id=category_id,
+        include_subcategories=include_subcategories,
+    )
+    return product_list_serializer.response(
+        ProductListResponse(
+            items=[serialize_product(product) for product in products],
+            page=page,
+            page_size=page_size,
+            total=total,
+        ),
+        headers=etag.headers,
     )
 
 
@@ -44,11 +66,15 @@ async def get_product(
     product_id: UUID,
     tenant: TenantContext = Depends(get_tenant_context),
     session: AsyncSession = Depends(get_session),
+    etag: EntityTag = Depends(CatalogETag(PRODUCTS)),
 ):
     """Get product by ID."""
+    if etag.matched:
+        return etag.not_modified()
+
     service = ProductService(session)
     product = await service.get_product(tenant.tenant_id, product_id)
-    return serialize_product(product)
+    return product_serializer.response(serialize_product(product), headers=etag.headers)
 
 
 @router.post("", response_model=ProductRead, status_code=201)
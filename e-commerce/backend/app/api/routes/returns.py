@@ -17,9 +17,12 @@ from app.schemas.returns import (
     ReturnCreate,
     ReturnDecisionRequest,
     ReturnListResponse,
+    ReturnPolicyRead,
+    ReturnPolicyUpdate,
     ReturnRead,
     ReturnRefundRequest,
 )
+from app.services.return_automation import EffectiveReturnPolicy, ReturnAutomationService
 from app.services.returns import ReturnService
 
 router = APIRouter(prefix="/api/v1/returns", tags=["Returns"])
@@ -78,6 +81,32 @@ async def list_returns(
     )
 
 
+@router.get("/policy", response_model=ReturnPolicyRead)
+async def get_return_policy(
+    tenant: TenantContext = Depends(get_tenant_context),
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+) -> ReturnPolicyRead:
+    """Get the tenant's returns automation policy."""
+    _ensure_staff(current_user)
+    policy = await ReturnAutomationService(session).get_policy(tenant.tenant_id)
+    return serialize_return_policy(policy)
+
+
+@router.put("/policy", response_model=ReturnPolicyRead)
+async def update_return_policy(
+    payload: ReturnPolicyUpdate,
+    tenant: TenantContext = Depends(get_tenant_context),
+    current_user: User = Depends(get_current_active_user),
+    actor_id: UUID = Depends(get_request_actor),
+    session: AsyncSession = Depends(get_session),
+) -> ReturnPolicyRead:
+    """Update the tenant's returns automation policy."""
+    _ensure_staff(current_user)
+    policy = await ReturnAutomationService(session).update_policy(tenant.tenant_id, actor_id, payload)
+    return serialize_return_policy(policy)
+
+
 @router.post("/{return_id}/approve", response_model=ReturnRead)
 async def approve_return(
     return_id: UUID,
@@ -201,6 +230,8 @@ def serialize_return(return_request: ReturnRequest) -> ReturnRead:
         refundTransactionId=return_request.refund_transaction_id,
         refundAmount=return_request.refund_amount,
         refundCurrency=return_request.refund_currency,
+        acknowledgeDueDate=return_request.acknowledge_due_date,
+        resolveDueDate=return_request.resolve_due_date,
         audit={
             "created_by": return_request.created_by,
             "created_date": return_request.created_date,
@@ -212,6 +243,16 @@ def serialize_return(return_request: ReturnRequest) -> ReturnRead:
     )
 
 
+def serialize_return_policy(policy: EffectiveReturnPolicy) -> ReturnPolicyRead:
+    return ReturnPolicyRead(
+        autoApprovalEnabled=policy.auto_approval_enabled,
+        autoApproveMaxAmount=policy.auto_approve_max_amount,
+        autoApproveMaxOrderAgeDays=policy.auto_approve_max_order_age_days,
+        acknowledgementSlaHours=policy.acknowledgement_sla_hours,
+        resolutionSlaHours=policy.resolution_sla_hours,
+    )
+
+
 def _ensure_staff(user: User) -> None:
     if user.role == UserRole.customer:
         raise HTTPException(
@@ -0,0 +1,29 @@
+"""Storefront configuration API routes."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.http_cache import CATEGORIES, PAYMENT_METHODS, SHIPPING_METHODS, CatalogETag, EntityTag
+from app.core.tenant import TenantContext, get_tenant_context
+from app.db.session import get_session
+from app.schemas.storefront import StorefrontConfig
+from app.services.storefront import storefront_config_cache
+
+router = APIRouter(prefix="/api/v1/storefront", tags=["Storefront"])
+
+
+@router.get("/config", response_model=StorefrontConfig)
+async def get_storefront_config(
+    tenant: TenantContext = Depends(get_tenant_context),
+    session: AsyncSession = Depends(get_session),
+    etag: EntityTag = Depends(CatalogETag(CATEGORIES, PAYMENT_METHODS, SHIPPING_METHODS)),
+):
+    """Active payment methods, shipping methods and the category tree for checkout in one response."""
+    if etag.matched:
+        return etag.not_modified()
+
+    bundle = await storefront_config_cache.get(session, tenant.tenant_id)
+    # The bundle is cached already encoded, so it is written out as-is
+    return Response(content=bundle.body, headers=etag.headers, media_type="application/json")
@@ -0,0 +1,44 @@
+"""Payment provider webhook endpoints."""
+
+from __future__ import annotations
+
+import structlog
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.payment_transaction import PaymentProvider
+from app.db.session import get_session
+from app.services.payment_webhooks import PaymentWebhookService, verify_and_parse
+
+router = APIRouter(prefix="/api/v1/webhooks", tags=["Webhooks"])
+logger = structlog.get_logger(__name__)
+
+
+async def _receive(provider: PaymentProvider, request: Request, session: AsyncSession) -> dict[str, bool]:
+    # Signatures are computed over the exact bytes sent, so read the raw body
+    payload = await request.body()
+    event = verify_and_parse(provider, payload, request.headers)
+    inserted = await PaymentWebhookService(session).record(event)
+
+    if inserted:
+        # Wake a worker now; the beat sweep picks the event up if the broker is unavailable
+        from app.tasks.payments import process_payment_webhooks_task
+
+        try:
+            process_payment_webhooks_task.apply_async(retry=False)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("payment_webhook_enqueue_failed", provider=provider.value, error=str(exc))
+
+    return {"received": True, "duplicate": not inserted}
+
+
+@router.post("/stripe")
+async def stripe_webhook(request: Request, session: AsyncSession = Depends(get_session)):
+    """Receive a Stripe event; it is stored and applied asynchronously."""
+    return await _receive(PaymentProvider.stripe, request, session)
+
+
+@router.post("/razorpay")
+async def razorpay_webhook(request: Request, session: AsyncSession = Depends(get_session)):
+    """Receive a Razorpay event; it is stored and applied asynchronously."""
+    return await _receive(PaymentProvider.razorpay, request, session)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import get_settings
 
@@ -13,7 +14,13 @@ celery_app = Celery(
     "ecommerce",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.tasks.notifications", "app.tasks.returns"],
+    include=[
+        "app.tasks.audit",
+        "app.tasks.discounts",
+        "app.tasks.notifications",
+        "app.tasks.payments",
+        "app.tasks.returns",
+    ],
 )
 
 # Celery configuration
@@ -42,6 +49,36 @@ celery_app.conf.update(
             "task": "returns.periodic_refund_check",
             "schedule": 60 * 60.0,  # Every hour
         },
+        "payments-process-webhooks": {
+            "task": "payments.process_webhooks",
+            "schedule": 60.0,  # Every minute; sweeps events whose enqueue was lost
+        },
+        "payments-reconcile": {
+            "task": "payments.reconcile",
+            "schedule": 15 * 60.0,  # Every 15 minutes; fallback for missed webhooks
+        },
+        "discounts-expire": {
+            "task": "discounts.expire",
+            "schedule": 5 * 60.0,  # Every 5 minutes; reads derive expiry in between
+        },
+        "audit-maintain-partitions": {
+            "task": "audit.maintain_partitions",
+            "schedule": 24 * 60 * 60.0,  # Daily; partitions are created months ahead
+        },
     },
 )
 
+
+@worker_process_init.connect
+def init_task_runtime(**kwargs) -> None:
+    """Give each worker process its own long-lived event loop and database engine."""
+    from app.tasks import runtime
+
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def shutdown_task_runtime(**kwargs) -> None:
+    from app.tasks import runtime
+
+    runtime.shutdown()
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-import json
+import time
 from typing import Any
 
 import redis.asyncio as redis
 import structlog
 
 from app.core.config import get_settings
+from app.core.metrics import record_cache_result
+from app.core.serialization import dumps, loads
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
@@ -24,7 +26,8 @@ async def get_redis_client() -> redis.Redis:
     if _redis_pool is None:
         _redis_pool = redis.ConnectionPool.from_url(
             settings.redis_url,
-            decode_responses=True,
+            # Values are orjson bytes; skip the UTF-8 decode round trip
+            decode_responses=False,
             max_connections=20,
         )
 
@@ -49,9 +52,12 @@ class CacheService:
             client = await self.get_client()
             value = await client.get(key)
             if value:
-                return json.loads(value)
+                record_cache_result("hit")
+                return loads(value)
+            record_cache_result("miss")
             return None
         except Exception as e:
+            record_cache_result("error")
             logger.warning("cache_get_failed", key=key, error=str(e))
             return None
 
@@ -64,11 +70,7 @@ class CacheService:
         """Set value in cache with TTL."""
         try:
             client = await self.get_client()
-            await client.setex(
-                key,
-                ttl,
-                json.dumps(value, default=str),
-            )
+            await client.setex(key, ttl, dumps(value))
             return True
         except Exception as e:
             logger.warning("cache_set_failed", key=key, error=str(e))
@@ -96,11 +98,67 @@ class CacheService:
             logger.warning("cache_delete_pattern_failed", pattern=pattern, error=str(e))
             return 0
 
+    async def increment(self, key: str, ttl: int) -> int | None:
+        """Increment a counter that expires ``ttl`` seconds after its first increment."""
+        try:
+            client = await self.get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(key, 0, nx=True, ex=ttl)
+                pipe.incr(key)
+                _, count = await pipe.execute()
+            return int(count)
+        except Exception as e:
+            logger.warning("cache_increment_failed", key=key, error=str(e))
+            return None
+
+    async def get_counters(self, *keys: str) -> list[int]:
+        """Current values of counters written by ``increment`` (0 when missing or Redis is unavailable)."""
+        try:
+            client = await self.get_client()
+            values = await client.mget(keys)
+            return [int(value) if value is not None else 0 for value in values]
+        except Exception as e:
+            logger.warning("cache_get_counters_failed", keys=keys, error=str(e))
+            return [0] * len(keys)
+
+    async def get_generation(self, namespace: str, tenant_id: str) -> int | None:
+        """Return the tenant's current generation for ``namespace``, or None if Redis is unavailable."""
+        key = f"generation:{namespace}:{tenant_id}"
+        try:
+            client = await self.get_client()
+            value = await client.get(key)
+            if value is None:
+                # Seed from the clock so a lost key never reuses an old generation
+                await client.set(key, time.time_ns(), nx=True, ex=settings.cache_generation_ttl)
+                value = await client.get(key)
+            return int(value) if value is not None else None
+        except Exception as e:
+            logger.warning("cache_generation_get_failed", key=key, error=str(e))
+            return None
+
+    async def bump_generation(self, namespace: str, tenant_id: str) -> None:
+        """Advance the tenant's generation for ``namespace`` after a write."""
+        key = f"generation:{namespace}:{tenant_id}"
+        try:
+            client = await self.get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(key, time.time_ns(), nx=True)
+                pipe.incr(key)
+                pipe.expire(key, settings.cache_generation_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("cache_generation_bump_failed", key=key, error=str(e))
+
+    async def invalidate_catalog(self, namespace: str, tenant_id: str) -> None:
+        """Invalidate cached master data (categories, payment or shipping methods)."""
+        await self.bump_generation(namespace, tenant_id)
+
     async def invalidate_product(self, tenant_id: str, product_id: str | None = None) -> None:
         """Invalidate product cache."""
         if product_id:
             await self.delete(f"product:{tenant_id}:{product_id}")
         await self.delete_pattern(f"products:{tenant_id}:*")
+        await self.bump_generation("products", tenant_id)
 
     async def invalidate_user(self, tenant_id: str, user_id: str | None = None) -> None:
         """Invalidate user cache."""
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
 from functools import lru_cache
 from typing import Annotated, List
 
@@ -32,6 +33,66 @@ class Settings(BaseSettings):
     stripe_publishable_key: str | None = Field(default=None, alias="STRIPE_PUBLISHABLE_KEY")
     razorpay_key_id: str | None = Field(default=None, alias="RAZORPAY_KEY_ID")
     razorpay_key_secret: str | None = Field(default=None, alias="RAZORPAY_KEY_SECRET")
+    stripe_webhook_secret: str | None = Field(default=None, alias="STRIPE_WEBHOOK_SECRET")
+    stripe_webhook_tolerance: int = Field(default=300, alias="STRIPE_WEBHOOK_TOLERANCE")
+    razorpay_webhook_secret: str | None = Field(default=None, alias="RAZORPAY_WEBHOOK_SECRET")
+    payment_webhook_batch_size: int = Field(default=200, alias="PAYMENT_WEBHOOK_BATCH_SIZE")
+    payment_webhook_max_attempts: int = Field(default=5, alias="PAYMENT_WEBHOOK_MAX_ATTEMPTS")
+    payment_reconciliation_stale_minutes: int = Field(default=15, alias="PAYMENT_RECONCILIATION_STALE_MINUTES")
+    payment_reconciliation_lookback_days: int = Field(default=7, alias="PAYMENT_RECONCILIATION_LOOKBACK_DAYS")
+    payment_reconciliation_batch_size: int = Field(default=100, alias="PAYMENT_RECONCILIATION_BATCH_SIZE")
+    payment_http_pool_size: int = Field(default=10, alias="PAYMENT_HTTP_POOL_SIZE")
+    payment_http_timeout: float = Field(default=30.0, alias="PAYMENT_HTTP_TIMEOUT")
+    payment_gateway_warm_up: bool = Field(default=True, alias="PAYMENT_GATEWAY_WARM_UP")
+    payment_circuit_failure_rate: float = Field(default=0.5, alias="PAYMENT_CIRCUIT_FAILURE_RATE")
+    payment_circuit_min_calls: int = Field(default=10, alias="PAYMENT_CIRCUIT_MIN_CALLS")
+    payment_circuit_recovery_seconds: float = Field(default=30.0, alias="PAYMENT_CIRCUIT_RECOVERY_SECONDS")
+    payment_bulkhead_size: int = Field(default=10, alias="PAYMENT_BULKHEAD_SIZE")
+    payment_timeout_min_seconds: float = Field(default=2.0, alias="PAYMENT_TIMEOUT_MIN_SECONDS")
+    stripe_api_rate_limit: float = Field(default=20.0, alias="STRIPE_API_RATE_LIMIT")
+    razorpay_api_rate_limit: float = Field(default=10.0, alias="RAZORPAY_API_RATE_LIMIT")
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    metrics_celery_queues: str = Field(
+        default="celery,returns.auto,returns.sla,returns.refund", alias="METRICS_CELERY_QUEUES"
+    )
+    query_debug_enabled: bool | None = Field(default=None, alias="QUERY_DEBUG_ENABLED")
+    query_repeat_threshold: int = Field(default=5, alias="QUERY_REPEAT_THRESHOLD")
+    gzip_minimum_size: int = Field(default=1024, alias="GZIP_MINIMUM_SIZE")
+    gzip_compress_level: int = Field(default=6, alias="GZIP_COMPRESS_LEVEL")
+    cache_generation_ttl: int = Field(default=86400, alias="CACHE_GENERATION_TTL")
+    discount_index_ttl: int = Field(default=300, alias="DISCOUNT_INDEX_TTL")
+    category_tree_ttl: int = Field(default=300, alias="CATEGORY_TREE_TTL")
+    storefront_config_ttl: int = Field(default=3600, alias="STOREFRONT_CONFIG_TTL")
+    discount_expiry_batch_size: int = Field(default=500, alias="DISCOUNT_EXPIRY_BATCH_SIZE")
+    return_auto_approve_max_amount: Decimal = Field(default=Decimal("300.00"), alias="RETURN_AUTO_APPROVE_MAX_AMOUNT")
+    return_auto_approve_max_order_age_days: int = Field(default=14, alias="RETURN_AUTO_APPROVE_MAX_ORDER_AGE_DAYS")
+    return_auto_approval_batch_size: int = Field(default=500, alias="RETURN_AUTO_APPROVAL_BATCH_SIZE")
+    audit_batch_size: int = Field(default=500, alias="AUDIT_BATCH_SIZE")
+    audit_flush_interval_ms: int = Field(default=200, alias="AUDIT_FLUSH_INTERVAL_MS")
+    audit_max_pending: int = Field(default=10000, alias="AUDIT_MAX_PENDING")
+    audit_partition_months_ahead: int = Field(default=3, alias="AUDIT_PARTITION_MONTHS_AHEAD")
+    audit_retention_months: int = Field(default=12, alias="AUDIT_RETENTION_MONTHS")
+    audit_archive_dir: str = Field(default="./archive/audit_logs", alias="AUDIT_ARCHIVE_DIR")
+    audit_query_lookback_days: int = Field(default=90, alias="AUDIT_QUERY_LOOKBACK_DAYS")
+    return_acknowledgement_sla_hours: int = Field(default=24, alias="RETURN_ACKNOWLEDGEMENT_SLA_HOURS")
+    return_resolution_sla_hours: int = Field(default=72, alias="RETURN_RESOLUTION_SLA_HOURS")
+    return_sla_warning_ratio: float = Field(default=0.8, alias="RETURN_SLA_WARNING_RATIO")
+    return_sla_batch_size: int = Field(default=1000, alias="RETURN_SLA_BATCH_SIZE")
+    return_refund_verification_batch_size: int = Field(
+        default=1000, alias="RETURN_REFUND_VERIFICATION_BATCH_SIZE"
+    )
+    coupon_cache_ttl: int = Field(default=3600, alias="COUPON_CACHE_TTL")
+    coupon_negative_cache_ttl: int = Field(default=60, alias="COUPON_NEGATIVE_CACHE_TTL")
+    coupon_attempt_window_seconds: int = Field(default=900, alias="COUPON_ATTEMPT_WINDOW_SECONDS")
+    coupon_attempt_limit_per_ip: int = Field(default=20, alias="COUPON_ATTEMPT_LIMIT_PER_IP")
+    coupon_attempt_limit_per_customer: int = Field(default=10, alias="COUPON_ATTEMPT_LIMIT_PER_CUSTOMER")
+
+    @property
+    def query_debug(self) -> bool:
+        """Per-request SQL counting defaults to on outside production."""
+        if self.query_debug_enabled is not None:
+            return self.query_debug_enabled
+        return self.environment.lower() in ("development", "staging", "test")
 
     @property
     def allowed_origins(self) -> List[str]:
@@ -0,0 +1,92 @@
+"""Conditional GET (ETag / If-None-Match) for tenant catalog endpoints."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from uuid import UUID
+
+from fastapi import Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.tenant import TenantContext, get_tenant_context
+from app.db.session import get_session
+
+PRODUCTS = "products"
+CATEGORIES = "categories"
+PAYMENT_METHODS = "payment_methods"
+SHIPPING_METHODS = "shipping_methods"
+DISCOUNTS = "discounts"
+# Bumped on every redemption; kept apart from DISCOUNTS so usage counts do not rebuild pricing indexes
+DISCOUNT_USAGE = "discount_usage"
+
+
+def _parse_if_none_match(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+@dataclass(slots=True, frozen=True)
+class EntityTag:
+    """ETag for the current request and whether the client already holds it."""
+
+    value: str | None = None
+    matched: bool = False
+
+    @property
+    def headers(self) -> dict[str, str]:
+        if self.value is None:
+            return {}
+        return {"ETag": self.value, "Cache-Control": "no-cache", "Vary": "X-Tenant-ID"}
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+
+class CatalogETag:
+    """Dependency deriving a strong ETag from the tenant's cache generation for ``namespaces``.
+
+    The generation is bumped by every write to the namespace, so a matching
+    ``If-None-Match`` can be answered with 304 before any query runs. When Redis
+    is unavailable no ETag is issued and the request is served normally. ``*``
+    is not honored: it would answer 304 before knowing the resource exists.
+
+    ``seed`` adds state that changes responses without a write, such as the
+    next discount expiry, so the ETag changes with it.
+    """
+
+    def __init__(
+        self, *namespaces: str, seed: Callable[[AsyncSession, UUID], Awaitable[str]] | None = None
+    ) -> None:
+        self.namespaces = namespaces
+        self.seed = seed
+
+    async def __call__(
+        self,
+        request: Request,
+        tenant: TenantContext = Depends(get_tenant_context),
+        session: AsyncSession = Depends(get_session),
+    ) -> EntityTag:
+        generations = []
+        for namespace in self.namespaces:
+            generation = await cache_service.get_generation(namespace, str(tenant.tenant_id))
+            if generation is None:
+                return EntityTag()
+            generations.append(f"{namespace}:{generation}")
+        if self.seed is not None:
+            generations.append(await self.seed(session, tenant.tenant_id))
+
+        query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+        digest = hashlib.sha256(
+            f"{tenant.tenant_id}:{':'.join(generations)}:{request.url.path}?{query}".encode()
+        ).hexdigest()[:32]
+        value = f'"{digest}"'
+        candidates = _parse_if_none_match(request.headers.get("if-none-match"))
+        return EntityTag(value=value, matched=value in candidates)
@@ -0,0 +1,412 @@
+"""Prometheus-style instrumentation for HTTP, database, cache and Celery."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str | None = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+@dataclass(slots=True)
+class _HistogramState:
+    buckets: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+        self._states: dict[tuple[str, ...], _HistogramState] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _HistogramState(buckets=[0] * (len(self.upper_bounds) + 1))
+                self._states[key] = state
+            state.buckets[index] += 1
+            state.count += 1
+            state.total += value
+
+    def count(self, **labels: str) -> int:
+        state = self._states.get(self._key(labels))
+        return state.count if state else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(state.buckets), state.count, state.total) for key, state in self._states.items()]
+        lines: list[str] = []
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.upper_bounds, float("inf")), buckets):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Global registry and core metrics
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "Total HTTP requests.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method",)
+)
+db_queries_total = registry.counter("db_queries_total", "Total SQL statements executed.")
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time in seconds."
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=DEFAULT_COUNT_BUCKETS,
+)
+http_request_db_duration_seconds = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL per HTTP request in seconds.",
+    ("method", "route"),
+)
+cache_requests_total = registry.counter(
+    "cache_requests_total", "Cache lookups by result (hit, miss, error).", ("result",)
+)
+celery_queue_depth = registry.gauge(
+    "celery_queue_depth", "Messages waiting in Celery broker queues.", ("queue",)
+)
+payment_gateway_calls_total = registry.counter(
+    "payment_gateway_calls_total",
+    "Payment provider calls by outcome (success, failure, timeout, rejected).",
+    ("provider", "operation", "outcome"),
+)
+payment_gateway_call_duration_seconds = registry.histogram(
+    "payment_gateway_call_duration_seconds",
+    "Payment provider call latency in seconds.",
+    ("provider", "operation"),
+)
+payment_gateway_circuit_state = registry.gauge(
+    "payment_gateway_circuit_state",
+    "Payment provider circuit breaker state (0 closed, 1 half-open, 2 open).",
+    ("provider",),
+)
+payment_gateway_in_flight = registry.gauge(
+    "payment_gateway_in_flight", "Payment provider calls currently in flight.", ("provider",)
+)
+payment_gateway_timeout_seconds = registry.gauge(
+    "payment_gateway_timeout_seconds",
+    "Current adaptive timeout for payment provider calls.",
+    ("provider", "operation"),
+)
+coupon_lookups_total = registry.counter(
+    "coupon_lookups_total", "Coupon code lookups by source (hit, negative_hit, database).", ("result",)
+)
+coupon_attempts_blocked_total = registry.counter(
+    "coupon_attempts_blocked_total", "Coupon attempts refused by the attempt limiter.", ("scope",)
+)
+audit_log_entries_written_total = registry.counter(
+    "audit_log_entries_written_total", "Audit entries written by the buffered writer."
+)
+audit_log_entries_dropped_total = registry.counter(
+    "audit_log_entries_dropped_total", "Audit entries dropped because the buffer overflowed while writes failed."
+)
+audit_log_entries_rejected_total = registry.counter(
+    "audit_log_entries_rejected_total", "Audit entries dropped because the database rejected the row itself."
+)
+audit_log_buffer_pending = registry.gauge(
+    "audit_log_buffer_pending", "Audit entries waiting in the in-process buffer."
+)
+audit_log_flush_seconds = registry.histogram(
+    "audit_log_flush_seconds", "Time to write one batch of buffered audit entries in seconds."
+)
+return_refund_verifications_total = registry.counter(
+    "return_refund_verifications_total",
+    "Approved returns checked for a completed refund, by outcome (verified, pending).",
+    ("outcome",),
+)
+return_refund_verification_batch_seconds = registry.histogram(
+    "return_refund_verification_batch_seconds", "Time to verify one batch of returns in seconds."
+)
+return_refund_verification_throughput = registry.gauge(
+    "return_refund_verification_throughput", "Returns checked per second by the last verification run."
+)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Per-request database counters, populated by SQLAlchemy event hooks."""
+
+    queries: int = 0
+    db_time: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def get_request_stats() -> RequestStats | None:
+    """Return the stats collector bound to the current request, if any."""
+    return _request_stats.get()
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None) or getattr(route, "path", None)
+    # Unmatched paths are collapsed into a single label to keep cardinality bounded.
+    return path_format or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and per-request DB usage."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        http_requests_in_progress.inc(method=method)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = _route_label(scope)
+            http_requests_in_progress.dec(method=method)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_request_db_queries.observe(stats.queries, method=method, route=route)
+            http_request_db_duration_seconds.observe(stats.db_time, method=method, route=route)
+            _request_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    db_queries_total.inc()
+    db_query_duration_seconds.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach query counting/timing hooks to a (sync) SQLAlchemy engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_cache_result(result: str) -> None:
+    """Record a cache lookup outcome: ``hit``, ``miss`` or ``error``."""
+    cache_requests_total.inc(result=result)
+
+
+def collect_celery_queue_depths(broker_url: str, queues: Iterable[str]) -> None:
+    """Refresh the Celery queue depth gauge by passively declaring each queue."""
+    from kombu import Connection
+
+    try:
+        with Connection(broker_url, connect_timeout=1) as conn:
+            channel = conn.default_channel
+            for queue in queues:
+                try:
+                    declared = channel.queue_declare(queue=queue, passive=True)
+                    celery_queue_depth.set(declared.message_count, queue=queue)
+                except Exception:
+                    # Queue not declared yet (no worker has consumed from it)
+                    celery_queue_depth.set(0, queue=queue)
+    except Exception as e:
+        logger.warning("celery_queue_depth_failed", error=str(e))
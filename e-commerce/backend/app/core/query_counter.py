@@ -0,0 +1,151 @@
+"""Per-request SQL statement counting and N+1 detection for development/staging."""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\([^)]+\)s|%s|:\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize SQL so statements differing only by parameters compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class QueryLog:
+    """SQL statements captured while a request or recorder is active."""
+
+    statements: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """Return statement shapes executed at least ``threshold`` times, most frequent first."""
+        shapes = Counter(statement_shape(statement) for statement in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+_current_log: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+_recorders: list[QueryLog] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    conn.info.setdefault("query_counter_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    start_times = conn.info.get("query_counter_start")
+    elapsed = time.perf_counter() - start_times.pop() if start_times else 0.0
+    current = _current_log.get()
+    targets = [current, *_recorders] if current is not None else _recorders
+    for log in targets:
+        log.statements.append(statement)
+        log.duration += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach statement capture hooks to a (sync) SQLAlchemy engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryLog]:
+    """Capture every statement executed on instrumented engines while the block runs."""
+    log = QueryLog()
+    _recorders.append(log)
+    try:
+        yield log
+    finally:
+        _recorders.remove(log)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block of code issues more SQL than its budget allows."""
+
+
+def assert_query_budget(log: QueryLog, max_queries: int, max_repeats: int | None = None) -> None:
+    """Fail if ``log`` exceeds the statement budget or repeats a statement shape too often."""
+    problems: list[str] = []
+    if log.count > max_queries:
+        problems.append(f"executed {log.count} SQL statements, budget is {max_queries}")
+    if max_repeats is not None:
+        for shape, count in log.repeated(max_repeats + 1):
+            problems.append(f"statement repeated {count} times (max {max_repeats}): {shape[:200]}")
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None) -> Iterator[QueryLog]:
+    """Fail if the block issues more SQL than budgeted; scope it to the code under test."""
+    with record_queries() as log:
+        yield log
+    assert_query_budget(log, max_queries, max_repeats)
+
+
+class QueryCounterMiddleware:
+    """Counts SQL per request, flags repeated statement shapes and reports them in debug headers."""
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 5, expose_headers: bool = True) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = _current_log.set(log)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(log.count)
+                headers["X-Query-Time-Ms"] = f"{log.duration * 1000:.1f}"
+                repeated = log.repeated(self.repeat_threshold)
+                if repeated:
+                    headers["X-Query-Repeated"] = str(len(repeated))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_log.reset(token)
+            for shape, count in log.repeated(self.repeat_threshold):
+                logger.warning(
+                    "n_plus_one_suspected",
+                    method=scope["method"],
+                    path=scope.get("path"),
+                    count=count,
+                    statement=shape[:500],
+                )
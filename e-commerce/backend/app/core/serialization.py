@@ -0,0 +1,47 @@
+"""Fast JSON encoding built on orjson and pydantic-core."""
+
+from __future__ import annotations
+
+from typing import Any, Generic, Mapping, TypeVar
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` to JSON bytes; unknown types (e.g. Decimal) fall back to ``str``."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON bytes or text."""
+    return orjson.loads(data)
+
+
+class ModelSerializer(Generic[T]):
+    """JSON serializer for a pydantic type, compiled once at import time.
+
+    Returning ``serializer.response(value)`` from a route skips FastAPI's
+    re-validation of the already-built models against ``response_model`` and
+    writes the bytes produced by pydantic-core directly. Keep ``response_model``
+    on the route so the OpenAPI schema is unchanged.
+    """
+
+    def __init__(self, type_: type[T] | Any) -> None:
+        self._adapter: TypeAdapter[T] = TypeAdapter(type_)
+
+    def to_json(self, value: T) -> bytes:
+        return self._adapter.dump_json(value, by_alias=True)
+
+    def response(
+        self, value: T, status_code: int = 200, headers: Mapping[str, str] | None = None
+    ) -> Response:
+        return Response(
+            content=self.to_json(value),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
@@ -3,11 +3,16 @@
 from app.db.models.audit_log import AuditAction, AuditLog
 from app.db.models.category import Category
 from app.db.models.discount import Discount, DiscountScope, DiscountStatus, DiscountType
+from app.db.models.discount_redemption import DiscountRedemption
+from app.db.models.metal_rate import MetalRate
 from app.db.models.order import Order, OrderItem, OrderStatus
 from app.db.models.payment_method import PaymentMethod, PaymentMethodType
 from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.db.models.payment_webhook_event import PaymentWebhookEvent, WebhookEventStatus
 from app.db.models.product import Product
+from app.db.models.return_policy import ReturnPolicy
 from app.db.models.return_request import ReturnRequest, ReturnStatus
+from app.db.models.return_sla_notification import ReturnSlaNotification
 from app.db.models.shipping_method import ShippingMethod
 from app.db.models.tenant import Tenant, TenantStatus
 from app.db.models.user import AuthProvider, User, UserRole, UserStatus
@@ -17,9 +22,11 @@ __all__ = [
     "AuditLog",
     "Category",
     "Discount",
+    "DiscountRedemption",
     "DiscountScope",
     "DiscountStatus",
     "DiscountType",
+    "MetalRate",
     "Order",
     "OrderItem",
     "OrderStatus",
@@ -28,15 +35,19 @@ __all__ = [
     "PaymentProvider",
     "PaymentStatus",
     "PaymentTransaction",
+    "PaymentWebhookEvent",
     "Product",
     "ShippingMethod",
+    "ReturnPolicy",
     "ReturnRequest",
+    "ReturnSlaNotification",
     "ReturnStatus",
     "Tenant",
     "TenantStatus",
     "User",
     "UserRole",
     "UserStatus",
+    "WebhookEventStatus",
     "AuthProvider",
 ]
 
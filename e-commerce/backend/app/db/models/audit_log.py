@@ -3,12 +3,10 @@
 from __future__ import annotations
 
 import enum
-import uuid
-
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy import DDL, DateTime, Index, String, Text, event, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,23 +20,46 @@ class AuditAction(str, enum.Enum):
     update = "UPDATE"
     delete = "DELETE"
     view = "VIEW"
+    return_auto_approved = "RETURN_AUTO_APPROVED"
 
 
 class AuditLog(Base):
-    """Audit log entries for tracking entity changes."""
+    """Audit log entries for tracking entity changes.
+
+    The table is range-partitioned by month on ``created_date`` (hence the
+    composite primary key); ``AuditPartitionService`` creates partitions ahead
+    of time and archives expired ones. Rows outside every monthly partition
+    land in ``audit_logs_default``.
+    """
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_tenant_created", "tenant_id", "created_date"),
+        Index("ix_audit_logs_entity", "entity_type", "entity_id", "created_date"),
+        Index("ix_audit_logs_created_date", "created_date"),
+        {"postgresql_partition_by": "RANGE (created_date)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    entity_type: Mapped[str] = mapped_column(String(length=100), nullable=False, index=True)
-    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
-    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
-    action: Mapped[AuditAction] = mapped_column(String(length=20), nullable=False, index=True)
+    entity_type: Mapped[str] = mapped_column(String(length=100), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    action: Mapped[AuditAction] = mapped_column(String(length=20), nullable=False)
     actor_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     changes: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON string of changes
     ip_address: Mapped[str | None] = mapped_column(String(length=45), nullable=True)
     user_agent: Mapped[str | None] = mapped_column(String(length=500), nullable=True)
     created_date: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now()
     )
 
+
+# A partitioned table accepts no rows until a partition exists; migrations add the monthly ones
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
+
@@ -4,22 +4,34 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, Text, UniqueConstraint, event, select
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import AuditMixin, Base, TenantMixin
 
 
+def category_path(category_id: uuid.UUID, parent_path: str | None = None) -> str:
+    """Materialized path of a category: its ancestors' ids and its own, each followed by ``/``."""
+    return f"{parent_path or '/'}{category_id}/"
+
+
 class Category(TenantMixin, AuditMixin, Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "slug", name="uq_categories_tenant_slug"),
+        # Subtrees are prefix matches on the materialized path
+        Index("ix_categories_tenant_path", "tenant_id", "path", postgresql_ops={"path": "text_pattern_ops"}),
+    )
 
     name: Mapped[str] = mapped_column(String(length=255), nullable=False)
     description: Mapped[str | None] = mapped_column(String(length=1000), nullable=True)
-    slug: Mapped[str] = mapped_column(String(length=255), nullable=False, unique=True, index=True)
+    slug: Mapped[str] = mapped_column(String(length=255), nullable=False)
     parent_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True, index=True
     )  # For hierarchical categories
+    # "/<root id>/.../<own id>/", kept in step with parent_id by CategoryService
+    path: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
 
     # Relationships
@@ -27,3 +39,16 @@ class Category(TenantMixin, AuditMixin, Base):
         "Category", remote_side="Category.id", backref="children", foreign_keys=[parent_id]
     )
 
+
+@event.listens_for(Category, "before_insert")
+def _assign_path(mapper, connection, target: Category) -> None:
+    if target.path:
+        return
+    if target.id is None:
+        target.id = uuid.uuid4()
+    parent_path = None
+    if target.parent_id is not None:
+        parent_path = connection.execute(
+            select(Category.path).where(Category.id == target.parent_id)
+        ).scalar_one_or_none()
+    target.path = category_path(target.id, parent_path)
@@ -6,7 +6,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import ENUM, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -42,8 +42,13 @@ class Discount(TenantMixin, AuditMixin, Base):
     """Discount/promotion rule."""
 
     __tablename__ = "discounts"
+    __table_args__ = (
+        # Codes are unique per tenant; also serves coupon lookups by (tenant_id, code)
+        UniqueConstraint("tenant_id", "code", name="uq_discounts_tenant_code"),
+        {"info": {"multi_tenant": True}},
+    )
 
-    code: Mapped[str] = mapped_column(String(length=64), nullable=False, unique=True, index=True)  # Coupon code
+    code: Mapped[str] = mapped_column(String(length=64), nullable=False)  # Coupon code
     name: Mapped[str] = mapped_column(String(length=255), nullable=False)  # Display name
     description: Mapped[str | None] = mapped_column(String(length=1000), nullable=True)
 
@@ -0,0 +1,39 @@
+"""Ledger of coupon redemptions."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TenantMixin
+
+
+class DiscountRedemption(TenantMixin, Base):
+    """One use of a discount, recorded alongside the atomic usage counter increment.
+
+    ``(discount_id, customer_id)`` is indexed so per-customer limits are an
+    index-only count rather than a scan of the discount's history.
+    """
+
+    __tablename__ = "discount_redemptions"
+    __table_args__ = (
+        Index("ix_discount_redemptions_discount_customer", "discount_id", "customer_id"),
+        {"info": {"multi_tenant": True}},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    discount_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("discounts.id"), nullable=False)
+    customer_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    order_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("orders.id"), nullable=True, index=True
+    )
+    discount_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(length=3), nullable=False)
+    redeemed_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,22 @@
+"""Per-tenant metal rate persistence model."""
+
+from __future__ import annotations
+
+from sqlalchemy import Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import AuditMixin, Base, TenantMixin
+
+
+class MetalRate(TenantMixin, AuditMixin, Base):
+    """Current rate per gram for a metal at a purity (e.g. Gold 22K), used to price jewelry."""
+
+    __tablename__ = "metal_rates"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "material", "purity", name="uq_metal_rates_tenant_material_purity"),
+    )
+
+    material: Mapped[str] = mapped_column(String(length=100), nullable=False)  # Gold, Silver, Platinum
+    purity: Mapped[str] = mapped_column(String(length=50), nullable=False)  # 24K, 22K, 925
+    rate_per_gram: Mapped[Numeric] = mapped_column(Numeric(10, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(length=3), nullable=False, default="INR")
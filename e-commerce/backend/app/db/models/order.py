@@ -5,7 +5,7 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Enum, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Enum, ForeignKey, Index, Integer, Numeric, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from typing import TYPE_CHECKING
 
@@ -34,6 +34,22 @@ class OrderStatus(str, enum.Enum):
 
 class Order(TenantMixin, AuditMixin, Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Admin order list, newest first
+        Index("ix_orders_tenant_created", "tenant_id", text("created_date DESC")),
+        # Customer order history; also serves plain (tenant_id, customer_id) lookups
+        Index("ix_orders_tenant_customer_created", "tenant_id", "customer_id", text("created_date DESC")),
+        Index("ix_orders_tenant_status", "tenant_id", "status"),
+        # Sales reports aggregate non-cancelled orders over a date range without visiting the heap
+        Index(
+            "ix_orders_tenant_created_not_cancelled",
+            "tenant_id",
+            "created_date",
+            postgresql_include=["total_amount", "total_currency"],
+            postgresql_where=text("status <> 'Cancelled'"),
+        ),
+        {"info": {"multi_tenant": True}},
+    )
 
     customer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     payment_method_id: Mapped[uuid.UUID] = mapped_column(
@@ -5,7 +5,7 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Boolean, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -36,10 +36,21 @@ class PaymentTransaction(TenantMixin, AuditMixin, Base):
     """Payment transaction record."""
 
     __tablename__ = "payment_transactions"
-
-    order_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False, index=True
+    __table_args__ = (
+        # Keyset scan used by payment reconciliation over open transactions
+        Index(
+            "ix_payment_transactions_open_provider_created",
+            "provider",
+            "created_date",
+            "id",
+            postgresql_where=text("status IN ('Pending', 'Processing')"),
+        ),
+        # A payment's open or settled transactions; also serves plain order_id lookups
+        Index("ix_payment_transactions_order_status", "order_id", "status"),
+        Index("ix_payment_transactions_tenant_status", "tenant_id", "status"),
     )
+
+    order_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
     payment_method_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("payment_methods.id"), nullable=False, index=True
     )
@@ -52,7 +63,7 @@ class PaymentTransaction(TenantMixin, AuditMixin, Base):
         String(length=255), nullable=True, index=True
     )  # External transaction ID from provider
     provider_payment_intent_id: Mapped[str | None] = mapped_column(
-        String(length=255), nullable=True
+        String(length=255), nullable=True, index=True
     )  # Payment intent ID (Stripe) or order ID (Razorpay)
 
     # Amount details
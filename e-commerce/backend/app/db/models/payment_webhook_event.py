@@ -0,0 +1,60 @@
+"""Inbox of payment provider webhook events."""
+
+from __future__ import annotations
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.payment_transaction import PaymentProvider
+
+
+class WebhookEventStatus(str, enum.Enum):
+    """Processing state of a received webhook event."""
+
+    pending = "Pending"
+    processed = "Processed"
+    ignored = "Ignored"  # Event type we do not act on, or no matching transaction
+    failed = "Failed"
+
+
+class PaymentWebhookEvent(Base):
+    """Webhook delivery stored verbatim before it is applied.
+
+    Providers retry deliveries, so ``(provider, provider_event_id)`` is unique and
+    duplicates are dropped on insert. Workers drain pending rows in batches.
+    """
+
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        UniqueConstraint("provider", "provider_event_id", name="uq_payment_webhook_events_provider_event"),
+        Index(
+            "ix_payment_webhook_events_pending",
+            "received_date",
+            postgresql_where=text("status = 'Pending'"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    provider: Mapped[PaymentProvider] = mapped_column(
+        Enum(PaymentProvider, values_callable=lambda x: [e.value for e in x]), nullable=False
+    )
+    provider_event_id: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(length=100), nullable=False)
+    # Payment intent ID (Stripe) or order/payment ID (Razorpay) the event refers to
+    provider_reference: Mapped[str | None] = mapped_column(String(length=255), nullable=True)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # Raw JSON body
+    status: Mapped[WebhookEventStatus] = mapped_column(
+        String(length=20), nullable=False, default=WebhookEventStatus.pending.value
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(String(length=500), nullable=True)
+    received_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    processed_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,9 +13,16 @@ from app.db.base import AuditMixin, Base, TenantMixin
 
 class Product(TenantMixin, AuditMixin, Base):
     __tablename__ = "products"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "sku", name="uq_products_tenant_sku"),
+        # Repricing selects a tenant's products by metal and purity when a rate changes
+        Index("ix_products_tenant_material_purity", "tenant_id", text("lower(material)"), text("lower(purity)")),
+        # Catalog list, newest first
+        Index("ix_products_tenant_created", "tenant_id", text("created_date DESC")),
+    )
 
     name: Mapped[str] = mapped_column(String(length=255), nullable=False)
-    sku: Mapped[str] = mapped_column(String(length=64), nullable=False, unique=True, index=True)
+    sku: Mapped[str] = mapped_column(String(length=64), nullable=False)
     description: Mapped[str | None] = mapped_column(Text(), nullable=True)
     price_currency: Mapped[str] = mapped_column(String(length=3), nullable=False)
     price_amount: Mapped[Numeric] = mapped_column(Numeric(12, 2), nullable=False)
@@ -0,0 +1,23 @@
+"""Per-tenant returns policy persistence model."""
+
+from __future__ import annotations
+
+from sqlalchemy import Boolean, Integer, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import AuditMixin, Base, TenantMixin
+
+
+class ReturnPolicy(TenantMixin, AuditMixin, Base):
+    """Returns automation and SLA settings for a tenant; tenants without one use the configured defaults."""
+
+    __tablename__ = "return_policies"
+    __table_args__ = (UniqueConstraint("tenant_id", name="uq_return_policies_tenant"),)
+
+    auto_approval_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Returns are auto-approved for orders up to this total, placed within this many days
+    auto_approve_max_amount: Mapped[Numeric] = mapped_column(Numeric(12, 2), nullable=False)
+    auto_approve_max_order_age_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Hours from creation to acknowledge (decide) a return and to resolve (refund) an approved one
+    acknowledgement_sla_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=24)
+    resolution_sla_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=72)
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import enum
 import uuid
+from datetime import datetime
 
-from sqlalchemy import Enum, ForeignKey, Numeric, String, UniqueConstraint
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from typing import TYPE_CHECKING
 
@@ -34,6 +35,27 @@ class ReturnRequest(TenantMixin, AuditMixin, Base):
     __tablename__ = "return_requests"
     __table_args__ = (
         UniqueConstraint("tenant_id", "order_id", name="uq_return_requests_tenant_order"),
+        # Return lists, newest first, optionally filtered by status
+        Index("ix_return_requests_tenant_created", "tenant_id", text("created_date DESC")),
+        Index("ix_return_requests_tenant_status_created", "tenant_id", "status", text("created_date DESC")),
+        # Auto-approval excludes customers with a rejected return
+        Index(
+            "ix_return_requests_rejected_customer",
+            "tenant_id",
+            "customer_id",
+            postgresql_where=text("status = 'Rejected'"),
+        ),
+        # The SLA job only looks at open returns whose warning time has passed
+        Index(
+            "ix_return_requests_acknowledge_sla",
+            "acknowledge_warning_date",
+            postgresql_where=text("status = 'Pending'"),
+        ),
+        Index(
+            "ix_return_requests_resolve_sla",
+            "resolve_warning_date",
+            postgresql_where=text("status = 'Approved'"),
+        ),
     )
 
     order_id: Mapped[uuid.UUID] = mapped_column(
@@ -54,6 +76,11 @@ class ReturnRequest(TenantMixin, AuditMixin, Base):
     )
     refund_amount: Mapped[Numeric | None] = mapped_column(Numeric(12, 2), nullable=True)
     refund_currency: Mapped[str | None] = mapped_column(String(length=3), nullable=True)
+    # SLA clocks start at creation; deadlines come from the tenant's return policy
+    acknowledge_warning_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    acknowledge_due_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    resolve_warning_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    resolve_due_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     order: Mapped["Order | None"] = relationship("Order", foreign_keys=[order_id], lazy="selectin")
     refund_transaction: Mapped["PaymentTransaction | None"] = relationship(
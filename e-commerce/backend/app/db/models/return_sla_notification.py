@@ -0,0 +1,36 @@
+"""Record of SLA notifications sent for return requests."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TenantMixin
+
+
+class ReturnSlaNotification(TenantMixin, Base):
+    """One warning or breach notification for a return's SLA.
+
+    The unique key makes notifying idempotent: each threshold of each SLA is
+    reported once per return, however often the SLA job runs.
+    """
+
+    __tablename__ = "return_sla_notifications"
+    __table_args__ = (
+        UniqueConstraint("return_id", "sla_type", "level", name="uq_return_sla_notifications_return_type_level"),
+        {"info": {"multi_tenant": True}},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    return_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("return_requests.id", ondelete="CASCADE"), nullable=False
+    )
+    sla_type: Mapped[str] = mapped_column(String(length=32), nullable=False)  # acknowledgement, resolution
+    level: Mapped[str] = mapped_column(String(length=16), nullable=False)  # warning, breach
+    notified_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from sqlalchemy.exc import IntegrityError
+
 
 def ensure_async_database_url(url: str) -> str:
     """Ensure the database URL uses asyncpg driver for async SQLAlchemy.
@@ -25,3 +27,10 @@ def ensure_async_database_url(url: str) -> str:
     # Already has asyncpg or other driver, return as-is
     return url
 
+
+def violated_constraint(error: IntegrityError) -> str | None:
+    """Name of the unique constraint ``error`` violated, or None for other integrity errors."""
+    if getattr(error.orig, "sqlstate", None) != "23505":
+        return None
+    # asyncpg reports the constraint on the driver exception the DBAPI adapter wraps
+    return getattr(error.orig.__cause__, "constraint_name", None)
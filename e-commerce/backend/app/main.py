@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.routes import (
     audit,
@@ -15,15 +20,27 @@ from app.api.routes import (
     orders,
     payment_methods,
     payments,
+    pricing,
     products,
     reports,
     returns,
     shipping_methods,
+    storefront,
     tenants,
     uploads,
     users,
+    webhooks,
 )
 from app.core.config import get_settings
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    MetricsMiddleware,
+    collect_celery_queue_depths,
+    registry,
+)
+from app.core.query_counter import QueryCounterMiddleware
+from app.services.audit import audit_buffer
+from app.services.payment_gateways import gateway_registry
 
 settings = get_settings()
 logger = structlog.get_logger(__name__)
@@ -32,6 +49,7 @@ app = FastAPI(
     title=settings.app_name,
     version="1.0.0",
     description="Multi-tenant commerce API.",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -42,6 +60,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
+)
+
+if settings.query_debug:
+    app.add_middleware(QueryCounterMiddleware, repeat_threshold=settings.query_repeat_threshold)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router)
 app.include_router(products.router)
 app.include_router(orders.router)
@@ -53,10 +83,13 @@ app.include_router(reports.router)
 app.include_router(payment_methods.router)
 app.include_router(categories.router)
 app.include_router(shipping_methods.router)
+app.include_router(storefront.router)
 app.include_router(discounts.router)
 app.include_router(payments.router)
+app.include_router(pricing.router)
 app.include_router(returns.router)
 app.include_router(uploads.router)
+app.include_router(webhooks.router)
 
 
 @app.get("/health", tags=["Diagnostics"])
@@ -64,7 +97,25 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Diagnostics"], include_in_schema=False)
+async def metrics() -> Response:
+    """Expose instrumentation in the Prometheus text format."""
+    queues = [queue.strip() for queue in settings.metrics_celery_queues.split(",") if queue.strip()]
+    if queues:
+        await run_in_threadpool(collect_celery_queue_depths, settings.celery_broker_url, queues)
+    return Response(content=registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
+    if settings.payment_gateway_warm_up:
+        # In the background so a slow provider never delays startup
+        app.state.gateway_warm_up = asyncio.create_task(gateway_registry.warm_up())
     logger.info("startup.complete", environment=settings.environment)
 
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await audit_buffer.close()
+    gateway_registry.close()
+
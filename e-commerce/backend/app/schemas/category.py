@@ -50,3 +50,21 @@ class CategoryListResponse(BaseModel):
     page_size: int = Field(alias="pageSize")
     total: int
 
+
+class CategoryTreeNode(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID
+    name: str
+    slug: str
+    description: Optional[str] = None
+    parent_id: Optional[UUID] = Field(default=None, alias="parentId")
+    is_active: bool = Field(alias="isActive")
+    depth: int
+    children: List["CategoryTreeNode"] = Field(default_factory=list)
+
+
+class CategoryTreeResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    items: List[CategoryTreeNode]
@@ -118,6 +118,7 @@ class DiscountApplyRequest(BaseModel):
     order_amount: Decimal = Field(..., alias="orderAmount", ge=0)
     order_currency: str = Field(..., alias="orderCurrency", max_length=3)
     customer_id: UUID | None = Field(None, alias="customerId")
+    order_id: UUID | None = Field(None, alias="orderId")
 
 
 class DiscountApplyResponse(BaseModel):
@@ -130,3 +131,38 @@ class DiscountApplyResponse(BaseModel):
     discount_currency: str = Field(..., alias="discountCurrency")
     final_amount: Decimal = Field(..., alias="finalAmount")
 
+
+class CartLineInput(BaseModel):
+    """Cart line to price."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    product_id: UUID = Field(..., alias="productId")
+    quantity: int = Field(..., ge=1)
+    unit_price: Decimal = Field(..., alias="unitPrice", ge=0)
+    category_id: UUID | None = Field(None, alias="categoryId")
+
+
+class CartPricingRequest(BaseModel):
+    """Request to find the best discount for a cart."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    currency: str = Field(..., max_length=3)
+    items: list[CartLineInput] = Field(..., min_length=1, max_length=500)
+    codes: list[str] | None = Field(None, description="Coupon codes to consider; all active promotions if omitted")
+
+
+class CartPricingResponse(BaseModel):
+    """Best discount for a cart."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    currency: str
+    subtotal: Decimal
+    discount_amount: Decimal = Field(..., alias="discountAmount")
+    final_amount: Decimal = Field(..., alias="finalAmount")
+    discount_id: UUID | None = Field(None, alias="discountId")
+    discount_code: str | None = Field(None, alias="discountCode")
+    discount_name: str | None = Field(None, alias="discountName")
+    free_shipping_code: str | None = Field(None, alias="freeShippingCode")
@@ -8,6 +8,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.db.models.order import OrderStatus
+from app.core.serialization import ModelSerializer
 from app.schemas.shared import AuditSchema, Money
 
 
@@ -55,3 +56,15 @@ class OrderRead(BaseModel):
     total: Money
     audit: AuditSchema
 
+
+class OrderListResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    items: List[OrderRead]
+    total: int
+    page: int
+    page_size: int = Field(alias="pageSize")
+
+
+order_serializer = ModelSerializer(OrderRead)
+order_list_serializer = ModelSerializer(OrderListResponse)
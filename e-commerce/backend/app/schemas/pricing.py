@@ -0,0 +1,67 @@
+"""Jewelry pricing schemas."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.shared import AuditSchema
+
+
+class MetalRateUpsert(BaseModel):
+    """Set the rate per gram for a metal at a purity."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    material: str = Field(..., min_length=1, max_length=100)
+    purity: str = Field(..., min_length=1, max_length=50)
+    rate_per_gram: Decimal = Field(..., alias="ratePerGram", gt=0, decimal_places=2)
+    currency: str = Field(default="INR", min_length=3, max_length=3)
+
+
+class MetalRateRead(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID
+    material: str
+    purity: str
+    rate_per_gram: Decimal = Field(..., alias="ratePerGram")
+    currency: str
+    audit: AuditSchema
+
+
+class MetalRateUpdateResponse(BaseModel):
+    """Rate after the update and how many products were repriced."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    rate: MetalRateRead
+    repriced_products: int = Field(..., alias="repricedProducts")
+
+
+class MetalRateListResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    items: List[MetalRateRead]
+
+
+class PriceBreakdownRead(BaseModel):
+    """Computed price of a product and its components."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    product_id: UUID = Field(..., alias="productId")
+    currency: str
+    rate_based: bool = Field(..., alias="rateBased")
+    rate_per_gram: Optional[Decimal] = Field(default=None, alias="ratePerGram")
+    weight: Optional[Decimal] = None
+    metal_value: Decimal = Field(..., alias="metalValue")
+    wastage_value: Decimal = Field(..., alias="wastageValue")
+    making_charges: Decimal = Field(..., alias="makingCharges")
+    stone_charges: Decimal = Field(..., alias="stoneCharges")
+    subtotal: Decimal
+    gst_amount: Decimal = Field(..., alias="gstAmount")
+    total: Decimal
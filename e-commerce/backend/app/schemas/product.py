@@ -7,6 +7,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.serialization import ModelSerializer
 from app.schemas.shared import AuditSchema, Money
 
 
@@ -114,3 +115,6 @@ class ProductListResponse(BaseModel):
     page_size: int = Field(alias="pageSize")
     total: int
 
+
+product_serializer = ModelSerializer(ProductRead)
+product_list_serializer = ModelSerializer(ProductListResponse)
@@ -75,6 +75,8 @@ class ReturnRead(BaseModel):
     refund_transaction_id: UUID | None = Field(default=None, alias="refundTransactionId")
     refund_amount: Decimal | None = Field(default=None, alias="refundAmount")
     refund_currency: str | None = Field(default=None, alias="refundCurrency")
+    acknowledge_due_date: datetime | None = Field(default=None, alias="acknowledgeDueDate")
+    resolve_due_date: datetime | None = Field(default=None, alias="resolveDueDate")
     audit: AuditSchema
     customer: ReturnCustomer | None = None
     order: ReturnOrderSummary | None = None
@@ -109,3 +111,26 @@ class ReturnRefundRequest(BaseModel):
     amount: Decimal | None = Field(default=None, description="Amount to refund. Defaults to full amount.")
     reason: str | None = Field(default=None, description="Reason for refund override.")
 
+
+class ReturnPolicyRead(BaseModel):
+    """Returns automation and SLA settings in effect for the tenant."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    auto_approval_enabled: bool = Field(alias="autoApprovalEnabled")
+    auto_approve_max_amount: Decimal = Field(alias="autoApproveMaxAmount")
+    auto_approve_max_order_age_days: int = Field(alias="autoApproveMaxOrderAgeDays")
+    acknowledgement_sla_hours: int = Field(alias="acknowledgementSlaHours")
+    resolution_sla_hours: int = Field(alias="resolutionSlaHours")
+
+
+class ReturnPolicyUpdate(BaseModel):
+    """Partial update of the tenant's returns automation and SLA settings."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    auto_approval_enabled: Optional[bool] = Field(default=None, alias="autoApprovalEnabled")
+    auto_approve_max_amount: Decimal | None = Field(default=None, ge=0, alias="autoApproveMaxAmount")
+    auto_approve_max_order_age_days: Optional[int] = Field(default=None, ge=0, alias="autoApproveMaxOrderAgeDays")
+    acknowledgement_sla_hours: Optional[int] = Field(default=None, ge=1, alias="acknowledgementSlaHours")
+    resolution_sla_hours: Optional[int] = Field(default=None, ge=1, alias="resolutionSlaHours")
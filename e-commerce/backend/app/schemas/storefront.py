@@ -0,0 +1,47 @@
+"""Storefront configuration bundle schemas."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.db.models.payment_method import PaymentMethodType
+from app.schemas.category import CategoryTreeNode
+from app.schemas.shared import Money
+
+
+class StorefrontPaymentMethod(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID
+    name: str
+    type: PaymentMethodType
+    description: Optional[str] = None
+    requires_processing: bool = Field(alias="requiresProcessing")
+    processing_fee_percentage: Optional[float] = Field(default=None, alias="processingFeePercentage")
+    processing_fee_fixed: Optional[float] = Field(default=None, alias="processingFeeFixed")
+
+
+class StorefrontShippingMethod(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    estimated_days_min: Optional[int] = Field(default=None, alias="estimatedDaysMin")
+    estimated_days_max: Optional[int] = Field(default=None, alias="estimatedDaysMax")
+    base_cost: Money = Field(alias="baseCost")
+    cost_per_kg: Optional[Money] = Field(default=None, alias="costPerKg")
+    requires_signature: bool = Field(alias="requiresSignature")
+    is_express: bool = Field(alias="isExpress")
+
+
+class StorefrontConfig(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    version: Optional[str] = None
+    payment_methods: List[StorefrontPaymentMethod] = Field(alias="paymentMethods")
+    shipping_methods: List[StorefrontShippingMethod] = Field(alias="shippingMethods")
+    categories: List[CategoryTreeNode]
@@ -1,22 +1,212 @@
-"""Audit log service."""
+"""Audit log service and the buffered writer behind it."""
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Sequence
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 
+from app.core.config import get_settings
+from app.core.metrics import (
+    audit_log_buffer_pending,
+    audit_log_entries_dropped_total,
+    audit_log_entries_rejected_total,
+    audit_log_entries_written_total,
+    audit_log_flush_seconds,
+)
 from app.db.models.audit_log import AuditAction, AuditLog
+from app.db.utils import ensure_async_database_url
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+
+def _rejects_row(error: DBAPIError) -> bool:
+    """Whether the database refused the row's data (SQLSTATE classes 22 and 23) rather than failing itself."""
+    sqlstate = getattr(error.orig, "sqlstate", None) or ""
+    return sqlstate[:2] in ("22", "23")
+
+
+def _dedicated_engine() -> AsyncEngine:
+    # One connection, so audit flushes never compete with request sessions for the main pool
+    return create_async_engine(
+        ensure_async_database_url(settings.database_url), pool_size=1, max_overflow=0, pool_pre_ping=True
+    )
+
+
+class AuditBuffer:
+    """In-process queue of audit rows written in bulk off the request path.
+
+    Entries are flushed as multi-row INSERTs through a dedicated connection
+    once ``batch_size`` are pending or every ``flush_interval_ms``, whichever
+    comes first. A flush that fails on the connection or server keeps its rows
+    for the next attempt; when the database stays down, the oldest rows beyond
+    ``max_pending`` are dropped (and counted) rather than growing memory without
+    bound. A batch the database rejects for its data is retried row by row, so
+    only the offending rows are dropped and the rest are not held up behind them. Entries still
+    pending when the process dies are lost, so actions whose audit record must
+    commit with them use ``AuditService.log_action(..., strict=True)``.
+
+    Without an ``engine`` the buffer creates, and disposes, its own
+    single-connection engine per event loop; a passed engine is left to its owner.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine | None = None,
+        batch_size: int | None = None,
+        flush_interval_ms: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = (flush_interval_ms or settings.audit_flush_interval_ms) / 1000
+        self.max_pending = max_pending or settings.audit_max_pending
+        self._pending: list[dict[str, Any]] = []
+        self._engine = engine
+        self._owns_engine = engine is None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flusher: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections and primitives are bound to the loop that created them
+            if self._owns_engine and self._engine is not None:
+                # The old loop may be closed, so release its connections without awaiting them
+                self._engine.sync_engine.dispose(close=False)
+                self._engine = None
+            self._flusher = None
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return loop
+
+    def _ensure_flusher(self) -> None:
+        loop = self._bind_loop()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._run())
+
+    async def enqueue(self, entry: dict[str, Any]) -> None:
+        self._ensure_flusher()
+        self._pending.append(entry)
+        audit_log_buffer_pending.set(len(self._pending))
+        if len(self._pending) >= self.max_pending:
+            # Writers wait for the database instead of outrunning it
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write pending entries in batches; returns the number written."""
+        written = 0
+        async with self._lock:
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                started = time.perf_counter()
+                try:
+                    try:
+                        await self._insert(batch)
+                    except DBAPIError as exc:
+                        if not _rejects_row(exc):
+                            raise
+                        written += await self._insert_each(batch)
+                        continue
+                except Exception as exc:  # noqa: BLE001 - connection or server trouble: keep the rows and retry
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        audit_log_entries_dropped_total.inc(overflow)
+                    logger.warning("audit_flush_failed", error=str(exc), pending=len(self._pending))
+                    break
+                del self._pending[: len(batch)]
+                written += len(batch)
+                audit_log_flush_seconds.observe(time.perf_counter() - started)
+                audit_log_entries_written_total.inc(len(batch))
+        audit_log_buffer_pending.set(len(self._pending))
+        return written
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        if self._engine is None:
+            self._engine = _dedicated_engine()
+        async with self._engine.begin() as connection:
+            await connection.execute(insert(AuditLog), rows)
+
+    async def _insert_each(self, batch: list[dict[str, Any]]) -> int:
+        """Write ``batch`` (the head of the queue) row by row, dropping rows the database rejects.
+
+        Rows leave the queue as they are handled, so a connection failure part
+        way through retries only the rest. Returns the number written.
+        """
+        written = 0
+        for entry in batch:
+            try:
+                await self._insert([entry])
+            except DBAPIError as exc:
+                if not _rejects_row(exc):
+                    raise
+                audit_log_entries_rejected_total.inc()
+                logger.error(
+                    "audit_entry_rejected",
+                    error=str(exc.orig),
+                    entity_type=entry.get("entity_type"),
+                    entity_id=str(entry.get("entity_id")),
+                    action=entry.get("action"),
+                )
+            else:
+                written += 1
+                audit_log_entries_written_total.inc()
+            del self._pending[0]
+        return written
+
+    async def close(self) -> None:
+        """Stop the flusher, write what is pending and release the connection."""
+        self._bind_loop()
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._flusher = None
+        await self.flush()
+        if self._owns_engine and self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+
+audit_buffer = AuditBuffer()
 
 
 class AuditService:
     """Service for audit log operations."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, buffer: AuditBuffer | None = None) -> None:
         self.session = session
+        self.buffer = buffer or audit_buffer
 
     async def log_action(
         self,
@@ -28,21 +218,33 @@ class AuditService:
         changes: dict | None = None,
         ip_address: str | None = None,
         user_agent: str | None = None,
+        strict: bool = False,
     ) -> AuditLog:
-        """Create an audit log entry."""
-        audit_log = AuditLog(
-            entity_type=entity_type,
-            entity_id=entity_id,
-            tenant_id=tenant_id,
-            action=action,
-            actor_id=actor_id,
-            changes=json.dumps(changes) if changes else None,
-            ip_address=ip_address,
-            user_agent=user_agent,
-        )
-        self.session.add(audit_log)
-        await self.session.commit()
-        await self.session.refresh(audit_log)
+        """Record an audit entry without committing the caller's session.
+
+        By default the entry goes to the buffered writer and is persisted
+        shortly after, independently of the caller's transaction. With
+        ``strict`` it is added to the caller's session instead, so it commits
+        or rolls back together with the audited change.
+        """
+        entry = {
+            "id": uuid.uuid4(),
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "tenant_id": tenant_id,
+            "action": action.value if isinstance(action, AuditAction) else action,
+            "actor_id": actor_id,
+            "changes": json.dumps(changes) if changes else None,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            # Stamped now: a buffered row reaches the database later
+            "created_date": datetime.now(timezone.utc),
+        }
+        audit_log = AuditLog(**entry)
+        if strict:
+            self.session.add(audit_log)
+        else:
+            await self.buffer.enqueue(entry)
         return audit_log
 
     async def list_audit_logs(
@@ -51,30 +253,37 @@ class AuditService:
         entity_type: str | None = None,
         entity_id: UUID | None = None,
         action: AuditAction | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
         page: int = 1,
         page_size: int = 50,
     ) -> tuple[Sequence[AuditLog], int]:
-        """List audit logs with filtering."""
-        query = select(AuditLog)
-        count_stmt = select(func.count()).select_from(AuditLog)
+        """List audit logs with filtering.
 
+        The ``created_date`` window (the last ``audit_query_lookback_days`` by
+        default) lets Postgres prune to the monthly partitions it covers.
+        """
+        date_from = date_from or datetime.now(timezone.utc) - timedelta(days=settings.audit_query_lookback_days)
+        conditions = [AuditLog.created_date >= date_from]
+        if date_to:
+            conditions.append(AuditLog.created_date < date_to)
         if tenant_id:
-            query = query.where(AuditLog.tenant_id == tenant_id)
-            count_stmt = count_stmt.where(AuditLog.tenant_id == tenant_id)
-
+            conditions.append(AuditLog.tenant_id == tenant_id)
         if entity_type:
-            query = query.where(AuditLog.entity_type == entity_type)
-            count_stmt = count_stmt.where(AuditLog.entity_type == entity_type)
-
+            conditions.append(AuditLog.entity_type == entity_type)
         if entity_id:
-            query = query.where(AuditLog.entity_id == entity_id)
-            count_stmt = count_stmt.where(AuditLog.entity_id == entity_id)
-
+            conditions.append(AuditLog.entity_id == entity_id)
         if action:
-            query = query.where(AuditLog.action == action)
-            count_stmt = count_stmt.where(AuditLog.action == action)
+            conditions.append(AuditLog.action == action)
 
-        query = query.order_by(AuditLog.created_date.desc()).offset((page - 1) * page_size).limit(page_size)
+        query = (
+            select(AuditLog)
+            .where(*conditions)
+            .order_by(AuditLog.created_date.desc(), AuditLog.id.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        count_stmt = select(func.count()).select_from(AuditLog).where(*conditions)
 
         result = await self.session.execute(query)
         logs = result.scalars().all()
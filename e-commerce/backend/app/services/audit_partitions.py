@@ -0,0 +1,212 @@
+"""Monthly partition maintenance and Parquet archival for ``audit_logs``."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+PARENT = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})_(\d{2})$")
+ARCHIVE_COLUMNS = (
+    "id",
+    "entity_type",
+    "entity_id",
+    "tenant_id",
+    "action",
+    "actor_id",
+    "changes",
+    "ip_address",
+    "user_agent",
+    "created_date",
+)
+ARCHIVE_CHUNK_ROWS = 50_000
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month.year:04d}_{month.month:02d}"
+
+
+def _archive_schema() -> "pa.Schema":
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("entity_type", pa.string()),
+            ("entity_id", pa.string()),
+            ("tenant_id", pa.string()),
+            ("action", pa.string()),
+            ("actor_id", pa.string()),
+            ("changes", pa.string()),
+            ("ip_address", pa.string()),
+            ("user_agent", pa.string()),
+            ("created_date", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    """Outcome of one partition maintenance run."""
+
+    created: list[str] = field(default_factory=list)
+    archived: dict[str, int] = field(default_factory=dict)  # Partition -> rows archived
+
+    def as_dict(self) -> dict:
+        return {"created": self.created, "archived": self.archived}
+
+
+class AuditPartitionService:
+    """Keeps ``audit_logs`` partitioned by month and archives expired months.
+
+    Partitions are created ``months_ahead`` in advance so inserts never fall
+    through to the default partition. Months older than the retention window
+    are exported to zstd-compressed Parquet under ``archive_dir`` while still
+    attached (reads take no strong lock), then detached and dropped in one
+    short transaction once the file is complete and its row count matches.
+    Archival needs ``pyarrow``; without it, a run with expired partitions
+    fails rather than keeping them past retention unnoticed.
+    """
+
+    def __init__(self, session: AsyncSession, archive_dir: str | os.PathLike | None = None) -> None:
+        self.session = session
+        self.archive_dir = Path(archive_dir or settings.audit_archive_dir)
+
+    async def partitions(self) -> dict[str, date]:
+        """Attached monthly partitions by name, with the month each covers."""
+        result = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": PARENT},
+        )
+        found = {}
+        for (name,) in result.all():
+            match = PARTITION_NAME.match(name)
+            if match:
+                found[name] = date(int(match.group(1)), int(match.group(2)), 1)
+        return found
+
+    async def ensure_partitions(self, months_ahead: int | None = None, today: date | None = None) -> list[str]:
+        """Create monthly partitions from the current month through ``months_ahead``; returns those created."""
+        months_ahead = settings.audit_partition_months_ahead if months_ahead is None else months_ahead
+        current = month_start(today or datetime.now(timezone.utc).date())
+        existing = await self.partitions()
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name not in existing:
+                await self._create_partition(name, month)
+                created.append(name)
+        await self.session.commit()
+        return created
+
+    async def _create_partition(self, name: str, month: date) -> None:
+        start, end = month.isoformat(), add_months(month, 1).isoformat()
+        # Rows already in the default partition for this month move into the new table before it attaches
+        await self.session.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT} INCLUDING DEFAULTS)'))
+        await self.session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE created_date >= '{start}' AND created_date < '{end}' RETURNING *) "
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            )
+        )
+        await self.session.execute(
+            text(f"ALTER TABLE {PARENT} ATTACH PARTITION \"{name}\" FOR VALUES FROM ('{start}') TO ('{end}')")
+        )
+        logger.info("audit_partition_created", partition=name)
+
+    async def archive_expired(self, retention_months: int | None = None, today: date | None = None) -> RetentionReport:
+        """Archive and drop partitions whose month ended before the retention window."""
+        retention_months = settings.audit_retention_months if retention_months is None else retention_months
+        cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+        report = RetentionReport()
+        expired = sorted(name for name, month in (await self.partitions()).items() if month < cutoff)
+        await self.session.commit()
+        if expired and not HAS_PYARROW:
+            raise RuntimeError(f"pyarrow is required to archive expired audit partitions: {', '.join(expired)}")
+
+        for name in expired:
+            rows = await self._export(name)
+            await self.session.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}"'))
+            await self.session.execute(text(f'DROP TABLE "{name}"'))
+            await self.session.commit()
+            report.archived[name] = rows
+            logger.info("audit_partition_archived", partition=name, rows=rows)
+        return report
+
+    async def run(self) -> RetentionReport:
+        """Scheduled maintenance: create upcoming partitions, then archive expired ones."""
+        created = await self.ensure_partitions()
+        report = await self.archive_expired()
+        report.created = created
+        return report
+
+    async def _export(self, name: str) -> int:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        target = self.archive_dir / f"{name}.parquet"
+        partial = target.with_suffix(".parquet.part")
+        schema = _archive_schema()
+        expected = await self.session.scalar(text(f'SELECT count(*) FROM "{name}"'))
+
+        written = 0
+        writer = pq.ParquetWriter(partial, schema, compression="zstd")
+        try:
+            result = await self.session.stream(
+                text(f'SELECT {", ".join(ARCHIVE_COLUMNS)} FROM "{name}" ORDER BY created_date, id')
+            )
+            async for chunk in result.partitions(ARCHIVE_CHUNK_ROWS):
+                batch = pa.Table.from_pylist(
+                    [
+                        {
+                            column: str(value) if value is not None and column.endswith("id") else value
+                            for column, value in row._mapping.items()
+                        }
+                        for row in chunk
+                    ],
+                    schema=schema,
+                )
+                await asyncio.to_thread(writer.write_table, batch)
+                written += len(chunk)
+        finally:
+            writer.close()
+        await self.session.commit()
+
+        if written != expected:
+            partial.unlink(missing_ok=True)
+            raise RuntimeError(f"Archived {written} of {expected} rows from {name}; partition kept.")
+        os.replace(partial, target)
+        return written
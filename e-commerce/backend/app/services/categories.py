@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 from typing import Sequence
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models.category import Category
+from app.core.cache import cache_service
+from app.core.http_cache import CATEGORIES
+from app.db.models.category import Category, category_path
+from app.db.utils import violated_constraint
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.category_tree import CategoryTree, category_tree_cache
 
 
 class CategoryService:
@@ -52,11 +57,19 @@ class CategoryService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
         return category
 
+    async def get_tree(self, tenant_id: UUID) -> CategoryTree:
+        """The tenant's category tree, cached per process until the next category write."""
+        return await category_tree_cache.get(self.session, tenant_id)
+
     async def create_category(
         self, tenant_id: UUID, actor_id: UUID, payload: CategoryCreate
     ) -> Category:
         """Create a new category."""
+        parent_path = None
+        if payload.parent_id is not None:
+            parent_path = (await self.get_category(tenant_id, payload.parent_id)).path
         category = Category(
+            id=uuid4(),
             tenant_id=tenant_id,
             name=payload.name,
             description=payload.description,
@@ -66,9 +79,11 @@ class CategoryService:
             created_by=actor_id,
             modified_by=actor_id,
         )
+        category.path = category_path(category.id, parent_path)
         self.session.add(category)
-        await self.session.commit()
+        await self._commit_unique_slug(payload.slug)
         await self.session.refresh(category)
+        await self._invalidate(tenant_id)
         return category
 
     async def update_category(
@@ -77,16 +92,9 @@ class CategoryService:
         """Update an existing category."""
         category = await self.get_category(tenant_id, category_id)
 
-        # Validate slug uniqueness if slug is being updated
-        if payload.slug and payload.slug != category.slug:
-            existing = await self.session.execute(
-                select(Category).where(Category.slug == payload.slug, Category.tenant_id == tenant_id)
-            )
-            if existing.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Category with slug '{payload.slug}' already exists",
-                )
+        # Re-parent first: its queries autoflush, and a slug collision should surface at commit
+        if payload.parent_id is not None and payload.parent_id != category.parent_id:
+            await self._move(tenant_id, category, payload.parent_id)
 
         # Update fields
         if payload.name is not None:
@@ -95,14 +103,49 @@ class CategoryService:
             category.description = payload.description
         if payload.slug is not None:
             category.slug = payload.slug
-        if payload.parent_id is not None:
-            category.parent_id = payload.parent_id
         if payload.is_active is not None:
             category.is_active = payload.is_active
 
         category.modified_by = actor_id
 
-        await self.session.commit()
+        await self._commit_unique_slug(category.slug)
         await self.session.refresh(category)
+        await self._invalidate(tenant_id)
         return category
 
+    async def _commit_unique_slug(self, slug: str) -> None:
+        """Commit, mapping a per-tenant slug collision to 409."""
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            if violated_constraint(e) == "uq_categories_tenant_slug":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Category with slug '{slug}' already exists",
+                ) from e
+            raise
+
+    async def _move(self, tenant_id: UUID, category: Category, parent_id: UUID) -> None:
+        """Re-parent ``category``, rewriting the path prefix of its whole subtree in one UPDATE."""
+        parent = await self.get_category(tenant_id, parent_id)
+        if parent.path.startswith(category.path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A category cannot be moved under itself or one of its subcategories",
+            )
+        old_path = category.path
+        new_path = category_path(category.id, parent.path)
+        await self.session.execute(
+            update(Category)
+            .where(Category.tenant_id == tenant_id, Category.path.startswith(old_path, autoescape=True))
+            .values(path=new_path + func.substr(Category.path, len(old_path) + 1))
+            .execution_options(synchronize_session="fetch")
+        )
+        category.parent_id = parent.id
+        category.path = new_path
+
+    async def _invalidate(self, tenant_id: UUID) -> None:
+        category_tree_cache.invalidate(tenant_id)
+        await cache_service.invalidate_catalog(CATEGORIES, str(tenant_id))
+
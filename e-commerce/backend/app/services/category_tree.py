@@ -0,0 +1,146 @@
+"""Per-tenant category tree built from materialized paths."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.core.http_cache import CATEGORIES
+from app.db.models.category import Category
+from app.schemas.category import CategoryTreeNode
+
+settings = get_settings()
+
+
+@dataclass(slots=True)
+class CategoryNode:
+    id: UUID
+    parent_id: UUID | None
+    name: str
+    slug: str
+    description: str | None
+    is_active: bool
+    path: str
+    children: list[CategoryNode] = field(default_factory=list)
+
+    @property
+    def depth(self) -> int:
+        return self.path.count("/") - 2
+
+
+@dataclass(slots=True)
+class CategoryTree:
+    """A tenant's categories as a forest, with subtree and ancestor lookups in memory."""
+
+    tenant_id: UUID
+    generation: int | None
+    built_at: float = field(default_factory=time.monotonic)
+    nodes: dict[UUID, CategoryNode] = field(default_factory=dict)
+    roots: list[CategoryNode] = field(default_factory=list)
+
+    def add(self, node: CategoryNode) -> None:
+        # Nodes arrive in path order, so a parent is always linked before its children
+        self.nodes[node.id] = node
+        parent = self.nodes.get(node.parent_id) if node.parent_id else None
+        (parent.children if parent else self.roots).append(node)
+
+    def descendant_ids(self, category_id: UUID, include_self: bool = True) -> list[UUID]:
+        """Ids of the subtree under ``category_id``; empty if the category is unknown."""
+        node = self.nodes.get(category_id)
+        if node is None:
+            return []
+        ids = [node.id] if include_self else []
+        stack = list(node.children)
+        while stack:
+            child = stack.pop()
+            ids.append(child.id)
+            stack.extend(child.children)
+        return ids
+
+    def ancestors(self, category_id: UUID) -> list[CategoryNode]:
+        """Breadcrumb from the root down to the category's parent."""
+        node = self.nodes.get(category_id)
+        if node is None:
+            return []
+        ids = [UUID(part) for part in node.path.strip("/").split("/")[:-1]]
+        return [self.nodes[ancestor] for ancestor in ids if ancestor in self.nodes]
+
+
+def serialize_tree(nodes: list[CategoryNode], is_active: bool | None = None) -> list[CategoryTreeNode]:
+    """Nested response schemas for ``nodes``; an ``is_active`` filter also prunes the filtered nodes' subtrees."""
+    return [
+        CategoryTreeNode(
+            id=node.id,
+            name=node.name,
+            slug=node.slug,
+            description=node.description,
+            parentId=node.parent_id,
+            isActive=node.is_active,
+            depth=node.depth,
+            children=serialize_tree(node.children, is_active),
+        )
+        for node in nodes
+        if is_active is None or node.is_active == is_active
+    ]
+
+
+class CategoryTreeCache:
+    """Process-local category trees, one per tenant.
+
+    A tree is reused while the tenant's ``categories`` cache generation is
+    unchanged; category writes bump it, so every process rebuilds on its next
+    lookup. Trees are also rebuilt after ``category_tree_ttl`` seconds; when
+    Redis is unavailable that TTL alone decides reuse, bounding staleness.
+    Building is one query ordered by path.
+    """
+
+    def __init__(self) -> None:
+        self._trees: dict[UUID, CategoryTree] = {}
+
+    async def get(self, session: AsyncSession, tenant_id: UUID) -> CategoryTree:
+        generation = await cache_service.get_generation(CATEGORIES, str(tenant_id))
+        tree = self._trees.get(tenant_id)
+        if (
+            tree is not None
+            and (generation is None or tree.generation == generation)
+            and time.monotonic() - tree.built_at < settings.category_tree_ttl
+        ):
+            return tree
+
+        result = await session.execute(
+            select(
+                Category.id,
+                Category.parent_id,
+                Category.name,
+                Category.slug,
+                Category.description,
+                Category.is_active,
+                Category.path,
+            )
+            .where(Category.tenant_id == tenant_id)
+            .order_by(Category.path)
+        )
+        tree = CategoryTree(tenant_id=tenant_id, generation=generation)
+        for row in result.all():
+            tree.add(CategoryNode(*row))
+        for node in tree.nodes.values():
+            node.children.sort(key=lambda child: child.name)
+        tree.roots.sort(key=lambda root: root.name)
+        self._trees[tenant_id] = tree
+        return tree
+
+    def invalidate(self, tenant_id: UUID | None = None) -> None:
+        """Drop this process's tree for a tenant (all when ``None``)."""
+        if tenant_id is None:
+            self._trees.clear()
+        else:
+            self._trees.pop(tenant_id, None)
+
+
+category_tree_cache = CategoryTreeCache()
@@ -8,7 +8,9 @@ from uuid import UUID
 
 import structlog
 from fastapi import HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.events import (
     publish_event,
@@ -67,6 +69,10 @@ class CheckoutSagaOrchestrator:
         """
         Execute the complete checkout saga.
 
+        Database work runs in short transactions that are committed before each
+        payment provider call, so no pooled connection is held while waiting on
+        the provider; state is re-read by id afterwards.
+
         Steps:
         1. Create order (with inventory validation)
         2. Reserve inventory
@@ -88,6 +94,9 @@ class CheckoutSagaOrchestrator:
             logger.info("saga_step_started", step=SagaStep.CREATE_ORDER, tenant_id=str(tenant_id))
             order = await self.order_service.create_order(tenant_id, actor_id, order_payload)
             compensation_steps.append(SagaStep.CREATE_ORDER)
+            # create_order reads the customer after committing; end that transaction
+            # so the connection goes back to the pool before the provider calls
+            await self.session.commit()
             logger.info("saga_step_completed", step=SagaStep.CREATE_ORDER, order_id=str(order.id))
 
             # Step 2: Inventory is already reserved in create_order, but we publish event
@@ -124,9 +133,27 @@ class CheckoutSagaOrchestrator:
                 # Step 4: Confirm Payment (if payment_method_id provided)
                 if payment_method_id and payment_transaction.status == PaymentStatus.processing:
                     logger.info("saga_step_started", step=SagaStep.CONFIRM_PAYMENT, transaction_id=str(payment_transaction.id))
-                    payment_transaction = await self.payment_service.confirm_payment(
-                        tenant_id, payment_transaction.id, payment_method_id, actor_id
-                    )
+                    try:
+                        payment_transaction = await self.payment_service.confirm_payment(
+                            tenant_id, payment_transaction.id, payment_method_id, actor_id
+                        )
+                    except HTTPException as e:
+                        if e.status_code != status.HTTP_503_SERVICE_UNAVAILABLE:
+                            raise
+                        # The charge may still go through; keep the order open for a retried
+                        # confirmation, webhooks or reconciliation rather than compensating
+                        logger.warning(
+                            "saga_payment_provider_unavailable",
+                            step=SagaStep.CONFIRM_PAYMENT,
+                            transaction_id=str(payment_transaction.id),
+                            error=e.detail,
+                        )
+                        return {
+                            "order": order,
+                            "payment_transaction": payment_transaction,
+                            "saga_status": SagaStatus.IN_PROGRESS.value,
+                            "client_secret": self._extract_client_secret(payment_transaction),
+                        }
                     compensation_steps.append(SagaStep.CONFIRM_PAYMENT)
                     logger.info(
                         "saga_step_completed",
@@ -139,10 +166,12 @@ class CheckoutSagaOrchestrator:
                     if payment_transaction.status == PaymentStatus.succeeded:
                         # Step 5: Confirm Order
                         logger.info("saga_step_started", step=SagaStep.CONFIRM_ORDER, order_id=str(order.id))
-                        order.status = OrderStatus.confirmed
-                        order.modified_by = actor_id
+                        # confirm_payment normally confirmed the order already; re-read it by id
+                        order = await self._reload_order(order.id)
+                        if order.status == OrderStatus.pending_payment:
+                            order.status = OrderStatus.confirmed
+                            order.modified_by = actor_id
                         await self.session.commit()
-                        await self.session.refresh(order)
 
                         # Publish order confirmed event
                         publish_order_confirmed(
@@ -198,6 +227,13 @@ class CheckoutSagaOrchestrator:
             if compensation_steps:
                 await self._compensate(tenant_id, order, payment_transaction, compensation_steps, actor_id)
 
+            if isinstance(e, HTTPException) and e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                # Provider fast-failed before anything was charged; the client can retry checkout
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail=f"Checkout saga failed: {e.detail}",
+                    headers=e.headers,
+                )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Checkout saga failed: {str(e)}",
@@ -264,6 +300,16 @@ class CheckoutSagaOrchestrator:
 
         logger.info("saga_compensation_completed", order_id=str(order.id) if order else None)
 
+    async def _reload_order(self, order_id: UUID) -> Order:
+        """Re-read an order by id, overwriting the copy loaded before the gateway calls."""
+        result = await self.session.execute(
+            select(Order)
+            .options(selectinload(Order.items))
+            .where(Order.id == order_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
     async def _release_inventory(self, order: Order, tenant_id: UUID) -> None:
         """Release reserved inventory."""
         for item in order.items:
@@ -279,11 +325,15 @@ class CheckoutSagaOrchestrator:
                     error=str(e),
                 )
 
+        from app.core.cache import cache_service
+        from app.core.http_cache import PRODUCTS
+
+        await cache_service.bump_generation(PRODUCTS, str(tenant_id))
+
     async def _send_order_notification(self, order: Order, tenant_id: UUID) -> None:
         """Send order confirmation notification."""
         from app.services.notifications import NotificationService
         from app.db.models.user import User
-        from sqlalchemy import select
 
         customer_result = await self.session.execute(select(User).where(User.id == order.customer_id))
         customer = customer_result.scalar_one_or_none()
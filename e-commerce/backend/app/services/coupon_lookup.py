@@ -0,0 +1,140 @@
+"""Redis-backed coupon code lookups and attempt throttling."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.core.http_cache import DISCOUNTS
+from app.core.metrics import coupon_attempts_blocked_total, coupon_lookups_total
+from app.db.models.discount import Discount, DiscountStatus
+
+settings = get_settings()
+
+
+@dataclass(slots=True, frozen=True)
+class CouponEntry:
+    """What a code resolves to, enough to reject unusable coupons without loading them."""
+
+    discount_id: UUID
+    usable: bool  # Active and not deactivated
+    valid_from: datetime
+    valid_until: datetime | None
+
+    def to_cache(self) -> dict:
+        return {
+            "id": str(self.discount_id),
+            "usable": self.usable,
+            "valid_from": self.valid_from.isoformat(),
+            "valid_until": self.valid_until.isoformat() if self.valid_until else None,
+        }
+
+    @classmethod
+    def from_cache(cls, data: dict) -> CouponEntry:
+        return cls(
+            discount_id=UUID(data["id"]),
+            usable=data["usable"],
+            valid_from=datetime.fromisoformat(data["valid_from"]),
+            valid_until=datetime.fromisoformat(data["valid_until"]) if data["valid_until"] else None,
+        )
+
+
+async def lookup_coupon(session: AsyncSession, tenant_id: UUID, code: str) -> CouponEntry | None:
+    """Resolve a tenant's coupon code, or ``None`` if it does not exist.
+
+    Entries are keyed on the tenant's ``discounts`` cache generation, which
+    every discount write bumps, so positive entries never outlive an update and
+    a newly created code is never hidden by a negative entry. Unknown codes are
+    cached for ``coupon_negative_cache_ttl`` seconds so repeated guesses do not
+    reach the database.
+    """
+    code = code.upper()
+    generation = await cache_service.get_generation(DISCOUNTS, str(tenant_id))
+    key = f"coupon:{tenant_id}:{generation}:{code}"
+    if generation is not None:
+        cached = await cache_service.get(key)
+        if cached is not None:
+            if cached.get("id") is None:
+                coupon_lookups_total.inc(result="negative_hit")
+                return None
+            coupon_lookups_total.inc(result="hit")
+            return CouponEntry.from_cache(cached)
+
+    coupon_lookups_total.inc(result="database")
+    row = (
+        await session.execute(
+            select(Discount.id, Discount.is_active, Discount.status, Discount.valid_from, Discount.valid_until).where(
+                Discount.tenant_id == tenant_id, Discount.code == code
+            )
+        )
+    ).one_or_none()
+    entry = (
+        CouponEntry(
+            discount_id=row.id,
+            usable=row.is_active and row.status == DiscountStatus.active,
+            valid_from=row.valid_from,
+            valid_until=row.valid_until,
+        )
+        if row is not None
+        else None
+    )
+    if generation is not None:
+        if entry is None:
+            await cache_service.set(key, {"id": None}, ttl=settings.coupon_negative_cache_ttl)
+        else:
+            await cache_service.set(key, entry.to_cache(), ttl=settings.coupon_cache_ttl)
+    return entry
+
+
+class CouponAttemptLimiter:
+    """Fixed-window counters of failed coupon attempts per client IP and per customer.
+
+    Once either counter reaches its limit, further attempts in the window are
+    refused with 429 before any lookup. Counters live in Redis so the limit
+    holds across API processes; without Redis attempts are not throttled.
+    """
+
+    def _keys(self, tenant_id: UUID, client_ip: str | None, customer_id: UUID | None) -> dict[str, str]:
+        window = int(time.time() // settings.coupon_attempt_window_seconds)
+        keys = {}
+        if client_ip:
+            keys["ip"] = f"coupon_attempts:ip:{tenant_id}:{client_ip}:{window}"
+        if customer_id:
+            keys["customer"] = f"coupon_attempts:customer:{tenant_id}:{customer_id}:{window}"
+        return keys
+
+    @staticmethod
+    def _limit(scope: str) -> int:
+        if scope == "ip":
+            return settings.coupon_attempt_limit_per_ip
+        return settings.coupon_attempt_limit_per_customer
+
+    async def check(self, tenant_id: UUID, client_ip: str | None, customer_id: UUID | None) -> None:
+        keys = self._keys(tenant_id, client_ip, customer_id)
+        if not keys:
+            return
+        counts = await cache_service.get_counters(*keys.values())
+        for scope, count in zip(keys, counts):
+            if count >= self._limit(scope):
+                coupon_attempts_blocked_total.inc(scope=scope)
+                window = settings.coupon_attempt_window_seconds
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many invalid coupon attempts. Please try again later.",
+                    headers={"Retry-After": str(int(window - time.time() % window))},
+                )
+
+    async def record_failure(self, tenant_id: UUID, client_ip: str | None, customer_id: UUID | None) -> None:
+        for key in self._keys(tenant_id, client_ip, customer_id).values():
+            await cache_service.increment(key, settings.coupon_attempt_window_seconds)
+
+
+coupon_attempt_limiter = CouponAttemptLimiter()
@@ -0,0 +1,361 @@
+"""Compiled per-tenant discount index for pricing carts against many promotions."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.core.http_cache import DISCOUNTS
+from app.db.models.discount import Discount, DiscountScope, DiscountStatus, DiscountType
+
+settings = get_settings()
+
+CENT = Decimal("0.01")
+
+
+def to_cents(amount: Decimal | int | float) -> int:
+    """Money is priced in integer minor units; amounts are stored with two decimals."""
+    return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(cents) * CENT).quantize(CENT)
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledRule:
+    """A discount flattened into the fields pricing needs.
+
+    ``value`` is in basis points for percentage discounts and in cents for
+    fixed amounts, so evaluation is integer arithmetic.
+    """
+
+    index: int
+    discount_id: UUID
+    code: str
+    name: str
+    discount_type: DiscountType
+    scope: DiscountScope
+    value: int
+    currency: str | None
+    minimum_cents: int
+    minimum_currency: str | None
+    valid_from: datetime
+    valid_until: datetime | None
+
+    def is_valid_at(self, now: datetime) -> bool:
+        return self.valid_from <= now and (self.valid_until is None or now < self.valid_until)
+
+    def amount_for(self, eligible: int, subtotal: int, currency: str) -> int | None:
+        """Discount in cents on ``eligible`` of a cart worth ``subtotal``, or ``None`` if the rule does not apply."""
+        if self.minimum_cents and (self.minimum_currency != currency or subtotal < self.minimum_cents):
+            return None
+        if self.discount_type == DiscountType.percentage:
+            return (eligible * self.value + 5000) // 10000  # Round half up
+        if self.discount_type == DiscountType.fixed_amount:
+            if self.currency != currency:
+                return None
+            return min(self.value, eligible)
+        # Free shipping carries no line amount; it is reported separately
+        return 0
+
+
+@dataclass(slots=True, frozen=True)
+class CartLine:
+    """One cart line; ``category_id`` lets category promotions match it."""
+
+    product_id: UUID
+    quantity: int
+    unit_price: Decimal
+    category_id: UUID | None = None
+
+
+@dataclass(slots=True)
+class CartPricing:
+    """Best discount for a cart; amounts are in cents."""
+
+    currency: str
+    subtotal_cents: int
+    discount_cents: int = 0
+    discount: CompiledRule | None = None
+    free_shipping: CompiledRule | None = None
+
+    @property
+    def subtotal(self) -> Decimal:
+        return from_cents(self.subtotal_cents)
+
+    @property
+    def discount_amount(self) -> Decimal:
+        return from_cents(self.discount_cents)
+
+    @property
+    def total(self) -> Decimal:
+        return from_cents(self.subtotal_cents - self.discount_cents)
+
+
+@dataclass(slots=True)
+class DiscountIndex:
+    """A tenant's active discounts, keyed by what they target.
+
+    Built once per discount generation and shared by every request in the
+    process. Pricing makes one pass over the cart to total the eligible amount
+    per product/category rule and evaluates those; order-wide rules are kept
+    sorted by value, so only the first applicable one of each type is checked.
+    Validity windows are checked at pricing time, so promotions starting or
+    ending later need no rebuild.
+    """
+
+    tenant_id: UUID
+    generation: int | None
+    built_at: float = field(default_factory=time.monotonic)
+    rules: list[CompiledRule] = field(default_factory=list)
+    by_code: dict[str, CompiledRule] = field(default_factory=dict)
+    by_product: dict[UUID, list[CompiledRule]] = field(default_factory=dict)
+    by_category: dict[UUID, list[CompiledRule]] = field(default_factory=dict)
+    # Order-wide rules by type, largest value first: the first applicable one wins
+    order_rules: dict[DiscountType, list[CompiledRule]] = field(default_factory=dict)
+
+    def add(self, rule: CompiledRule, product_ids: Iterable[UUID], category_id: UUID | None) -> None:
+        self.rules.append(rule)
+        self.by_code[rule.code] = rule
+        if rule.scope == DiscountScope.product:
+            for product_id in product_ids:
+                self.by_product.setdefault(product_id, []).append(rule)
+        elif rule.scope == DiscountScope.category:
+            if category_id is not None:
+                self.by_category.setdefault(category_id, []).append(rule)
+        else:
+            self.order_rules.setdefault(rule.discount_type, []).append(rule)
+
+    def finalize(self) -> None:
+        for rules in self.order_rules.values():
+            rules.sort(key=lambda rule: (-rule.value, rule.code))
+
+    def price(
+        self,
+        lines: Sequence[CartLine],
+        currency: str,
+        codes: Iterable[str] | None = None,
+        now: datetime | None = None,
+    ) -> CartPricing:
+        """Pick the best discount for ``lines``; with ``codes``, only among those coupons."""
+        now = now or datetime.now(timezone.utc)
+        allowed: set[int] | None = None
+        if codes is not None:
+            allowed = {self.by_code[code.upper()].index for code in codes if code.upper() in self.by_code}
+
+        subtotal = 0
+        eligible: dict[int, int] = {}
+        for line in lines:
+            # Prices carry two decimals, so this is exact
+            line_total = to_cents(line.unit_price) * line.quantity
+            subtotal += line_total
+            targeted = self.by_product.get(line.product_id, ())
+            if line.category_id is not None:
+                targeted = (*targeted, *self.by_category.get(line.category_id, ()))
+            for rule in targeted:
+                if allowed is None or rule.index in allowed:
+                    eligible[rule.index] = eligible.get(rule.index, 0) + line_total
+
+        pricing = CartPricing(currency=currency, subtotal_cents=subtotal)
+        for index, base in eligible.items():
+            self._consider(pricing, self.rules[index], base, now)
+        for rules in self.order_rules.values():
+            for rule in rules:
+                if (allowed is None or rule.index in allowed) and self._consider(pricing, rule, subtotal, now):
+                    break
+        pricing.discount_cents = min(pricing.discount_cents, subtotal)
+        return pricing
+
+    @staticmethod
+    def _consider(pricing: CartPricing, rule: CompiledRule, base: int, now: datetime) -> bool:
+        """Keep ``rule`` if it beats the current best.
+
+        Returns ``True`` once no smaller rule of a value-sorted list can win:
+        ``rule`` applied, or it already falls short of the best so far.
+        """
+        amount = rule.amount_for(base, pricing.subtotal_cents, pricing.currency)
+        if amount is None:
+            return False
+        if rule.discount_type == DiscountType.free_shipping:
+            if not rule.is_valid_at(now):
+                return False
+            pricing.free_shipping = pricing.free_shipping or rule
+            return True
+        if amount < pricing.discount_cents or (
+            amount == pricing.discount_cents and (pricing.discount is None or rule.code > pricing.discount.code)
+        ):
+            return True
+        if not rule.is_valid_at(now):
+            return False
+        pricing.discount, pricing.discount_cents = rule, amount
+        return True
+
+
+def compile_index(tenant_id: UUID, discounts: Iterable[Discount], generation: int | None = None) -> DiscountIndex:
+    """Build the index from discount rows (ORM objects or rows with the same attributes)."""
+    index = DiscountIndex(tenant_id=tenant_id, generation=generation)
+    for discount in discounts:
+        if discount.max_uses and discount.current_uses >= discount.max_uses:
+            continue
+        product_ids = {UUID(str(product_id)) for product_id in discount.product_ids or ()}
+        if discount.product_id:
+            product_ids.add(discount.product_id)
+        # Percentages are kept in basis points, fixed amounts in cents
+        value = to_cents(discount.discount_value or 0)
+        rule = CompiledRule(
+            index=len(index.rules),
+            discount_id=discount.id,
+            code=discount.code,
+            name=discount.name,
+            discount_type=discount.discount_type,
+            scope=discount.scope,
+            value=value,
+            currency=discount.discount_currency,
+            minimum_cents=to_cents(discount.minimum_order_amount or 0),
+            minimum_currency=discount.minimum_order_currency,
+            valid_from=discount.valid_from,
+            valid_until=discount.valid_until,
+        )
+        index.add(rule, product_ids, discount.category_id)
+    index.finalize()
+    return index
+
+
+class DiscountIndexCache:
+    """Process-local compiled indexes, one per tenant.
+
+    An index is reused while the tenant's ``discounts`` cache generation is
+    unchanged; discount writes bump it, so every process rebuilds on its next
+    pricing call. Indexes are also rebuilt after ``discount_index_ttl`` seconds;
+    when Redis is unavailable that TTL alone decides reuse, bounding staleness.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: dict[UUID, DiscountIndex] = {}
+
+    async def get(self, session: AsyncSession, tenant_id: UUID) -> DiscountIndex:
+        generation = await cache_service.get_generation(DISCOUNTS, str(tenant_id))
+        index = self._indexes.get(tenant_id)
+        if (
+            index is not None
+            and (generation is None or index.generation == generation)
+            and time.monotonic() - index.built_at < settings.discount_index_ttl
+        ):
+            return index
+
+        now = datetime.now(timezone.utc)
+        result = await session.execute(
+            select(
+                Discount.id,
+                Discount.code,
+                Discount.name,
+                Discount.discount_type,
+                Discount.discount_value,
+                Discount.discount_currency,
+                Discount.scope,
+                Discount.product_id,
+                Discount.product_ids,
+                Discount.category_id,
+                Discount.valid_from,
+                Discount.valid_until,
+                Discount.max_uses,
+                Discount.current_uses,
+                Discount.minimum_order_amount,
+                Discount.minimum_order_currency,
+            ).where(
+                Discount.tenant_id == tenant_id,
+                Discount.is_active.is_(True),
+                Discount.status == DiscountStatus.active,
+                or_(Discount.valid_until.is_(None), Discount.valid_until > now),
+            )
+        )
+        index = compile_index(tenant_id, result.all(), generation)
+        self._indexes[tenant_id] = index
+        return index
+
+    def invalidate(self, tenant_id: UUID | None = None) -> None:
+        """Drop this process's index for a tenant (all when ``None``)."""
+        if tenant_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(tenant_id, None)
+
+
+discount_index_cache = DiscountIndexCache()
+
+
+@dataclass(slots=True)
+class ExpirySchedule:
+    """Upcoming ``valid_until`` times of a tenant's discounts, soonest first."""
+
+    generation: int | None
+    expiries: list[datetime]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def next_after(self, now: datetime) -> datetime | None:
+        position = bisect.bisect_right(self.expiries, now)
+        return self.expiries[position] if position < len(self.expiries) else None
+
+
+class DiscountExpiryCache:
+    """Process-local expiry schedules, one per tenant, for discount ETags.
+
+    Discount reads work out expiry on the fly (``effective_status``), so a
+    response changes when a discount lapses although no write bumped the
+    ``discounts`` generation. Seeding the ETag with the next expiry makes it
+    change at that moment. Schedules are reused like compiled indexes: while
+    the generation is unchanged, for at most ``discount_index_ttl`` seconds.
+    """
+
+    def __init__(self) -> None:
+        self._schedules: dict[UUID, ExpirySchedule] = {}
+
+    async def get(self, session: AsyncSession, tenant_id: UUID) -> ExpirySchedule:
+        generation = await cache_service.get_generation(DISCOUNTS, str(tenant_id))
+        schedule = self._schedules.get(tenant_id)
+        if (
+            schedule is not None
+            and (generation is None or schedule.generation == generation)
+            and time.monotonic() - schedule.built_at < settings.discount_index_ttl
+        ):
+            return schedule
+
+        # Only discounts whose listed status or active filter can flip on expiry
+        result = await session.scalars(
+            select(Discount.valid_until)
+            .where(
+                Discount.tenant_id == tenant_id,
+                Discount.valid_until > datetime.now(timezone.utc),
+                or_(Discount.is_active.is_(True), Discount.status == DiscountStatus.active),
+            )
+            .order_by(Discount.valid_until)
+        )
+        schedule = ExpirySchedule(generation=generation, expiries=list(result))
+        self._schedules[tenant_id] = schedule
+        return schedule
+
+    async def etag_seed(self, session: AsyncSession, tenant_id: UUID) -> str:
+        """The next expiry, so the ETag changes once it passes."""
+        upcoming = (await self.get(session, tenant_id)).next_after(datetime.now(timezone.utc))
+        return upcoming.isoformat() if upcoming else ""
+
+    def invalidate(self, tenant_id: UUID | None = None) -> None:
+        """Drop this process's schedule for a tenant (all when ``None``)."""
+        if tenant_id is None:
+            self._schedules.clear()
+        else:
+            self._schedules.pop(tenant_id, None)
+
+
+discount_expiry_cache = DiscountExpiryCache()
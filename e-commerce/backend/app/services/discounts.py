@@ -7,11 +7,30 @@ from decimal import Decimal
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, case, func, not_, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.core.http_cache import DISCOUNT_USAGE, DISCOUNTS
 from app.db.models.discount import Discount, DiscountScope, DiscountStatus, DiscountType
+from app.db.models.discount_redemption import DiscountRedemption
+from app.db.models.product import Product
+from app.db.utils import violated_constraint
 from app.schemas.discount import DiscountCreate, DiscountUpdate
+from app.services.coupon_lookup import coupon_attempt_limiter, lookup_coupon
+from app.services.discount_engine import CartLine, CartPricing, discount_expiry_cache, discount_index_cache
+
+settings = get_settings()
+
+
+def effective_status(discount: Discount, now: datetime | None = None) -> DiscountStatus:
+    """Status as of ``now``: an Active discount past ``valid_until`` is Expired even before it is swept."""
+    now = now or datetime.now(timezone.utc)
+    if discount.status == DiscountStatus.active and discount.valid_until is not None and discount.valid_until < now:
+        return DiscountStatus.expired
+    return discount.status
 
 
 class DiscountService:
@@ -22,19 +41,6 @@ class DiscountService:
 
     async def create_discount(self, tenant_id: UUID, actor_id: UUID, payload: DiscountCreate) -> Discount:
         """Create a new discount."""
-        # Check if code already exists
-        existing = await self.session.execute(
-            select(Discount).where(
-                Discount.code == payload.code.upper(),
-                Discount.tenant_id == tenant_id,
-            )
-        )
-        if existing.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Discount code '{payload.code}' already exists.",
-            )
-
         # Validate scope-specific fields
         # Support both product_id (single) and product_ids (multiple) for backward compatibility
         product_ids_list = payload.product_ids or ([payload.product_id] if payload.product_id else [])
@@ -85,8 +91,18 @@ class DiscountService:
             modified_by=actor_id,
         )
         self.session.add(discount)
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            if violated_constraint(e) == "uq_discounts_tenant_code":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Discount code '{payload.code}' already exists.",
+                ) from e
+            raise
         await self.session.refresh(discount)
+        await self._invalidate_index(tenant_id)
         return discount
 
     async def list_discounts(
@@ -97,30 +113,29 @@ class DiscountService:
         is_active: bool | None = None,
         status: DiscountStatus | None = None,
     ) -> tuple[list[Discount], int]:
-        """List discounts with pagination."""
-        query = select(Discount).where(Discount.tenant_id == tenant_id)
-
-        if is_active is not None:
-            query = query.where(Discount.is_active == is_active)
-
-        if status is not None:
-            query = query.where(Discount.status == status)
+        """List discounts with pagination.
 
-        # Update status based on validity dates
+        A pure read: filters and the returned status use the effective status
+        (see ``effective_status``), so discounts past ``valid_until`` show as
+        expired before the expiry sweeper has marked them.
+        """
+        query = select(Discount).where(Discount.tenant_id == tenant_id)
         now = datetime.now(timezone.utc)
-        expired_discounts = await self.session.execute(
-            select(Discount).where(
-                Discount.tenant_id == tenant_id,
-                Discount.valid_until.isnot(None),
-                Discount.valid_until < now,
-                Discount.status == DiscountStatus.active,
+        lapsed = and_(Discount.valid_until.is_not(None), Discount.valid_until < now)
+
+        if is_active:
+            query = query.where(Discount.is_active.is_(True), not_(lapsed))
+        elif is_active is not None:
+            query = query.where(or_(Discount.is_active.is_(False), lapsed))
+
+        if status == DiscountStatus.active:
+            query = query.where(Discount.status == DiscountStatus.active, not_(lapsed))
+        elif status == DiscountStatus.expired:
+            query = query.where(
+                or_(Discount.status == DiscountStatus.expired, and_(Discount.status == DiscountStatus.active, lapsed))
             )
-        )
-        for disc in expired_discounts.scalars():
-            disc.status = DiscountStatus.expired
-            disc.is_active = False
-
-        await self.session.commit()
+        elif status is not None:
+            query = query.where(Discount.status == status)
 
         # Count total
         count_query = select(func.count()).select_from(query.subquery())
@@ -146,16 +161,10 @@ class DiscountService:
 
     async def get_discount_by_code(self, tenant_id: UUID, code: str) -> Discount:
         """Get a discount by code."""
-        result = await self.session.execute(
-            select(Discount).where(
-                Discount.code == code.upper(),
-                Discount.tenant_id == tenant_id,
-            )
-        )
-        discount = result.scalar_one_or_none()
-        if not discount:
+        entry = await lookup_coupon(self.session, tenant_id, code)
+        if entry is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Discount code not found.")
-        return discount
+        return await self.get_discount(tenant_id, entry.discount_id)
 
     async def update_discount(
         self, tenant_id: UUID, discount_id: UUID, actor_id: UUID, payload: DiscountUpdate
@@ -191,6 +200,10 @@ class DiscountService:
             discount.valid_from = payload.valid_from
         if payload.valid_until is not None:
             discount.valid_until = payload.valid_until
+            # Extending an expired discount brings it back; the sweeper only ever expires
+            if discount.status == DiscountStatus.expired and payload.valid_until > datetime.now(timezone.utc):
+                discount.status = DiscountStatus.active
+                discount.is_active = True
         if payload.max_uses is not None:
             discount.max_uses = payload.max_uses
         if payload.max_uses_per_customer is not None:
@@ -206,30 +219,51 @@ class DiscountService:
 
         await self.session.commit()
         await self.session.refresh(discount)
+        await self._invalidate_index(tenant_id)
         return discount
 
     async def apply_discount(
-        self, tenant_id: UUID, code: str, order_amount: Decimal, order_currency: str, customer_id: UUID | None = None
+        self,
+        tenant_id: UUID,
+        code: str,
+        order_amount: Decimal,
+        order_currency: str,
+        customer_id: UUID | None = None,
+        order_id: UUID | None = None,
+        client_ip: str | None = None,
     ) -> tuple[Discount, Decimal]:
-        """Apply a discount code and return the discount amount."""
-        discount = await self.get_discount_by_code(tenant_id, code)
+        """Redeem a discount code and return the discount amount.
+
+        The code is resolved through the coupon lookup cache, and clients or
+        customers that keep trying unknown codes are throttled, so guessing
+        never reaches the database. Validation reads the discount without
+        locking it. The use is then recorded in ``discount_redemptions`` and
+        counted by a single conditional UPDATE, so concurrent redemptions can
+        never exceed ``max_uses`` and the discount row is only locked until
+        commit. Per-customer limits count the customer's redemptions under an
+        advisory lock on (discount, customer).
+        """
+        await coupon_attempt_limiter.check(tenant_id, client_ip, customer_id)
+        entry = await lookup_coupon(self.session, tenant_id, code)
+        if entry is None:
+            await coupon_attempt_limiter.record_failure(tenant_id, client_ip, customer_id)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Discount code not found.")
 
         now = datetime.now(timezone.utc)
 
-        # Check if discount is active
-        if not discount.is_active or discount.status != DiscountStatus.active:
+        # Check if discount is active (the conditional UPDATE below re-checks it)
+        if not entry.usable:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Discount is not active.")
 
         # Check validity period
-        if discount.valid_from > now:
+        if entry.valid_from > now:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Discount is not yet valid.")
-        if discount.valid_until and discount.valid_until < now:
-            discount.status = DiscountStatus.expired
-            discount.is_active = False
-            await self.session.commit()
+        if entry.valid_until and entry.valid_until < now:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Discount has expired.")
 
-        # Check usage limits
+        discount = await self.get_discount(tenant_id, entry.discount_id)
+
+        # Check usage limits (early rejection; the conditional UPDATE below is authoritative)
         if discount.max_uses and discount.current_uses >= discount.max_uses:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Discount usage limit reached.")
 
@@ -266,14 +300,63 @@ class DiscountService:
         if discount_amount > order_amount:
             discount_amount = order_amount
 
-        # Increment usage count
-        discount.current_uses += 1
-        if discount.max_uses and discount.current_uses >= discount.max_uses:
-            discount.is_active = False
-            discount.status = DiscountStatus.inactive
+        if discount.max_uses_per_customer and customer_id:
+            # Serialises one customer's concurrent redemptions of this discount only
+            await self.session.execute(
+                select(func.pg_advisory_xact_lock(func.hashtext(f"discount:{discount.id}:{customer_id}")))
+            )
+            used = await self.session.scalar(
+                select(func.count())
+                .select_from(DiscountRedemption)
+                .where(DiscountRedemption.discount_id == discount.id, DiscountRedemption.customer_id == customer_id)
+            )
+            if used >= discount.max_uses_per_customer:
+                await self.session.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Discount usage limit reached for this customer."
+                )
+
+        self.session.add(
+            DiscountRedemption(
+                tenant_id=tenant_id,
+                discount_id=discount.id,
+                customer_id=customer_id,
+                order_id=order_id,
+                discount_amount=discount_amount,
+                currency=order_currency,
+            )
+        )
+        await self.session.flush()
+
+        # Increment usage count, deactivating the discount on its last use
+        exhausting = and_(Discount.max_uses.is_not(None), Discount.current_uses + 1 >= Discount.max_uses)
+        result = await self.session.execute(
+            update(Discount)
+            .where(
+                Discount.id == discount.id,
+                Discount.is_active.is_(True),
+                Discount.status == DiscountStatus.active,
+                or_(Discount.max_uses.is_(None), Discount.current_uses < Discount.max_uses),
+            )
+            .values(
+                current_uses=Discount.current_uses + 1,
+                is_active=case((exhausting, False), else_=Discount.is_active),
+                status=case((exhausting, DiscountStatus.inactive), else_=Discount.status),
+            )
+            .returning(Discount.is_active)
+            .execution_options(synchronize_session=False)
+        )
+        still_active = result.scalar_one_or_none()
+        if still_active is None:
+            # Used up (or deactivated) by a concurrent redemption since it was read
+            await self.session.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Discount usage limit reached.")
 
         await self.session.commit()
         await self.session.refresh(discount)
+        if not still_active:
+            await self._invalidate_index(tenant_id)
+        await cache_service.bump_generation(DISCOUNT_USAGE, str(tenant_id))
 
         return discount, discount_amount
 
@@ -283,4 +366,82 @@ class DiscountService:
         discount.is_active = False
         discount.status = DiscountStatus.inactive
         await self.session.commit()
+        await self._invalidate_index(tenant_id)
+
+    async def price_cart(
+        self,
+        tenant_id: UUID,
+        currency: str,
+        lines: list[CartLine],
+        codes: list[str] | None = None,
+    ) -> CartPricing:
+        """Find the best discount for a cart, among ``codes`` or all active promotions.
+
+        Evaluated against the tenant's compiled discount index; product categories
+        are resolved in one query for lines that do not carry one. Nothing is
+        redeemed here.
+        """
+        missing = {line.product_id for line in lines if line.category_id is None}
+        if missing:
+            result = await self.session.execute(
+                select(Product.id, Product.category_id).where(
+                    Product.tenant_id == tenant_id, Product.id.in_(missing)
+                )
+            )
+            categories = dict(result.all())
+            lines = [
+                CartLine(line.product_id, line.quantity, line.unit_price, categories.get(line.product_id))
+                if line.category_id is None
+                else line
+                for line in lines
+            ]
+
+        index = await discount_index_cache.get(self.session, tenant_id)
+        return index.price(lines, currency.upper(), codes)
+
+    async def expire_lapsed(self, batch_size: int | None = None) -> dict[UUID, int]:
+        """Mark Active discounts past ``valid_until`` as Expired, across all tenants.
+
+        Runs set-based UPDATEs of at most ``batch_size`` rows, committing each
+        batch so row locks are short-lived; rows locked by a concurrent
+        redemption are skipped until the next run. Returns expired counts per
+        tenant, whose discount caches are invalidated.
+        """
+        batch_size = batch_size or settings.discount_expiry_batch_size
+        now = datetime.now(timezone.utc)
+        expired: dict[UUID, int] = {}
+        while True:
+            due = (
+                select(Discount.id)
+                .where(
+                    Discount.status == DiscountStatus.active,
+                    Discount.valid_until.is_not(None),
+                    Discount.valid_until < now,
+                )
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await self.session.execute(
+                update(Discount)
+                .where(Discount.id.in_(due))
+                .values(status=DiscountStatus.expired, is_active=False)
+                .returning(Discount.tenant_id)
+                .execution_options(synchronize_session=False)
+            )
+            tenant_ids = result.scalars().all()
+            await self.session.commit()
+            for tenant_id in tenant_ids:
+                expired[tenant_id] = expired.get(tenant_id, 0) + 1
+            if len(tenant_ids) < batch_size:
+                break
+
+        for tenant_id in expired:
+            await self._invalidate_index(tenant_id)
+        return expired
+
+    async def _invalidate_index(self, tenant_id: UUID) -> None:
+        discount_index_cache.invalidate(tenant_id)
+        discount_expiry_cache.invalidate(tenant_id)
+        await cache_service.bump_generation(DISCOUNTS, str(tenant_id))
 
@@ -318,6 +318,11 @@ class OrderService:
         await self.session.commit()
         await self.session.refresh(order, attribute_names=["items"])
 
+        from app.core.cache import cache_service
+        from app.core.http_cache import PRODUCTS
+
+        await cache_service.bump_generation(PRODUCTS, str(tenant_id))
+
         # Publish order cancelled event
         publish_order_cancelled(
             order_id=order.id,
@@ -2,7 +2,25 @@
 
 from app.services.payment_gateways.base import PaymentGateway, PaymentResult
 from app.services.payment_gateways.razorpay_gateway import RazorpayGateway
+from app.services.payment_gateways.resilience import (
+    UNAVAILABLE,
+    GatewayUnavailableError,
+    ProviderHealth,
+    ResilientGateway,
+)
+from app.services.payment_gateways.registry import GatewayCredentials, GatewayRegistry, gateway_registry
 from app.services.payment_gateways.stripe_gateway import StripeGateway
 
-__all__ = ["PaymentGateway", "PaymentResult", "StripeGateway", "RazorpayGateway"]
-
+__all__ = [
+    "GatewayCredentials",
+    "GatewayRegistry",
+    "GatewayUnavailableError",
+    "PaymentGateway",
+    "PaymentResult",
+    "ProviderHealth",
+    "RazorpayGateway",
+    "ResilientGateway",
+    "StripeGateway",
+    "UNAVAILABLE",
+    "gateway_registry",
+]
@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.rate_limit import AsyncRateLimiter
+
+
+def pooled_http_session(pool_size: int) -> requests.Session:
+    """HTTP session whose keep-alive pool is reused by every call through one gateway client."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+    return session
+
 
 @dataclass
 class PaymentResult:
@@ -22,11 +37,33 @@ class PaymentResult:
     error_message: str | None = None
     requires_action: bool = False
     client_secret: str | None = None  # For 3D Secure or similar
+    retryable: bool = False  # Transient provider or network failure; the outcome may be unknown
 
 
 class PaymentGateway(ABC):
     """Abstract base class for payment gateway integrations."""
 
+    #: Provider API origin contacted by ``warm_up``
+    api_base: str | None = None
+    http_session: requests.Session | None = None
+
+    def warm_up(self) -> None:
+        """Open a pooled connection to the provider so the first payment skips the TLS handshake.
+
+        Blocking; failures are ignored since the next real call simply connects itself.
+        """
+        if self.http_session is None or self.api_base is None:
+            return
+        try:
+            self.http_session.head(self.api_base, timeout=5)
+        except requests.RequestException:
+            pass
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        if self.http_session is not None:
+            self.http_session.close()
+
     @abstractmethod
     async def create_payment_intent(
         self,
@@ -53,6 +90,28 @@ class PaymentGateway(ABC):
         """Get the status of a payment transaction."""
         pass
 
+    async def list_payment_statuses(
+        self,
+        transaction_ids: Sequence[str],
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> dict[str, PaymentResult]:
+        """Get the status of many transactions, keyed by the requested ID.
+
+        The default makes one ``get_payment_status`` call per ID. Gateways with
+        list/search APIs override it to cover the creation window in a few calls.
+        Lookups that fail are left out of the result.
+        """
+
+        async def fetch(transaction_id: str) -> tuple[str, PaymentResult]:
+            if limiter:
+                await limiter.acquire()
+            return transaction_id, await self.get_payment_status(transaction_id)
+
+        results = await asyncio.gather(*(fetch(transaction_id) for transaction_id in transaction_ids))
+        return {transaction_id: result for transaction_id, result in results if result.transaction_id}
+
     @abstractmethod
     async def refund_payment(
         self,
@@ -2,26 +2,50 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
 import razorpay
+import requests
 from razorpay.errors import BadRequestError, ServerError
 
 from app.core.config import get_settings
-from app.services.payment_gateways.base import PaymentGateway, PaymentResult
+from app.core.rate_limit import AsyncRateLimiter
+from app.services.payment_gateways.base import PaymentGateway, PaymentResult, pooled_http_session
 
 settings = get_settings()
 
+# Our created_date and Razorpay's `created_at` differ by request latency
+LIST_WINDOW_SLACK_SECONDS = 300
+# Beyond this many list pages, per-ID fetches are cheaper
+MAX_LIST_PAGES = 10
+LIST_PAGE_SIZE = 100
+
 
 class RazorpayGateway(PaymentGateway):
-    """Razorpay payment gateway implementation."""
+    """Razorpay payment gateway implementation.
+
+    The client keeps its HTTP session for the lifetime of the instance; SDK
+    calls are blocking and run in worker threads. Obtain instances from
+    ``gateway_registry`` rather than constructing one per request.
+    """
 
-    def __init__(self, key_id: str | None = None, key_secret: str | None = None):
+    api_base = "https://api.razorpay.com"
+
+    def __init__(
+        self,
+        key_id: str | None = None,
+        key_secret: str | None = None,
+        http_session: requests.Session | None = None,
+    ):
         """Initialize Razorpay gateway."""
         key_id = key_id or getattr(settings, "razorpay_key_id", None) or "rzp_test_placeholder"
         key_secret = key_secret or getattr(settings, "razorpay_key_secret", None) or "rzp_secret_placeholder"
-        self.client = razorpay.Client(auth=(key_id, key_secret))
+        self.http_session = http_session or pooled_http_session(settings.payment_http_pool_size)
+        self.client = razorpay.Client(session=self.http_session, auth=(key_id, key_secret))
 
     async def create_payment_intent(
         self,
@@ -43,7 +67,7 @@ class RazorpayGateway(PaymentGateway):
             if customer_id:
                 order_data["notes"]["customer_id"] = customer_id
 
-            razorpay_order = self.client.order.create(data=order_data)
+            razorpay_order = await asyncio.to_thread(self.client.order.create, data=order_data)
 
             return PaymentResult(
                 success=True,
@@ -63,6 +87,7 @@ class RazorpayGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, ServerError),
             )
 
     async def confirm_payment(
@@ -74,7 +99,7 @@ class RazorpayGateway(PaymentGateway):
         try:
             # In Razorpay, payment is confirmed via webhook or by verifying payment signature
             # This method verifies the payment status
-            payment = self.client.payment.fetch(payment_intent_id)
+            payment = await asyncio.to_thread(self.client.payment.fetch, payment_intent_id)
 
             return PaymentResult(
                 success=payment["status"] == "captured" or payment["status"] == "authorized",
@@ -94,33 +119,108 @@ class RazorpayGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, ServerError),
             )
 
     async def get_payment_status(self, transaction_id: str) -> PaymentResult:
         """Get Razorpay payment status."""
         try:
-            payment = self.client.payment.fetch(transaction_id)
-
-            return PaymentResult(
-                success=payment["status"] == "captured" or payment["status"] == "authorized",
-                transaction_id=payment["id"],
-                payment_intent_id=payment.get("order_id"),
-                amount=Decimal(payment["amount"]) / 100,
-                currency=payment["currency"].upper(),
-                status=payment["status"],
-                metadata={
-                    "razorpay_payment_id": payment["id"],
-                    "order_id": payment.get("order_id"),
-                    "status": payment["status"],
-                },
-            )
+            payment = await asyncio.to_thread(self.client.payment.fetch, transaction_id)
+            return self._payment_result(payment)
         except (BadRequestError, ServerError) as e:
             return PaymentResult(
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, ServerError),
             )
 
+    @staticmethod
+    def _payment_result(payment: dict[str, Any]) -> PaymentResult:
+        return PaymentResult(
+            success=payment["status"] == "captured" or payment["status"] == "authorized",
+            transaction_id=payment["id"],
+            payment_intent_id=payment.get("order_id"),
+            amount=Decimal(payment["amount"]) / 100,
+            currency=payment["currency"].upper(),
+            status=payment["status"],
+            error_message=payment.get("error_description"),
+            metadata={
+                "razorpay_payment_id": payment["id"],
+                "order_id": payment.get("order_id"),
+                "status": payment["status"],
+            },
+        )
+
+    @staticmethod
+    def _order_result(order: dict[str, Any]) -> PaymentResult:
+        return PaymentResult(
+            success=order["status"] == "paid",
+            transaction_id=order["id"],
+            payment_intent_id=order["id"],
+            amount=Decimal(order["amount"]) / 100,
+            currency=order["currency"].upper(),
+            status=order["status"],
+            metadata={"razorpay_order_id": order["id"], "status": order["status"]},
+        )
+
+    async def list_payment_statuses(
+        self,
+        transaction_ids: Sequence[str],
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> dict[str, PaymentResult]:
+        """Page through payments created in the window, then fetch stragglers.
+
+        Transactions reference either a Razorpay order ID (before capture) or a
+        payment ID, so listed payments are matched on both. When an order has
+        several payment attempts, a successful one wins.
+        """
+        wanted = set(transaction_ids)
+        found: dict[str, PaymentResult] = {}
+
+        if created_after and created_before:
+            options = {
+                "from": int(created_after.timestamp()) - LIST_WINDOW_SLACK_SECONDS,
+                "to": int(created_before.timestamp()) + LIST_WINDOW_SLACK_SECONDS,
+                "count": LIST_PAGE_SIZE,
+            }
+            for page_number in range(MAX_LIST_PAGES):
+                if limiter:
+                    await limiter.acquire()
+                try:
+                    page = await asyncio.to_thread(
+                        self.client.payment.all, {**options, "skip": page_number * LIST_PAGE_SIZE}
+                    )
+                except (BadRequestError, ServerError):
+                    break
+                items = page.get("items", [])
+                for payment in items:
+                    for key in (payment["id"], payment.get("order_id")):
+                        if key in wanted and not (key in found and found[key].success):
+                            found[key] = self._payment_result(payment)
+                if len(items) < LIST_PAGE_SIZE:
+                    break
+
+        async def fetch(transaction_id: str) -> PaymentResult | None:
+            if limiter:
+                await limiter.acquire()
+            try:
+                if transaction_id.startswith("order_"):
+                    order = await asyncio.to_thread(self.client.order.fetch, transaction_id)
+                    return self._order_result(order)
+                payment = await asyncio.to_thread(self.client.payment.fetch, transaction_id)
+                return self._payment_result(payment)
+            except (BadRequestError, ServerError):
+                return None
+
+        missing = [transaction_id for transaction_id in wanted if transaction_id not in found]
+        for transaction_id, result in zip(missing, await asyncio.gather(*(fetch(t) for t in missing))):
+            if result is not None:
+                found[transaction_id] = result
+        return found
+
     async def refund_payment(
         self,
         transaction_id: str,
@@ -135,7 +235,7 @@ class RazorpayGateway(PaymentGateway):
             if reason:
                 refund_data["notes"] = {"reason": reason}
 
-            refund = self.client.payment.refund(transaction_id, refund_data)
+            refund = await asyncio.to_thread(self.client.payment.refund, transaction_id, refund_data)
 
             return PaymentResult(
                 success=refund["status"] == "processed",
@@ -154,5 +254,6 @@ class RazorpayGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, ServerError),
             )
 
@@ -0,0 +1,131 @@
+"""Per-tenant registry of configured payment gateway clients."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+import structlog
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.db.models.payment_transaction import PaymentProvider
+from app.services.payment_gateways.base import PaymentGateway
+from app.services.payment_gateways.razorpay_gateway import RazorpayGateway
+from app.services.payment_gateways.resilience import ProviderHealth, ResilientGateway
+from app.services.payment_gateways.stripe_gateway import StripeGateway
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class GatewayCredentials:
+    """API credentials for one provider account."""
+
+    secret: str
+    key_id: str | None = None
+
+
+CredentialsResolver = Callable[[UUID | None, PaymentProvider], GatewayCredentials | None]
+
+
+def platform_credentials(tenant_id: UUID | None, provider: PaymentProvider) -> GatewayCredentials | None:
+    """Default resolver: every tenant transacts through the platform account from settings."""
+    if provider == PaymentProvider.stripe and settings.stripe_secret_key:
+        return GatewayCredentials(secret=settings.stripe_secret_key)
+    if provider == PaymentProvider.razorpay and settings.razorpay_key_id and settings.razorpay_key_secret:
+        return GatewayCredentials(secret=settings.razorpay_key_secret, key_id=settings.razorpay_key_id)
+    return None
+
+
+def _build(provider: PaymentProvider, credentials: GatewayCredentials | None) -> PaymentGateway:
+    if provider == PaymentProvider.stripe:
+        return StripeGateway(secret_key=credentials.secret if credentials else None)
+    if provider == PaymentProvider.razorpay:
+        return RazorpayGateway(
+            key_id=credentials.key_id if credentials else None,
+            key_secret=credentials.secret if credentials else None,
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Payment gateway not configured for provider: {provider.value}",
+    )
+
+
+class GatewayRegistry:
+    """Caches one configured gateway per ``(tenant, provider)``.
+
+    Gateways are built lazily on first use and keep their HTTP connection pool
+    for the life of the process, so the TLS handshake is paid once rather than
+    per payment. Tenants resolving to the same credentials share one client.
+    Call ``invalidate`` after a tenant's keys change.
+
+    Every gateway is wrapped in a ``ResilientGateway``; all clients of one
+    provider share its circuit breaker, timeouts and bulkhead, since a provider
+    brownout affects every account.
+    """
+
+    def __init__(self, resolver: CredentialsResolver = platform_credentials) -> None:
+        self._resolver = resolver
+        self._gateways: dict[tuple[UUID | None, PaymentProvider], PaymentGateway] = {}
+        self._shared: dict[tuple[PaymentProvider, GatewayCredentials | None], PaymentGateway] = {}
+        self._health: dict[PaymentProvider, ProviderHealth] = {}
+        # Gateways may also be requested from worker threads
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: UUID | None, provider: PaymentProvider) -> PaymentGateway:
+        key = (tenant_id, provider)
+        gateway = self._gateways.get(key)
+        if gateway is not None:
+            return gateway
+
+        with self._lock:
+            gateway = self._gateways.get(key)
+            if gateway is None:
+                credentials = self._resolver(tenant_id, provider)
+                gateway = self._shared.get((provider, credentials))
+                if gateway is None:
+                    health = self._health.get(provider)
+                    if health is None:
+                        health = self._health[provider] = ProviderHealth(provider.value)
+                    gateway = ResilientGateway(_build(provider, credentials), health)
+                    self._shared[(provider, credentials)] = gateway
+                self._gateways[key] = gateway
+        return gateway
+
+    def invalidate(self, tenant_id: UUID | None = None, provider: PaymentProvider | None = None) -> None:
+        """Drop cached gateways for a tenant and/or provider (all when both are ``None``)."""
+        with self._lock:
+            for key in [
+                key
+                for key in self._gateways
+                if (tenant_id is None or key[0] == tenant_id) and (provider is None or key[1] == provider)
+            ]:
+                del self._gateways[key]
+            in_use = {id(gateway) for gateway in self._gateways.values()}
+            for shared_key, gateway in list(self._shared.items()):
+                if id(gateway) not in in_use:
+                    del self._shared[shared_key]
+                    gateway.close()
+
+    async def warm_up(
+        self,
+        tenant_id: UUID | None = None,
+        providers: Iterable[PaymentProvider] = (PaymentProvider.stripe, PaymentProvider.razorpay),
+    ) -> None:
+        """Build the gateways and open their first connections off the request path."""
+        gateways = [
+            self.get(tenant_id, provider) for provider in providers if self._resolver(tenant_id, provider) is not None
+        ]
+        await asyncio.gather(*(asyncio.to_thread(gateway.warm_up) for gateway in gateways))
+        logger.info("payment_gateways_warmed", providers=[gateway.health.provider for gateway in gateways])
+
+    def close(self) -> None:
+        self.invalidate()
+
+
+gateway_registry = GatewayRegistry()
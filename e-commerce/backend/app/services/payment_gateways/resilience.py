@@ -0,0 +1,333 @@
+"""Circuit breaker, adaptive timeouts and bulkhead around payment gateway calls."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+import structlog
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    payment_gateway_call_duration_seconds,
+    payment_gateway_calls_total,
+    payment_gateway_circuit_state,
+    payment_gateway_in_flight,
+    payment_gateway_timeout_seconds,
+)
+from app.core.rate_limit import AsyncRateLimiter
+from app.services.payment_gateways.base import PaymentGateway, PaymentResult
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+#: ``PaymentResult.status`` of calls failed fast or cut off by the resilience layer
+UNAVAILABLE = "unavailable"
+
+# Recent call outcomes the breaker computes its failure rate over
+OUTCOME_WINDOW = 20
+# Latency samples kept per operation, and how many are needed before adapting
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+TIMEOUT_PERCENTILE = 0.99
+TIMEOUT_MULTIPLIER = 2.0
+# A timed-out refund may still go through, so refunds always get the full HTTP timeout
+FIXED_TIMEOUT_OPERATIONS = frozenset({"refund_payment"})
+
+
+class GatewayUnavailableError(Exception):
+    """Raised by bulk lookups, which have no ``PaymentResult`` to carry a fast-fail."""
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+_STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """Opens when the failure rate over the last calls crosses a threshold.
+
+    While open every call is rejected. After ``recovery_seconds`` a single trial
+    call is let through (half-open); its outcome closes the circuit or opens it
+    for another period.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_rate: float | None = None,
+        min_calls: int | None = None,
+        recovery_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.failure_rate = failure_rate if failure_rate is not None else settings.payment_circuit_failure_rate
+        self.min_calls = min_calls if min_calls is not None else settings.payment_circuit_min_calls
+        self.recovery_seconds = (
+            recovery_seconds if recovery_seconds is not None else settings.payment_circuit_recovery_seconds
+        )
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=max(OUTCOME_WINDOW, self.min_calls))
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.state = CircuitState.CLOSED
+        self._set_state(CircuitState.CLOSED)
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning("payment_circuit_state_changed", provider=self.provider, state=state.value)
+        self.state = state
+        payment_gateway_circuit_state.set(_STATE_GAUGE_VALUES[state], provider=self.provider)
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; a ``True`` in half-open state claims the trial."""
+        if self.state == CircuitState.OPEN:
+            if self._clock() - self._opened_at < self.recovery_seconds:
+                return False
+            self._set_state(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record(self, failed: bool, trial: bool = False) -> None:
+        if trial:
+            self._trial_in_flight = False
+            if failed:
+                self._open()
+            else:
+                self._outcomes.clear()
+                self._set_state(CircuitState.CLOSED)
+            return
+        if self.state != CircuitState.CLOSED:
+            return  # Late result of a call started before the circuit opened
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def abandon_trial(self) -> None:
+        """Free the half-open slot of a trial call that was cancelled before finishing."""
+        self._trial_in_flight = False
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._set_state(CircuitState.OPEN)
+
+
+class AdaptiveTimeout:
+    """Timeout tracking a multiple of the p99 latency of recent successful calls.
+
+    Until enough samples are in, and never beyond, the ``maximum`` (the HTTP
+    client timeout) applies.
+    """
+
+    def __init__(self, minimum: float, maximum: float) -> None:
+        self.minimum = min(minimum, maximum)
+        self.maximum = maximum
+        self.current = maximum
+        self._samples: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return
+        ordered = sorted(self._samples)
+        p99 = ordered[max(0, math.ceil(TIMEOUT_PERCENTILE * len(ordered)) - 1)]
+        self.current = min(self.maximum, max(self.minimum, p99 * TIMEOUT_MULTIPLIER))
+
+
+class ProviderHealth:
+    """Breaker, bulkhead and per-operation timeouts shared by every client of one provider.
+
+    The bulkhead is a plain counter rather than an asyncio primitive because
+    gateways are process-wide and need not stay on one loop. Celery workers
+    share one long-lived loop (``app.tasks.runtime``), but scripts, tests and
+    code run with ``asyncio.run`` each bring their own, and a primitive bound to
+    an earlier loop would fail on the next.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        bulkhead_size: int | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.provider = provider
+        self.bulkhead_size = bulkhead_size if bulkhead_size is not None else settings.payment_bulkhead_size
+        self.breaker = breaker or CircuitBreaker(provider)
+        self.in_flight = 0
+        self._timeouts: dict[str, AdaptiveTimeout] = {}
+
+    def timeout(self, operation: str) -> AdaptiveTimeout:
+        timeout = self._timeouts.get(operation)
+        if timeout is None:
+            minimum = (
+                settings.payment_http_timeout
+                if operation in FIXED_TIMEOUT_OPERATIONS
+                else settings.payment_timeout_min_seconds
+            )
+            timeout = self._timeouts[operation] = AdaptiveTimeout(minimum, settings.payment_http_timeout)
+        return timeout
+
+    def acquire(self) -> bool:
+        if self.in_flight >= self.bulkhead_size:
+            return False
+        self.in_flight += 1
+        payment_gateway_in_flight.set(self.in_flight, provider=self.provider)
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        payment_gateway_in_flight.set(self.in_flight, provider=self.provider)
+
+
+def unavailable_result(message: str) -> PaymentResult:
+    return PaymentResult(success=False, status=UNAVAILABLE, error_message=message, retryable=True)
+
+
+class ResilientGateway(PaymentGateway):
+    """Wraps a gateway so a degraded provider fails fast instead of tying up requests.
+
+    Calls are rejected outright while the provider's circuit is open or its
+    bulkhead is full, and are cut off at the adaptive timeout otherwise. Both
+    come back as an ``unavailable``, retryable ``PaymentResult`` for the caller
+    to compensate on. A call cut off by the timeout keeps its bulkhead slot until
+    the underlying SDK call returns, so stuck threads still count against the limit.
+    """
+
+    def __init__(self, inner: PaymentGateway, health: ProviderHealth) -> None:
+        self.inner = inner
+        self.health = health
+        self.api_base = inner.api_base
+        self.http_session = inner.http_session
+
+    def warm_up(self) -> None:
+        self.inner.warm_up()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def _record(self, operation: str, outcome: str, elapsed: float | None = None) -> None:
+        provider = self.health.provider
+        payment_gateway_calls_total.inc(provider=provider, operation=operation, outcome=outcome)
+        if elapsed is not None:
+            payment_gateway_call_duration_seconds.observe(elapsed, provider=provider, operation=operation)
+
+    def _release(self, task: asyncio.Future) -> None:
+        self.health.release()
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so an abandoned call does not log "exception never retrieved"
+            logger.debug("payment_gateway_call_errored", provider=self.health.provider, error=str(task.exception()))
+
+    async def _call(self, operation: str, call: Callable[[], Awaitable[PaymentResult]]) -> PaymentResult:
+        health = self.health
+        if not health.breaker.allow():
+            self._record(operation, "rejected")
+            return unavailable_result(f"{health.provider} is temporarily unavailable")
+        trial = health.breaker.state == CircuitState.HALF_OPEN
+        if not health.acquire():
+            if trial:
+                health.breaker.abandon_trial()
+            self._record(operation, "rejected")
+            return unavailable_result(f"Too many in-flight {health.provider} requests")
+
+        timeout = health.timeout(operation)
+        payment_gateway_timeout_seconds.set(timeout.current, provider=health.provider, operation=operation)
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(self._release)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), timeout.current)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            result = unavailable_result(f"{health.provider} did not respond within {timeout.current:.1f}s")
+        except asyncio.CancelledError:
+            if trial:
+                health.breaker.abandon_trial()
+            raise
+        except Exception as exc:  # noqa: BLE001 - network errors the SDK does not wrap
+            outcome = "failure"
+            result = unavailable_result(str(exc))
+        else:
+            outcome = "failure" if result.retryable else "success"
+            if not result.retryable:
+                timeout.observe(time.perf_counter() - start)
+        health.breaker.record(outcome != "success", trial)
+        self._record(operation, outcome, time.perf_counter() - start)
+        return result
+
+    async def create_payment_intent(
+        self,
+        amount: Decimal,
+        currency: str,
+        order_id: str,
+        customer_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> PaymentResult:
+        return await self._call(
+            "create_payment_intent",
+            lambda: self.inner.create_payment_intent(amount, currency, order_id, customer_id, metadata),
+        )
+
+    async def confirm_payment(
+        self,
+        payment_intent_id: str,
+        payment_method_id: str | None = None,
+    ) -> PaymentResult:
+        return await self._call(
+            "confirm_payment", lambda: self.inner.confirm_payment(payment_intent_id, payment_method_id)
+        )
+
+    async def get_payment_status(self, transaction_id: str) -> PaymentResult:
+        return await self._call("get_payment_status", lambda: self.inner.get_payment_status(transaction_id))
+
+    async def list_payment_statuses(
+        self,
+        transaction_ids: Sequence[str],
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> dict[str, PaymentResult]:
+        """Bulk lookups run in the background, so only the circuit applies."""
+        breaker = self.health.breaker
+        if not breaker.allow():
+            self._record("list_payment_statuses", "rejected")
+            raise GatewayUnavailableError(f"{self.health.provider} is temporarily unavailable")
+        trial = breaker.state == CircuitState.HALF_OPEN
+        start = time.perf_counter()
+        try:
+            results = await self.inner.list_payment_statuses(transaction_ids, created_after, created_before, limiter)
+        except asyncio.CancelledError:
+            if trial:
+                breaker.abandon_trial()
+            raise
+        except Exception:
+            breaker.record(True, trial)
+            self._record("list_payment_statuses", "failure", time.perf_counter() - start)
+            raise
+        breaker.record(False, trial)
+        self._record("list_payment_statuses", "success", time.perf_counter() - start)
+        return results
+
+    async def refund_payment(
+        self,
+        transaction_id: str,
+        amount: Decimal | None = None,
+        reason: str | None = None,
+    ) -> PaymentResult:
+        return await self._call("refund_payment", lambda: self.inner.refund_payment(transaction_id, amount, reason))
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
+import requests
 import stripe
 
 # Handle Stripe error imports for different versions
@@ -21,23 +25,49 @@ except (ImportError, AttributeError):
         StripeError = Exception
 
 from app.core.config import get_settings
-from app.services.payment_gateways.base import PaymentGateway, PaymentResult
+from app.core.rate_limit import AsyncRateLimiter
+from app.services.payment_gateways.base import PaymentGateway, PaymentResult, pooled_http_session
 
 settings = get_settings()
 
-# Initialize Stripe (will use STRIPE_SECRET_KEY from environment)
-stripe.api_key = getattr(settings, "stripe_secret_key", None) or "sk_test_placeholder"
+# Connection problems, 5xx responses and throttling; declines and bad requests are final
+_error_module = getattr(stripe, "error", stripe)
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = tuple(
+    getattr(_error_module, name)
+    for name in ("APIConnectionError", "APIError", "RateLimitError")
+    if hasattr(_error_module, name)
+)
+
+# Our created_date and Stripe's `created` differ by request latency
+LIST_WINDOW_SLACK_SECONDS = 300
+# Beyond this many list pages, per-ID retrieval is cheaper
+MAX_LIST_PAGES = 10
 
 
 class StripeGateway(PaymentGateway):
-    """Stripe payment gateway implementation."""
+    """Stripe payment gateway implementation.
+
+    Each instance owns a ``StripeClient`` bound to its own secret key and HTTP
+    connection pool; the global ``stripe.api_key`` is never touched, so gateways
+    for different accounts can be used concurrently. SDK calls are blocking and
+    run in worker threads. Obtain instances from ``gateway_registry`` rather than
+    constructing one per request.
+    """
 
-    def __init__(self, secret_key: str | None = None):
+    api_base = "https://api.stripe.com"
+
+    def __init__(self, secret_key: str | None = None, http_session: requests.Session | None = None):
         """Initialize Stripe gateway."""
-        if secret_key:
-            stripe.api_key = secret_key
-        elif hasattr(settings, "stripe_secret_key") and settings.stripe_secret_key:
-            stripe.api_key = settings.stripe_secret_key
+        secret_key = secret_key or getattr(settings, "stripe_secret_key", None) or "sk_test_placeholder"
+        self.http_session = http_session or pooled_http_session(settings.payment_http_pool_size)
+        self.client = stripe.StripeClient(
+            secret_key,
+            http_client=stripe.RequestsClient(session=self.http_session, timeout=settings.payment_http_timeout),
+        )
+        # Newer SDKs move resources under the ``v1`` namespace
+        services = getattr(self.client, "v1", self.client)
+        self._payment_intents = services.payment_intents
+        self._refunds = services.refunds
 
     async def create_payment_intent(
         self,
@@ -61,7 +91,7 @@ class StripeGateway(PaymentGateway):
             if customer_id:
                 intent_data["customer"] = customer_id
 
-            intent = stripe.PaymentIntent.create(**intent_data)
+            intent = await asyncio.to_thread(self._payment_intents.create, params=intent_data)
 
             return PaymentResult(
                 success=True,
@@ -82,6 +112,7 @@ class StripeGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, TRANSIENT_ERRORS),
             )
 
     async def confirm_payment(
@@ -95,7 +126,7 @@ class StripeGateway(PaymentGateway):
             if payment_method_id:
                 intent_data["payment_method"] = payment_method_id
 
-            intent = stripe.PaymentIntent.confirm(payment_intent_id, **intent_data)
+            intent = await asyncio.to_thread(self._payment_intents.confirm, payment_intent_id, params=intent_data)
 
             return PaymentResult(
                 success=intent.status == "succeeded",
@@ -107,7 +138,7 @@ class StripeGateway(PaymentGateway):
                 metadata={
                     "stripe_payment_intent": intent.id,
                     "status": intent.status,
-                    "charges": [charge.id for charge in intent.charges.data] if intent.charges else [],
+                    "latest_charge": intent.get("latest_charge"),
                 },
             )
         except StripeError as e:
@@ -115,32 +146,87 @@ class StripeGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, TRANSIENT_ERRORS),
             )
 
+    @staticmethod
+    def _intent_result(intent: Any) -> PaymentResult:
+        last_error = intent.get("last_payment_error") or {}
+        return PaymentResult(
+            success=intent.status == "succeeded",
+            transaction_id=intent.id,
+            payment_intent_id=intent.id,
+            amount=Decimal(intent.amount) / 100,
+            currency=intent.currency.upper(),
+            status=intent.status,
+            error_message=last_error.get("message"),
+            metadata={
+                "stripe_payment_intent": intent.id,
+                "status": intent.status,
+            },
+        )
+
     async def get_payment_status(self, transaction_id: str) -> PaymentResult:
         """Get Stripe payment intent status."""
         try:
-            intent = stripe.PaymentIntent.retrieve(transaction_id)
-
-            return PaymentResult(
-                success=intent.status == "succeeded",
-                transaction_id=intent.id,
-                payment_intent_id=intent.id,
-                amount=Decimal(intent.amount) / 100,
-                currency=intent.currency.upper(),
-                status=intent.status,
-                metadata={
-                    "stripe_payment_intent": intent.id,
-                    "status": intent.status,
-                },
-            )
+            intent = await asyncio.to_thread(self._payment_intents.retrieve, transaction_id)
+            return self._intent_result(intent)
         except StripeError as e:
             return PaymentResult(
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, TRANSIENT_ERRORS),
             )
 
+    async def list_payment_statuses(
+        self,
+        transaction_ids: Sequence[str],
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        limiter: AsyncRateLimiter | None = None,
+    ) -> dict[str, PaymentResult]:
+        """Page through ``PaymentIntent.list`` for the creation window, then retrieve stragglers."""
+        wanted = set(transaction_ids)
+        found: dict[str, PaymentResult] = {}
+
+        if created_after and created_before:
+            params: dict[str, Any] = {
+                "created": {
+                    "gte": int(created_after.timestamp()) - LIST_WINDOW_SLACK_SECONDS,
+                    "lte": int(created_before.timestamp()) + LIST_WINDOW_SLACK_SECONDS,
+                },
+                "limit": 100,
+            }
+            for _ in range(MAX_LIST_PAGES):
+                if limiter:
+                    await limiter.acquire()
+                try:
+                    page = await asyncio.to_thread(self._payment_intents.list, params=params)
+                except StripeError:
+                    break
+                for intent in page.data:
+                    if intent.id in wanted:
+                        found[intent.id] = self._intent_result(intent)
+                if not page.has_more or not page.data or wanted <= found.keys():
+                    break
+                params["starting_after"] = page.data[-1].id
+
+        async def retrieve(transaction_id: str) -> PaymentResult | None:
+            if limiter:
+                await limiter.acquire()
+            try:
+                intent = await asyncio.to_thread(self._payment_intents.retrieve, transaction_id)
+            except StripeError:
+                return None
+            return self._intent_result(intent)
+
+        missing = [transaction_id for transaction_id in wanted if transaction_id not in found]
+        for transaction_id, result in zip(missing, await asyncio.gather(*(retrieve(t) for t in missing))):
+            if result is not None:
+                found[transaction_id] = result
+        return found
+
     async def refund_payment(
         self,
         transaction_id: str,
@@ -149,23 +235,14 @@ class StripeGateway(PaymentGateway):
     ) -> PaymentResult:
         """Refund a Stripe payment."""
         try:
-            # First, get the charge ID from the payment intent
-            intent = stripe.PaymentIntent.retrieve(transaction_id)
-            if not intent.charges.data:
-                return PaymentResult(
-                    success=False,
-                    error_message="No charges found for this payment intent",
-                )
-
-            charge_id = intent.charges.data[0].id
-
-            refund_data: dict[str, Any] = {"charge": charge_id}
+            # Refunding by intent avoids a lookup of its charge
+            refund_data: dict[str, Any] = {"payment_intent": transaction_id}
             if amount:
                 refund_data["amount"] = int(amount * 100)  # Convert to cents
             if reason:
                 refund_data["reason"] = reason
 
-            refund = stripe.Refund.create(**refund_data)
+            refund = await asyncio.to_thread(self._refunds.create, params=refund_data)
 
             return PaymentResult(
                 success=refund.status == "succeeded",
@@ -175,7 +252,7 @@ class StripeGateway(PaymentGateway):
                 status=refund.status,
                 metadata={
                     "stripe_refund": refund.id,
-                    "charge_id": charge_id,
+                    "payment_intent": transaction_id,
                     "status": refund.status,
                 },
             )
@@ -184,5 +261,6 @@ class StripeGateway(PaymentGateway):
                 success=False,
                 error_message=str(e),
                 status="failed",
+                retryable=isinstance(e, TRANSIENT_ERRORS),
             )
 
@@ -9,6 +9,8 @@ from fastapi import HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_service
+from app.core.http_cache import PAYMENT_METHODS
 from app.db.models.payment_method import PaymentMethod
 from app.schemas.payment_method import PaymentMethodCreate, PaymentMethodUpdate
 
@@ -73,6 +75,7 @@ class PaymentMethodService:
         self.session.add(payment_method)
         await self.session.commit()
         await self.session.refresh(payment_method)
+        await cache_service.invalidate_catalog(PAYMENT_METHODS, str(tenant_id))
         return payment_method
 
     async def update_payment_method(
@@ -100,5 +103,6 @@ class PaymentMethodService:
 
         await self.session.commit()
         await self.session.refresh(payment_method)
+        await cache_service.invalidate_catalog(PAYMENT_METHODS, str(tenant_id))
         return payment_method
 
@@ -0,0 +1,259 @@
+"""Scheduled reconciliation of payment transactions stuck in Pending/Processing."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.rate_limit import AsyncRateLimiter
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.services.payment_gateways import PaymentGateway, PaymentResult, gateway_registry
+from app.services.payment_transitions import OPEN_STATUSES, StatusChange, TransitionBatch
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+
+def status_change_from_result(provider: PaymentProvider, result: PaymentResult) -> StatusChange | None:
+    """Map a provider-reported status to a transaction update, or ``None`` if still undecided."""
+    if result.retryable:
+        return None
+    if provider == PaymentProvider.stripe:
+        if result.status == "succeeded":
+            return StatusChange(PaymentStatus.succeeded, provider_transaction_id=result.transaction_id)
+        if result.status == "processing":
+            return StatusChange(PaymentStatus.processing)
+        if result.status == "canceled":
+            return StatusChange(PaymentStatus.cancelled, failure_reason="Payment cancelled")
+        # The intent goes back to requires_payment_method after a declined attempt
+        if result.status == "requires_payment_method" and result.error_message:
+            return StatusChange(PaymentStatus.failed, failure_reason=result.error_message)
+        return None
+
+    if provider == PaymentProvider.razorpay:
+        if result.status == "captured":
+            return StatusChange(PaymentStatus.succeeded, provider_transaction_id=result.transaction_id)
+        if result.status == "paid":  # Order fetched directly; keep the order ID reference
+            return StatusChange(PaymentStatus.succeeded)
+        if result.status == "authorized":
+            return StatusChange(PaymentStatus.processing, provider_transaction_id=result.transaction_id)
+        if result.status == "failed":
+            return StatusChange(PaymentStatus.failed, failure_reason=result.error_message or "Payment failed")
+        return None
+
+    return None
+
+
+@dataclass(slots=True)
+class ProviderReport:
+    """Reconciliation outcome for one provider."""
+
+    provider: str
+    batches: int = 0
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    unresolved: int = 0  # Provider did not return the transaction
+    errors: int = 0
+    transitions: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ReconciliationReport:
+    """Summary of a reconciliation run, logged and returned by the Celery task."""
+
+    started_at: datetime
+    window_start: datetime
+    window_end: datetime
+    finished_at: datetime | None = None
+    providers: dict[str, ProviderReport] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        for key in ("started_at", "window_start", "window_end", "finished_at"):
+            data[key] = data[key].isoformat() if data[key] else None
+        data["totals"] = {
+            key: sum(getattr(report, key) for report in self.providers.values())
+            for key in ("scanned", "updated", "unchanged", "unresolved", "errors")
+        }
+        return data
+
+
+def _default_limiters() -> dict[PaymentProvider, AsyncRateLimiter]:
+    return {
+        PaymentProvider.stripe: AsyncRateLimiter(settings.stripe_api_rate_limit),
+        PaymentProvider.razorpay: AsyncRateLimiter(settings.razorpay_api_rate_limit),
+    }
+
+
+class PaymentReconciliationService:
+    """Re-syncs open transactions older than the stale threshold with their providers.
+
+    Providers are reconciled concurrently, each behind its own rate limiter.
+    Per provider, transactions are paged with a keyset on ``(created_date, id)``
+    and each page is looked up through the gateway's list API in a few calls.
+    Database work happens in short sessions on either side of the gateway call
+    so no connection is held while waiting on the network.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        gateways: Mapping[PaymentProvider, PaymentGateway] | None = None,
+        limiters: Mapping[PaymentProvider, AsyncRateLimiter] | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        # Without explicit gateways, each tenant's transactions go through its registry client
+        self.providers = list(gateways) if gateways is not None else [PaymentProvider.stripe, PaymentProvider.razorpay]
+        self._gateway_for: Callable[[UUID, PaymentProvider], PaymentGateway] = (
+            (lambda tenant_id, provider: gateways[provider]) if gateways is not None else gateway_registry.get
+        )
+        self.limiters = dict(limiters) if limiters is not None else _default_limiters()
+
+    async def reconcile(
+        self,
+        stale_after: timedelta | None = None,
+        lookback: timedelta | None = None,
+        batch_size: int | None = None,
+    ) -> ReconciliationReport:
+        stale_after = stale_after or timedelta(minutes=settings.payment_reconciliation_stale_minutes)
+        lookback = lookback or timedelta(days=settings.payment_reconciliation_lookback_days)
+        batch_size = batch_size or settings.payment_reconciliation_batch_size
+
+        now = datetime.now(timezone.utc)
+        report = ReconciliationReport(started_at=now, window_start=now - lookback, window_end=now - stale_after)
+        provider_reports = await asyncio.gather(
+            *(
+                self._reconcile_provider(provider, report.window_start, report.window_end, batch_size)
+                for provider in self.providers
+            )
+        )
+        report.providers = {provider_report.provider: provider_report for provider_report in provider_reports}
+        report.finished_at = datetime.now(timezone.utc)
+        return report
+
+    async def _next_page(
+        self,
+        provider: PaymentProvider,
+        window_start: datetime,
+        window_end: datetime,
+        cursor: tuple[datetime, UUID] | None,
+        batch_size: int,
+    ) -> list[tuple[UUID, datetime, str, UUID]]:
+        query = (
+            select(
+                PaymentTransaction.id,
+                PaymentTransaction.created_date,
+                PaymentTransaction.provider_transaction_id,
+                PaymentTransaction.tenant_id,
+            )
+            .where(
+                PaymentTransaction.provider == provider,
+                PaymentTransaction.status.in_(OPEN_STATUSES),
+                PaymentTransaction.created_date >= window_start,
+                PaymentTransaction.created_date < window_end,
+                PaymentTransaction.provider_transaction_id.is_not(None),
+            )
+            .order_by(PaymentTransaction.created_date, PaymentTransaction.id)
+            .limit(batch_size)
+        )
+        if cursor is not None:
+            query = query.where(tuple_(PaymentTransaction.created_date, PaymentTransaction.id) > cursor)
+        async with self.session_factory() as session:
+            return [tuple(row) for row in (await session.execute(query)).all()]
+
+    async def _reconcile_provider(
+        self,
+        provider: PaymentProvider,
+        window_start: datetime,
+        window_end: datetime,
+        batch_size: int,
+    ) -> ProviderReport:
+        report = ProviderReport(provider=provider.value)
+        cursor: tuple[datetime, UUID] | None = None
+
+        while True:
+            page = await self._next_page(provider, window_start, window_end, cursor, batch_size)
+            if not page:
+                break
+            report.batches += 1
+            report.scanned += len(page)
+            cursor = (page[-1][1], page[-1][0])
+
+            # Tenants sharing credentials share a gateway, so most pages need one lookup
+            groups: dict[int, tuple[PaymentGateway, list[str]]] = {}
+            for _, _, reference, tenant_id in page:
+                gateway = self._gateway_for(tenant_id, provider)
+                groups.setdefault(id(gateway), (gateway, []))[1].append(reference)
+            try:
+                results: dict[str, PaymentResult] = {}
+                for found in await asyncio.gather(
+                    *(
+                        gateway.list_payment_statuses(
+                            references,
+                            created_after=page[0][1],
+                            created_before=page[-1][1],
+                            limiter=self.limiters.get(provider),
+                        )
+                        for gateway, references in groups.values()
+                    )
+                ):
+                    results.update(found)
+            except Exception as exc:  # noqa: BLE001 - one bad page must not abort the run
+                logger.warning("payment_reconciliation_lookup_failed", provider=provider.value, error=str(exc))
+                report.errors += len(page)
+            else:
+                changes: dict[UUID, StatusChange] = {}
+                for transaction_id, _, reference, _ in page:
+                    result = results.get(reference)
+                    if result is None:
+                        report.unresolved += 1
+                        continue
+                    change = status_change_from_result(provider, result)
+                    if change is None:
+                        report.unchanged += 1
+                    else:
+                        changes[transaction_id] = change
+                if changes:
+                    await self._apply(changes, report)
+
+            if len(page) < batch_size:
+                break
+
+        return report
+
+    async def _apply(self, changes: dict[UUID, StatusChange], report: ProviderReport) -> None:
+        batch = TransitionBatch()
+        async with self.session_factory() as session:
+            # Rows locked by a concurrent webhook batch are left for the next run
+            transactions = (
+                (
+                    await session.execute(
+                        select(PaymentTransaction)
+                        .where(PaymentTransaction.id.in_(changes))
+                        .with_for_update(skip_locked=True)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            for transaction in transactions:
+                batch.add(transaction, changes[transaction.id])
+            await batch.flush(session)
+            await session.commit()
+        batch.publish()
+
+        report.updated += len(batch)
+        report.unchanged += len(changes) - len(batch)
+        for _, previous, current in batch.transitions:
+            key = f"{previous.value}->{current.value}"
+            report.transitions[key] = report.transitions.get(key, 0) + 1
@@ -0,0 +1,125 @@
+"""Bulk payment status transitions shared by webhooks and reconciliation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import publish_payment_failed, publish_payment_succeeded
+from app.db.models.order import Order, OrderStatus
+from app.db.models.payment_transaction import PaymentStatus, PaymentTransaction
+
+OPEN_STATUSES = (PaymentStatus.pending, PaymentStatus.processing)
+
+# Statuses a transaction may move to from each current status. Updates can
+# arrive out of order, so a late "processing" never overwrites a final state.
+# Stripe allows retrying a failed intent with another card, hence failed -> succeeded.
+ALLOWED_TRANSITIONS: dict[PaymentStatus, set[PaymentStatus]] = {
+    PaymentStatus.pending: {
+        PaymentStatus.processing,
+        PaymentStatus.succeeded,
+        PaymentStatus.failed,
+        PaymentStatus.cancelled,
+    },
+    PaymentStatus.processing: {PaymentStatus.succeeded, PaymentStatus.failed, PaymentStatus.cancelled},
+    PaymentStatus.failed: {PaymentStatus.succeeded},
+}
+
+
+@dataclass(slots=True, frozen=True)
+class StatusChange:
+    """Transaction update reported by a provider."""
+
+    status: PaymentStatus
+    failure_reason: str | None = None
+    provider_transaction_id: str | None = None
+
+
+class TransitionBatch:
+    """Collects status changes for locked transactions and writes them in bulk.
+
+    Changes for the same transaction are folded in arrival order, so only the
+    final state is written. ``flush`` issues one UPDATE for the transactions and
+    one for the orders of newly succeeded payments; the caller commits and then
+    calls ``publish``.
+    """
+
+    def __init__(self) -> None:
+        self._transactions: dict[UUID, PaymentTransaction] = {}
+        self._previous: dict[UUID, PaymentStatus] = {}
+        self._updates: dict[UUID, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._updates)
+
+    def add(self, transaction: PaymentTransaction, change: StatusChange) -> bool:
+        """Queue ``change``; returns ``False`` if the transition is not allowed."""
+        current = self._updates.get(transaction.id, {}).get("status", transaction.status)
+        if change.status not in ALLOWED_TRANSITIONS.get(current, set()):
+            return False
+
+        self._transactions[transaction.id] = transaction
+        self._previous.setdefault(transaction.id, transaction.status)
+        values = self._updates.setdefault(
+            transaction.id,
+            {"id": transaction.id, "provider_transaction_id": transaction.provider_transaction_id},
+        )
+        values.update(status=change.status, failure_reason=change.failure_reason)
+        if change.provider_transaction_id:
+            values["provider_transaction_id"] = change.provider_transaction_id
+        return True
+
+    @property
+    def transitions(self) -> list[tuple[PaymentTransaction, PaymentStatus, PaymentStatus]]:
+        """``(transaction, previous status, new status)`` for each queued update."""
+        return [
+            (self._transactions[txn_id], self._previous[txn_id], values["status"])
+            for txn_id, values in self._updates.items()
+        ]
+
+    def _with_status(self, status: PaymentStatus) -> list[PaymentTransaction]:
+        return [self._transactions[txn_id] for txn_id, values in self._updates.items() if values["status"] == status]
+
+    async def flush(self, session: AsyncSession) -> None:
+        if not self._updates:
+            return
+        now = datetime.now(timezone.utc)
+        await session.execute(
+            update(PaymentTransaction),
+            [{**values, "modified_date": now} for values in self._updates.values()],
+        )
+        succeeded = self._with_status(PaymentStatus.succeeded)
+        if succeeded:
+            await session.execute(
+                update(Order)
+                .where(
+                    Order.id.in_({transaction.order_id for transaction in succeeded}),
+                    Order.status == OrderStatus.pending_payment,
+                )
+                .values(status=OrderStatus.confirmed, modified_date=now)
+                .execution_options(synchronize_session=False)
+            )
+
+    def publish(self) -> None:
+        """Publish payment events for the flushed transitions (call after commit)."""
+        for transaction in self._with_status(PaymentStatus.succeeded):
+            publish_payment_succeeded(
+                transaction_id=transaction.id,
+                order_id=transaction.order_id,
+                tenant_id=transaction.tenant_id,
+                amount=float(transaction.amount),
+                currency=transaction.amount_currency,
+                provider=transaction.provider.value,
+            )
+        for transaction in self._with_status(PaymentStatus.failed):
+            publish_payment_failed(
+                transaction_id=transaction.id,
+                order_id=transaction.order_id,
+                tenant_id=transaction.tenant_id,
+                failure_reason=self._updates[transaction.id]["failure_reason"] or "Payment failed",
+            )
@@ -0,0 +1,287 @@
+"""Payment provider webhook verification, ingestion and batch processing."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import structlog
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.serialization import loads
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.db.models.payment_webhook_event import PaymentWebhookEvent, WebhookEventStatus
+from app.services.payment_transitions import StatusChange, TransitionBatch
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class WebhookEvent:
+    """A verified webhook delivery, ready to be stored in the inbox."""
+
+    provider: PaymentProvider
+    event_id: str
+    event_type: str
+    reference: str | None
+    payload: bytes
+
+
+def verify_stripe_signature(
+    payload: bytes,
+    header: str | None,
+    secret: str,
+    tolerance: int = 300,
+    now: float | None = None,
+) -> bool:
+    """Check a ``Stripe-Signature`` header (``t=<ts>,v1=<hex>[,v1=...]``)."""
+    if not header:
+        return False
+    timestamp: str | None = None
+    signatures: list[str] = []
+    for item in header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value)
+    if not timestamp or not signatures or not timestamp.isdigit():
+        return False
+    if tolerance and abs((now if now is not None else time.time()) - int(timestamp)) > tolerance:
+        return False
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + payload, hashlib.sha256).hexdigest()
+    return any(hmac.compare_digest(expected, signature) for signature in signatures)
+
+
+def verify_razorpay_signature(payload: bytes, signature: str | None, secret: str) -> bool:
+    """Check an ``X-Razorpay-Signature`` header (hex HMAC-SHA256 of the raw body)."""
+    if not signature:
+        return False
+    expected = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _stripe_object(data: dict[str, Any]) -> dict[str, Any]:
+    return (data.get("data") or {}).get("object") or {}
+
+
+def _razorpay_entity(data: dict[str, Any], name: str) -> dict[str, Any]:
+    return ((data.get("payload") or {}).get(name) or {}).get("entity") or {}
+
+
+def parse_stripe_event(payload: bytes) -> WebhookEvent:
+    data = loads(payload)
+    obj = _stripe_object(data)
+    # charge.* events carry the intent ID alongside the charge ID
+    reference = obj.get("payment_intent") if obj.get("object") == "charge" else obj.get("id")
+    return WebhookEvent(
+        provider=PaymentProvider.stripe,
+        event_id=data["id"],
+        event_type=data["type"],
+        reference=reference,
+        payload=payload,
+    )
+
+
+def parse_razorpay_event(payload: bytes, event_id: str | None) -> WebhookEvent:
+    data = loads(payload)
+    payment = _razorpay_entity(data, "payment")
+    order = _razorpay_entity(data, "order")
+    # Transactions store the Razorpay order ID as the intent ID
+    reference = order.get("id") or payment.get("order_id") or payment.get("id")
+    return WebhookEvent(
+        provider=PaymentProvider.razorpay,
+        # Razorpay sends the ID as a header only; fall back to the body digest
+        event_id=event_id or hashlib.sha256(payload).hexdigest(),
+        event_type=data["event"],
+        reference=reference,
+        payload=payload,
+    )
+
+
+def status_change(provider: PaymentProvider, event_type: str, data: dict[str, Any]) -> StatusChange | None:
+    """Map a provider event to a transaction update, or ``None`` if it is not actionable."""
+    if provider == PaymentProvider.stripe:
+        obj = _stripe_object(data)
+        if event_type == "payment_intent.succeeded":
+            return StatusChange(PaymentStatus.succeeded, provider_transaction_id=obj.get("id"))
+        if event_type == "payment_intent.processing":
+            return StatusChange(PaymentStatus.processing)
+        if event_type == "payment_intent.payment_failed":
+            error = obj.get("last_payment_error") or {}
+            return StatusChange(PaymentStatus.failed, failure_reason=error.get("message") or "Payment failed")
+        if event_type == "payment_intent.canceled":
+            return StatusChange(
+                PaymentStatus.cancelled, failure_reason=obj.get("cancellation_reason") or "Payment cancelled"
+            )
+        return None
+
+    if provider == PaymentProvider.razorpay:
+        payment = _razorpay_entity(data, "payment")
+        if event_type in ("payment.captured", "order.paid"):
+            return StatusChange(PaymentStatus.succeeded, provider_transaction_id=payment.get("id"))
+        if event_type == "payment.authorized":
+            return StatusChange(PaymentStatus.processing, provider_transaction_id=payment.get("id"))
+        if event_type == "payment.failed":
+            return StatusChange(
+                PaymentStatus.failed, failure_reason=payment.get("error_description") or "Payment failed"
+            )
+        return None
+
+    return None
+
+
+def verify_and_parse(
+    provider: PaymentProvider, payload: bytes, headers: dict[str, str] | Any
+) -> WebhookEvent:
+    """Verify the delivery's signature and parse it, raising HTTPException on failure."""
+    if provider == PaymentProvider.stripe:
+        secret = settings.stripe_webhook_secret
+        verified = secret is not None and verify_stripe_signature(
+            payload, headers.get("stripe-signature"), secret, settings.stripe_webhook_tolerance
+        )
+    else:
+        secret = settings.razorpay_webhook_secret
+        verified = secret is not None and verify_razorpay_signature(
+            payload, headers.get("x-razorpay-signature"), secret
+        )
+
+    if secret is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{provider.value} webhooks are not configured.",
+        )
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid webhook signature.")
+
+    try:
+        if provider == PaymentProvider.stripe:
+            return parse_stripe_event(payload)
+        return parse_razorpay_event(payload, headers.get("x-razorpay-event-id"))
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed webhook payload.") from exc
+
+
+class PaymentWebhookService:
+    """Stores webhook deliveries and applies them to transactions in batches."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def record(self, event: WebhookEvent) -> bool:
+        """Insert ``event`` into the inbox; returns ``False`` for a redelivery."""
+        result = await self.session.execute(
+            insert(PaymentWebhookEvent)
+            .values(
+                provider=event.provider,
+                provider_event_id=event.event_id,
+                event_type=event.event_type,
+                provider_reference=event.reference,
+                payload=event.payload.decode(),
+                status=WebhookEventStatus.pending.value,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(constraint="uq_payment_webhook_events_provider_event")
+            .returning(PaymentWebhookEvent.id)
+        )
+        inserted = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return inserted
+
+    async def process_pending(self, batch_size: int | None = None) -> dict[str, int]:
+        """Apply one batch of pending events.
+
+        Events are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+        drain the inbox concurrently. Matching transactions are loaded in one
+        query and all transaction, order and event updates are issued as bulk
+        statements in a single commit.
+        """
+        batch_size = batch_size or settings.payment_webhook_batch_size
+        counts = {"claimed": 0, "applied": 0, "ignored": 0, "deferred": 0}
+
+        events = (
+            (
+                await self.session.execute(
+                    select(PaymentWebhookEvent)
+                    .where(PaymentWebhookEvent.status == WebhookEventStatus.pending.value)
+                    .order_by(PaymentWebhookEvent.received_date)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if not events:
+            await self.session.rollback()
+            return counts
+        counts["claimed"] = len(events)
+
+        changes = {event.id: status_change(event.provider, event.event_type, loads(event.payload)) for event in events}
+        references = {
+            event.provider_reference for event in events if changes[event.id] and event.provider_reference
+        }
+        transactions: dict[tuple[PaymentProvider, str], PaymentTransaction] = {}
+        if references:
+            result = await self.session.execute(
+                select(PaymentTransaction)
+                .where(
+                    or_(
+                        PaymentTransaction.provider_payment_intent_id.in_(references),
+                        PaymentTransaction.provider_transaction_id.in_(references),
+                    )
+                )
+                .with_for_update()
+            )
+            for transaction in result.scalars():
+                for key in (transaction.provider_payment_intent_id, transaction.provider_transaction_id):
+                    if key:
+                        transactions[(transaction.provider, key)] = transaction
+
+        now = datetime.now(timezone.utc)
+        batch = TransitionBatch()
+        event_rows: list[dict[str, Any]] = []
+        for event in events:
+            change = changes[event.id]
+            row: dict[str, Any] = {
+                "id": event.id,
+                "attempts": event.attempts + 1,
+                "processed_date": now,
+                "error": None,
+            }
+            transaction = transactions.get((event.provider, event.provider_reference or ""))
+
+            if change is None:
+                row["status"] = WebhookEventStatus.ignored.value
+                counts["ignored"] += 1
+            elif transaction is None:
+                # The webhook may beat the commit of the intent that created the
+                # transaction; keep it pending for a few rounds before giving up
+                if event.attempts + 1 >= settings.payment_webhook_max_attempts:
+                    row.update(status=WebhookEventStatus.ignored.value, error="No matching payment transaction")
+                    counts["ignored"] += 1
+                else:
+                    row.update(status=WebhookEventStatus.pending.value, processed_date=None)
+                    counts["deferred"] += 1
+            else:
+                if batch.add(transaction, change):
+                    counts["applied"] += 1
+                row["status"] = WebhookEventStatus.processed.value
+            event_rows.append(row)
+
+        await batch.flush(self.session)
+        await self.session.execute(update(PaymentWebhookEvent), event_rows)
+        await self.session.commit()
+        batch.publish()
+
+        logger.info("payment_webhooks_processed", **counts)
+        return counts
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.events import (
     publish_payment_failed,
     publish_payment_intent_created,
@@ -17,7 +18,19 @@ from app.core.events import (
 from app.db.models.order import Order, OrderStatus
 from app.db.models.payment_method import PaymentMethod, PaymentMethodType
 from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
-from app.services.payment_gateways import RazorpayGateway, StripeGateway
+from app.services.payment_gateways import PaymentResult, gateway_registry
+from app.services.payment_transitions import ALLOWED_TRANSITIONS
+
+settings = get_settings()
+
+
+def provider_unavailable(result: PaymentResult) -> HTTPException:
+    """503 for a transient provider failure, retryable once the circuit breaker may have recovered."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Payment provider unavailable: {result.error_message}",
+        headers={"Retry-After": str(int(settings.payment_circuit_recovery_seconds))},
+    )
 
 
 class PaymentService:
@@ -26,18 +39,6 @@ class PaymentService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def _get_gateway(self, payment_method: PaymentMethod) -> StripeGateway | RazorpayGateway:
-        """Get the appropriate payment gateway based on payment method."""
-        # This is a simplified version - in production, you'd check tenant/payment method config
-        if payment_method.type == PaymentMethodType.credit_card or payment_method.type == PaymentMethodType.debit_card:
-            # Default to Stripe for card payments
-            return StripeGateway()
-        # Add more logic based on tenant configuration
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Payment gateway not configured for payment method type: {payment_method.type}",
-        )
-
     async def create_payment_intent(
         self,
         tenant_id: UUID,
@@ -100,41 +101,49 @@ class PaymentService:
             created_by=actor_id,
             modified_by=actor_id,
         )
+        if provider == PaymentProvider.manual:
+            # Manual payment (COD, etc.) - mark as processing
+            transaction.status = PaymentStatus.processing
         self.session.add(transaction)
         await self.session.flush()
+        await self.session.refresh(transaction)
+        customer_id = order.customer_id
+        # Commit before the gateway call so no connection is held during the round trip
+        await self.session.commit()
 
         # Create payment intent with gateway if needed
         if provider != PaymentProvider.manual:
-            gateway = self._get_gateway(payment_method)
+            gateway = gateway_registry.get(tenant_id, provider)
             result = await gateway.create_payment_intent(
-                amount=order.total_amount,
-                currency=order.total_currency,
+                amount=transaction.amount,
+                currency=transaction.amount_currency,
                 order_id=str(order_id),
-                customer_id=str(order.customer_id),
+                customer_id=str(customer_id),
                 metadata={"tenant_id": str(tenant_id)},
             )
 
-            if result.success:
-                transaction.provider_transaction_id = result.transaction_id
-                transaction.provider_payment_intent_id = result.payment_intent_id
-                transaction.status = PaymentStatus.processing
-                if result.metadata:
-                    import json
-
-                    transaction.provider_metadata = json.dumps(result.metadata)
-                if result.client_secret:
-                    transaction.provider_metadata = json.dumps(
-                        {**(json.loads(transaction.provider_metadata) if transaction.provider_metadata else {}), "client_secret": result.client_secret}
-                    )
-            else:
-                transaction.status = PaymentStatus.failed
-                transaction.failure_reason = result.error_message
-        else:
-            # Manual payment (COD, etc.) - mark as processing
-            transaction.status = PaymentStatus.processing
-
-        await self.session.commit()
-        await self.session.refresh(transaction)
+            transaction = await self._reload_for_update(transaction.id)
+            if transaction.status == PaymentStatus.pending:
+                if result.success:
+                    transaction.provider_transaction_id = result.transaction_id
+                    transaction.provider_payment_intent_id = result.payment_intent_id
+                    transaction.status = PaymentStatus.processing
+                    if result.metadata:
+                        import json
+
+                        transaction.provider_metadata = json.dumps(result.metadata)
+                    if result.client_secret:
+                        transaction.provider_metadata = json.dumps(
+                            {**(json.loads(transaction.provider_metadata) if transaction.provider_metadata else {}), "client_secret": result.client_secret}
+                        )
+                else:
+                    transaction.status = PaymentStatus.failed
+                    transaction.failure_reason = result.error_message
+            await self.session.flush()
+            await self.session.refresh(transaction)
+            await self.session.commit()
+            if result.retryable:
+                raise provider_unavailable(result)
 
         # Publish payment.intent_created event
         publish_payment_intent_created(
@@ -179,35 +188,40 @@ class PaymentService:
         if not order:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found.")
 
-        # Get payment method
-        payment_method_result = await self.session.execute(
-            select(PaymentMethod).where(
-                PaymentMethod.id == transaction.payment_method_id, PaymentMethod.tenant_id == tenant_id
-            )
-        )
-        payment_method = payment_method_result.scalar_one_or_none()
-
+        previous_status = transaction.status
         # Confirm with gateway if needed
         if transaction.provider != PaymentProvider.manual and transaction.provider_payment_intent_id:
-            gateway = self._get_gateway(payment_method) if payment_method else StripeGateway()
+            gateway = gateway_registry.get(tenant_id, transaction.provider)
+            payment_intent_id = transaction.provider_payment_intent_id
+            # End the read transaction so no connection is held during the provider call
+            await self.session.commit()
             result = await gateway.confirm_payment(
-                payment_intent_id=transaction.provider_payment_intent_id,
+                payment_intent_id=payment_intent_id,
                 payment_method_id=payment_method_id,
             )
-
-            if result.success:
-                transaction.status = PaymentStatus.succeeded
-                transaction.provider_transaction_id = result.transaction_id
-                if result.metadata:
-                    import json
-
-                    existing_metadata = json.loads(transaction.provider_metadata) if transaction.provider_metadata else {}
-                    transaction.provider_metadata = json.dumps({**existing_metadata, **result.metadata})
-                # Update order status
-                order.status = OrderStatus.confirmed
-            else:
-                transaction.status = PaymentStatus.failed
-                transaction.failure_reason = result.error_message
+            if result.retryable:
+                # Outcome unknown (or never attempted): leave the transaction open for reconciliation
+                raise provider_unavailable(result)
+
+            # Re-read by id: a webhook may have settled the payment during the call
+            transaction = await self._reload_for_update(transaction_id)
+            order = await self._reload_order_for_update(transaction.order_id)
+            previous_status = transaction.status
+            new_status = PaymentStatus.succeeded if result.success else PaymentStatus.failed
+            if new_status in ALLOWED_TRANSITIONS.get(transaction.status, set()):
+                transaction.status = new_status
+                if result.success:
+                    transaction.provider_transaction_id = result.transaction_id
+                    if result.metadata:
+                        import json
+
+                        existing_metadata = json.loads(transaction.provider_metadata) if transaction.provider_metadata else {}
+                        transaction.provider_metadata = json.dumps({**existing_metadata, **result.metadata})
+                    # Update order status
+                    if order.status == OrderStatus.pending_payment:
+                        order.status = OrderStatus.confirmed
+                else:
+                    transaction.failure_reason = result.error_message
         else:
             # Manual payment - mark as succeeded
             transaction.status = PaymentStatus.succeeded
@@ -217,10 +231,13 @@ class PaymentService:
             transaction.modified_by = actor_id
             order.modified_by = actor_id
 
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(transaction)
+        await self.session.commit()
 
         # Publish payment events
+        if transaction.status == previous_status:
+            return transaction
         if transaction.status == PaymentStatus.succeeded:
             publish_payment_succeeded(
                 transaction_id=transaction.id,
@@ -240,8 +257,29 @@ class PaymentService:
 
         return transaction
 
+    async def _reload_for_update(self, transaction_id: UUID) -> PaymentTransaction:
+        """Re-read a transaction by id, locked, after a connection-free gateway call."""
+        result = await self.session.execute(
+            select(PaymentTransaction)
+            .where(PaymentTransaction.id == transaction_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+    async def _reload_order_for_update(self, order_id: UUID) -> Order:
+        result = await self.session.execute(
+            select(Order).where(Order.id == order_id).with_for_update().execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
     async def get_payment_status(self, tenant_id: UUID, transaction_id: UUID) -> PaymentTransaction:
-        """Get payment transaction status."""
+        """Get payment transaction status.
+
+        Served from the database only: provider webhooks keep the row current
+        (see ``PaymentWebhookService``), and ``sync_with_gateway`` covers missed
+        deliveries from a background job.
+        """
         transaction_result = await self.session.execute(
             select(PaymentTransaction).where(
                 PaymentTransaction.id == transaction_id, PaymentTransaction.tenant_id == tenant_id
@@ -250,44 +288,49 @@ class PaymentService:
         transaction = transaction_result.scalar_one_or_none()
         if not transaction:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment transaction not found.")
+        return transaction
 
-        # Sync status with gateway if needed
-        if transaction.provider != PaymentProvider.manual and transaction.provider_transaction_id:
-            gateway = StripeGateway()  # Simplified - should determine based on provider
-            result = await gateway.get_payment_status(transaction.provider_transaction_id)
+    async def sync_with_gateway(self, transaction: PaymentTransaction) -> PaymentTransaction:
+        """Pull the transaction's status from its provider; reconciliation fallback for lost webhooks."""
+        if transaction.provider == PaymentProvider.manual or not transaction.provider_transaction_id:
+            return transaction
 
-            if result.status != transaction.status.value:
-                if result.status == "succeeded":
-                    transaction.status = PaymentStatus.succeeded
-                    # Update order status
-                    order_result = await self.session.execute(
-                        select(Order).where(Order.id == transaction.order_id)
-                    )
-                    order = order_result.scalar_one_or_none()
-                    if order:
-                        order.status = OrderStatus.confirmed
-                    # Publish payment succeeded event
-                    publish_payment_succeeded(
-                        transaction_id=transaction.id,
-                        order_id=transaction.order_id,
-                        tenant_id=transaction.tenant_id,
-                        amount=float(transaction.amount),
-                        currency=transaction.amount_currency,
-                        provider=transaction.provider.value if transaction.provider else None,
-                    )
-                elif result.status == "failed":
-                    transaction.status = PaymentStatus.failed
-                    transaction.failure_reason = result.error_message
-                    # Publish payment failed event
-                    publish_payment_failed(
-                        transaction_id=transaction.id,
-                        order_id=transaction.order_id,
-                        tenant_id=transaction.tenant_id,
-                        failure_reason=result.error_message or "Payment failed",
-                    )
+        gateway = gateway_registry.get(transaction.tenant_id, transaction.provider)
+        result = await gateway.get_payment_status(transaction.provider_transaction_id)
+
+        open_statuses = (PaymentStatus.pending, PaymentStatus.processing)
+        if result.success and transaction.status in (*open_statuses, PaymentStatus.failed):
+            transaction.status = PaymentStatus.succeeded
+            # Update order status
+            order_result = await self.session.execute(select(Order).where(Order.id == transaction.order_id))
+            order = order_result.scalar_one_or_none()
+            if order and order.status == OrderStatus.pending_payment:
+                order.status = OrderStatus.confirmed
+        elif result.status == "failed" and not result.retryable and transaction.status in open_statuses:
+            transaction.status = PaymentStatus.failed
+            transaction.failure_reason = result.error_message
+        else:
+            return transaction
+
+        await self.session.commit()
+        await self.session.refresh(transaction)
 
-                await self.session.commit()
-                await self.session.refresh(transaction)
+        if transaction.status == PaymentStatus.succeeded:
+            publish_payment_succeeded(
+                transaction_id=transaction.id,
+                order_id=transaction.order_id,
+                tenant_id=transaction.tenant_id,
+                amount=float(transaction.amount),
+                currency=transaction.amount_currency,
+                provider=transaction.provider.value if transaction.provider else None,
+            )
+        else:
+            publish_payment_failed(
+                transaction_id=transaction.id,
+                order_id=transaction.order_id,
+                tenant_id=transaction.tenant_id,
+                failure_reason=result.error_message or "Payment failed",
+            )
 
         return transaction
 
@@ -340,20 +383,15 @@ class PaymentService:
 
         # Process refund with gateway if needed
         if transaction.provider != PaymentProvider.manual and transaction.provider_transaction_id:
-            payment_method_result = await self.session.execute(
-                select(PaymentMethod).where(
-                    PaymentMethod.id == transaction.payment_method_id, PaymentMethod.tenant_id == tenant_id
-                )
-            )
-            payment_method = payment_method_result.scalar_one_or_none()
-
-            gateway = self._get_gateway(payment_method) if payment_method else StripeGateway()
+            gateway = gateway_registry.get(tenant_id, transaction.provider)
             result = await gateway.refund_payment(
                 transaction_id=transaction.provider_transaction_id,
                 amount=refund_amount,
                 reason=reason,
             )
 
+            if result.retryable:
+                raise provider_unavailable(result)
             if not result.success:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
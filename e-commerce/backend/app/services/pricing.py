@@ -0,0 +1,265 @@
+"""Jewelry pricing engine: metal rate × weight + wastage + making + stone charges + GST."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.http_cache import PRODUCTS
+from app.db.models.metal_rate import MetalRate
+from app.db.models.product import Product
+from app.schemas.pricing import MetalRateUpsert
+
+CENT = Decimal("0.01")
+# Computed prices only change through product writes, which bump the products generation
+PRICE_CACHE_TTL = 3600
+
+
+def _money(value: Decimal) -> Decimal:
+    # Matches Postgres round(numeric, 2), which rounds halves away from zero
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass(slots=True, frozen=True)
+class PriceBreakdown:
+    """Components of a product's price; ``rate_based`` is False for fixed-price products."""
+
+    currency: str
+    rate_based: bool
+    rate_per_gram: Decimal | None
+    weight: Decimal | None
+    metal_value: Decimal
+    wastage_value: Decimal
+    making_charges: Decimal
+    stone_charges: Decimal
+    subtotal: Decimal
+    gst_amount: Decimal
+    total: Decimal
+
+    def to_cache(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_cache(cls, data: dict) -> PriceBreakdown:
+        # Decimals are cached as strings; currency is the only other string field
+        return cls(
+            **{
+                name: Decimal(value) if isinstance(value, str) and name != "currency" else value
+                for name, value in data.items()
+            }
+        )
+
+
+def compute_price(
+    rate_per_gram: Decimal,
+    weight: Decimal,
+    wastage_percent: Decimal | None = None,
+    wastage_value: Decimal | None = None,
+    making_charges: Decimal | None = None,
+    stone_charges: Decimal | None = None,
+    gst_percent: Decimal | None = None,
+    currency: str = "INR",
+) -> PriceBreakdown:
+    """Price one product; the same arithmetic ``PricingService.reprice`` runs in SQL.
+
+    Wastage is a percentage of the metal value when ``wastage_percent`` is set,
+    otherwise the fixed ``wastage_value``. GST applies to the whole subtotal.
+    """
+    metal = _money(rate_per_gram * weight)
+    wastage = _money(metal * wastage_percent / 100) if wastage_percent is not None else (wastage_value or Decimal("0"))
+    making = making_charges or Decimal("0")
+    stone = stone_charges or Decimal("0")
+    subtotal = metal + wastage + making + stone
+    total = _money(subtotal * (1 + (gst_percent or Decimal("0")) / 100))
+    return PriceBreakdown(
+        currency=currency,
+        rate_based=True,
+        rate_per_gram=rate_per_gram,
+        weight=weight,
+        metal_value=metal,
+        wastage_value=wastage,
+        making_charges=making,
+        stone_charges=stone,
+        subtotal=subtotal,
+        gst_amount=total - subtotal,
+        total=total,
+    )
+
+
+def breakdown_for(product: Product) -> PriceBreakdown:
+    """Breakdown of a product's materialized price."""
+    if product.rate_per_gram is not None and product.weight is not None:
+        return compute_price(
+            product.rate_per_gram,
+            product.weight,
+            product.wastage_percent,
+            product.wastage_value,
+            product.making_charges,
+            product.stone_charges,
+            product.gst_percent,
+            product.price_currency,
+        )
+    amount = Decimal(product.price_amount)
+    zero = Decimal("0.00")
+    return PriceBreakdown(
+        currency=product.price_currency,
+        rate_based=False,
+        rate_per_gram=None,
+        weight=product.weight,
+        metal_value=product.metal_value or zero,
+        wastage_value=product.wastage_value or zero,
+        making_charges=product.making_charges or zero,
+        stone_charges=product.stone_charges or zero,
+        subtotal=amount,
+        gst_amount=zero,
+        total=amount,
+    )
+
+
+class PricingService:
+    """Maintains metal rates and keeps rate-priced products' ``price_amount`` in step with them.
+
+    A product is rate-priced when it has a weight and a rate exists for its
+    material and purity (matched case-insensitively). Repricing is one
+    set-based UPDATE joining products to ``metal_rates``, so a rate change
+    reprices every affected SKU in a single statement; rows whose price would
+    not change are left untouched.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def list_rates(self, tenant_id: UUID) -> list[MetalRate]:
+        result = await self.session.execute(
+            select(MetalRate).where(MetalRate.tenant_id == tenant_id).order_by(MetalRate.material, MetalRate.purity)
+        )
+        return list(result.scalars().all())
+
+    async def set_rate(self, tenant_id: UUID, actor_id: UUID, payload: MetalRateUpsert) -> tuple[MetalRate, int]:
+        """Create or update the rate for a metal and purity, then reprice its products."""
+        material = payload.material.strip().title()
+        purity = payload.purity.strip().upper()
+        currency = payload.currency.upper()
+        statement = (
+            insert(MetalRate)
+            .values(
+                id=uuid4(),
+                tenant_id=tenant_id,
+                material=material,
+                purity=purity,
+                rate_per_gram=payload.rate_per_gram,
+                currency=currency,
+                created_by=actor_id,
+                modified_by=actor_id,
+            )
+            .on_conflict_do_update(
+                constraint="uq_metal_rates_tenant_material_purity",
+                set_={
+                    "rate_per_gram": payload.rate_per_gram,
+                    "currency": currency,
+                    "modified_by": actor_id,
+                    "modified_date": func.now(),
+                },
+            )
+            .returning(MetalRate)
+        )
+        rate = (await self.session.scalars(statement, execution_options={"populate_existing": True})).one()
+        repriced = await self.reprice(tenant_id, material=material, purity=purity)
+        await self.session.commit()
+        if repriced:
+            await cache_service.invalidate_product(str(tenant_id))
+        return rate, repriced
+
+    async def delete_rate(self, tenant_id: UUID, rate_id: UUID) -> None:
+        """Remove a rate; its products keep their last materialized price."""
+        rate = await self.session.get(MetalRate, rate_id)
+        if rate is None or rate.tenant_id != tenant_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metal rate not found.")
+        await self.session.delete(rate)
+        await self.session.commit()
+
+    async def reprice(
+        self,
+        tenant_id: UUID,
+        material: str | None = None,
+        purity: str | None = None,
+        product_ids: Sequence[UUID] | None = None,
+    ) -> int:
+        """Recompute and store prices of the tenant's rate-priced products; returns the rows changed.
+
+        Narrowed to one metal/purity or to ``product_ids`` when given. Does not
+        commit or invalidate caches; callers do both.
+        """
+        rate = MetalRate.rate_per_gram
+        metal = func.round(rate * Product.weight, 2)
+        wastage = case(
+            (Product.wastage_percent.is_not(None), func.round(metal * Product.wastage_percent / 100, 2)),
+            else_=func.coalesce(Product.wastage_value, 0),
+        )
+        subtotal = metal + wastage + func.coalesce(Product.making_charges, 0) + func.coalesce(Product.stone_charges, 0)
+        price = func.round(subtotal * (1 + func.coalesce(Product.gst_percent, 0) / 100), 2)
+
+        statement = (
+            update(Product)
+            .where(
+                Product.tenant_id == tenant_id,
+                MetalRate.tenant_id == Product.tenant_id,
+                func.lower(MetalRate.material) == func.lower(Product.material),
+                func.lower(MetalRate.purity) == func.lower(Product.purity),
+                Product.weight.is_not(None),
+                or_(
+                    Product.price_amount.is_distinct_from(price),
+                    Product.rate_per_gram.is_distinct_from(rate),
+                    Product.price_currency.is_distinct_from(MetalRate.currency),
+                ),
+            )
+            .values(
+                rate_per_gram=rate,
+                metal_value=metal,
+                wastage_value=case((Product.wastage_percent.is_not(None), wastage), else_=Product.wastage_value),
+                price_amount=price,
+                price_currency=MetalRate.currency,
+                modified_date=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if material is not None and purity is not None:
+            statement = statement.where(
+                and_(
+                    func.lower(Product.material) == material.lower(),
+                    func.lower(Product.purity) == purity.lower(),
+                )
+            )
+        if product_ids is not None:
+            statement = statement.where(Product.id.in_(product_ids))
+        result = await self.session.execute(statement)
+        return result.rowcount
+
+    async def get_price(self, tenant_id: UUID, product_id: UUID) -> PriceBreakdown:
+        """Price breakdown of a product, cached until the tenant's next product write."""
+        generation = await cache_service.get_generation(PRODUCTS, str(tenant_id))
+        key = f"product_price:{tenant_id}:{generation}:{product_id}"
+        if generation is not None:
+            cached = await cache_service.get(key)
+            if cached is not None:
+                return PriceBreakdown.from_cache(cached)
+
+        product = (
+            await self.session.execute(
+                select(Product).where(Product.id == product_id, Product.tenant_id == tenant_id)
+            )
+        ).scalar_one_or_none()
+        if product is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
+        breakdown = breakdown_for(product)
+        if generation is not None:
+            await cache_service.set(key, breakdown.to_cache(), ttl=PRICE_CACHE_TTL)
+        return breakdown
@@ -9,10 +9,14 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.product import Product
+from app.db.utils import violated_constraint
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.category_tree import category_tree_cache
+from app.services.pricing import PricingService
 
 
 class ProductService:
@@ -27,6 +31,8 @@ class ProductService:
         page: int,
         page_size: int,
         search: str | None = None,
+        category_id: UUID | None = None,
+        include_subcategories: bool = True,
     ) -> tuple[Sequence[Product], int]:
         # Try cache first
         from app.core.cache import cache_service
@@ -46,6 +52,15 @@ class ProductService:
             query = query.where(func.lower(Product.name).like(search_pattern))
             count_stmt = count_stmt.where(func.lower(Product.name).like(search_pattern))
 
+        if category_id is not None:
+            category_ids = [category_id]
+            if include_subcategories:
+                # Resolve the subtree from the cached tree so the filter stays a single indexed IN
+                tree = await category_tree_cache.get(self.session, tenant_id)
+                category_ids = tree.descendant_ids(category_id) or category_ids
+            query = query.where(Product.category_id.in_(category_ids))
+            count_stmt = count_stmt.where(Product.category_id.in_(category_ids))
+
         query = query.order_by(Product.created_date.desc()).offset((page - 1) * page_size).limit(page_size)
 
         result = await self.session.execute(query)
@@ -69,16 +84,6 @@ class ProductService:
                 detail="Inventory cannot be negative",
             )
 
-        # Validation: SKU uniqueness within tenant
-        existing = await self.session.execute(
-            select(Product).where(Product.sku == payload.sku, Product.tenant_id == tenant_id)
-        )
-        if existing.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Product with SKU '{payload.sku}' already exists",
-            )
-
         # Handle imageUrls: store as JSON string in image_url, or use image_url if provided
         image_url_value = None
         if payload.image_urls and len(payload.image_urls) > 0:
@@ -123,6 +128,9 @@ class ProductService:
             modified_by=actor_id,
         )
         self.session.add(product)
+        await self._flush_unique_sku(payload.sku)
+        # Products with a weight and a metal rate are priced from the rate
+        await PricingService(self.session).reprice(tenant_id, product_ids=[product.id])
         await self.session.commit()
         await self.session.refresh(product)
 
@@ -159,17 +167,6 @@ class ProductService:
         """Update an existing product."""
         product = await self.get_product(tenant_id, product_id)
 
-        # Validate SKU uniqueness if SKU is being updated
-        if payload.sku and payload.sku != product.sku:
-            existing = await self.session.execute(
-                select(Product).where(Product.sku == payload.sku, Product.tenant_id == tenant_id)
-            )
-            if existing.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Product with SKU '{payload.sku}' already exists",
-                )
-
         # Validation: Price must be positive if being updated
         if payload.price and payload.price.amount <= 0:
             raise HTTPException(
@@ -257,6 +254,8 @@ class ProductService:
 
         product.modified_by = actor_id
 
+        await self._flush_unique_sku(product.sku)
+        await PricingService(self.session).reprice(tenant_id, product_ids=[product.id])
         await self.session.commit()
         await self.session.refresh(product)
 
@@ -267,6 +266,19 @@ class ProductService:
 
         return product
 
+    async def _flush_unique_sku(self, sku: str) -> None:
+        """Flush pending changes, mapping a per-tenant SKU collision to 409."""
+        try:
+            await self.session.flush()
+        except IntegrityError as e:
+            await self.session.rollback()
+            if violated_constraint(e) == "uq_products_tenant_sku":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Product with SKU '{sku}' already exists",
+                ) from e
+            raise
+
     async def reserve_inventory(self, tenant_id: UUID, product_id: UUID, quantity: int, low_inventory_threshold: int = 10) -> Product:
         """Reserve inventory safely, preventing oversell."""
         result = await self.session.execute(
@@ -290,6 +302,12 @@ class ProductService:
         await self.session.commit()
         await self.session.refresh(product)
 
+        # Inventory is part of the product representation; expire catalog ETags
+        from app.core.cache import cache_service
+        from app.core.http_cache import PRODUCTS
+
+        await cache_service.bump_generation(PRODUCTS, str(tenant_id))
+
         # Check if inventory is now below threshold and wasn't before
         if product.inventory < low_inventory_threshold and old_inventory >= low_inventory_threshold:
             from app.core.events import publish_product_inventory_low
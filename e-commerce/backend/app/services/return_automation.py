@@ -0,0 +1,445 @@
+"""Set-based returns automation: policy-driven auto-approval across tenants."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+import structlog
+from sqlalchemy import and_, case, delete, exists, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import get_settings
+from app.core.events import publish_return_sla_breach
+from app.core.metrics import (
+    return_refund_verification_batch_seconds,
+    return_refund_verification_throughput,
+    return_refund_verifications_total,
+)
+from app.db.models.audit_log import AuditAction, AuditLog
+from app.db.models.order import Order
+from app.db.models.payment_transaction import PaymentStatus, PaymentTransaction
+from app.db.models.return_policy import ReturnPolicy
+from app.db.models.return_request import ReturnRequest, ReturnStatus
+from app.db.models.return_sla_notification import ReturnSlaNotification
+from app.schemas.returns import ReturnPolicyUpdate
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+AUTO_APPROVAL_NOTE = "Auto-approved based on automation rules"
+
+# SLA type, the status a return waits in for it, and its warning/due columns
+SLA_STAGES = (
+    (
+        "acknowledgement",
+        ReturnStatus.pending,
+        ReturnRequest.acknowledge_warning_date,
+        ReturnRequest.acknowledge_due_date,
+    ),
+    ("resolution", ReturnStatus.approved, ReturnRequest.resolve_warning_date, ReturnRequest.resolve_due_date),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class EffectiveReturnPolicy:
+    """A tenant's policy with configured defaults filled in."""
+
+    auto_approval_enabled: bool
+    auto_approve_max_amount: Decimal
+    auto_approve_max_order_age_days: int
+    acknowledgement_sla_hours: int
+    resolution_sla_hours: int
+
+
+def sla_deadlines(created: Any, policy: EffectiveReturnPolicy) -> dict[str, Any]:
+    """Warning and due dates of both return SLAs, for a creation time or the ``created_date`` column."""
+    warning_ratio = settings.return_sla_warning_ratio
+    deadlines = {}
+    for prefix, hours in (
+        ("acknowledge", policy.acknowledgement_sla_hours),
+        ("resolve", policy.resolution_sla_hours),
+    ):
+        deadlines[f"{prefix}_warning_date"] = created + timedelta(hours=hours * warning_ratio)
+        deadlines[f"{prefix}_due_date"] = created + timedelta(hours=hours)
+    return deadlines
+
+
+@dataclass(slots=True)
+class RefundVerificationReport:
+    """Outcome of a refund verification run."""
+
+    batches: int = 0
+    checked: int = 0
+    verified: int = 0
+    pending: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.checked / self.duration_seconds if self.duration_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "per_second": round(self.per_second, 1)}
+
+
+class ReturnAutomationService:
+    """Evaluates returns automation rules for all tenants in SQL.
+
+    Auto-approval is one statement per batch: pending returns are joined to
+    their order and tenant policy, customers with a rejected return are
+    excluded by ``NOT EXISTS``, and the survivors are approved by a bulk
+    UPDATE whose RETURNING rows feed a single multi-row audit INSERT.
+    Refund verification likewise settles a whole page of approved returns
+    against their refund transactions in one UPDATE, and SLA checks only read
+    open returns past their warning date that have not been notified yet.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_policy(self, tenant_id: UUID) -> EffectiveReturnPolicy:
+        policy = (
+            await self.session.execute(select(ReturnPolicy).where(ReturnPolicy.tenant_id == tenant_id))
+        ).scalar_one_or_none()
+        if policy is None:
+            return EffectiveReturnPolicy(
+                auto_approval_enabled=True,
+                auto_approve_max_amount=settings.return_auto_approve_max_amount,
+                auto_approve_max_order_age_days=settings.return_auto_approve_max_order_age_days,
+                acknowledgement_sla_hours=settings.return_acknowledgement_sla_hours,
+                resolution_sla_hours=settings.return_resolution_sla_hours,
+            )
+        return EffectiveReturnPolicy(
+            auto_approval_enabled=policy.auto_approval_enabled,
+            auto_approve_max_amount=policy.auto_approve_max_amount,
+            auto_approve_max_order_age_days=policy.auto_approve_max_order_age_days,
+            acknowledgement_sla_hours=policy.acknowledgement_sla_hours,
+            resolution_sla_hours=policy.resolution_sla_hours,
+        )
+
+    async def update_policy(
+        self, tenant_id: UUID, actor_id: UUID, payload: ReturnPolicyUpdate
+    ) -> EffectiveReturnPolicy:
+        """Upsert the tenant's policy; changed SLA hours re-time the deadlines of open returns.
+
+        Notifications for thresholds that moved back into the future are cleared,
+        so the SLA job reports them again when the new deadline passes.
+        """
+        current = await self.get_policy(tenant_id)
+        values = {**asdict(current), **payload.model_dump(exclude_none=True)}
+        await self.session.execute(
+            pg_insert(ReturnPolicy)
+            .values(id=uuid4(), tenant_id=tenant_id, created_by=actor_id, modified_by=actor_id, **values)
+            .on_conflict_do_update(
+                constraint="uq_return_policies_tenant",
+                set_={**values, "modified_by": actor_id, "modified_date": func.now()},
+            )
+        )
+        policy = EffectiveReturnPolicy(**values)
+        if (policy.acknowledgement_sla_hours, policy.resolution_sla_hours) != (
+            current.acknowledgement_sla_hours,
+            current.resolution_sla_hours,
+        ):
+            await self.session.execute(
+                update(ReturnRequest)
+                .where(
+                    ReturnRequest.tenant_id == tenant_id,
+                    ReturnRequest.status.in_((ReturnStatus.pending, ReturnStatus.approved)),
+                )
+                .values(**sla_deadlines(ReturnRequest.created_date, policy))
+                .execution_options(synchronize_session=False)
+            )
+            now = datetime.now(timezone.utc)
+            await self.session.execute(
+                delete(ReturnSlaNotification)
+                .where(
+                    ReturnSlaNotification.tenant_id == tenant_id,
+                    ReturnSlaNotification.return_id == ReturnRequest.id,
+                    ReturnRequest.status.in_((ReturnStatus.pending, ReturnStatus.approved)),
+                    or_(
+                        *(
+                            and_(
+                                ReturnSlaNotification.sla_type == sla_type,
+                                or_(
+                                    and_(ReturnSlaNotification.level == "warning", warning_date > now),
+                                    and_(ReturnSlaNotification.level == "breach", due_date > now),
+                                ),
+                            )
+                            for sla_type, _, warning_date, due_date in SLA_STAGES
+                        )
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        await self.session.commit()
+        return policy
+
+    async def auto_approve(
+        self, created_after: datetime | None = None, batch_size: int | None = None
+    ) -> dict[str, int]:
+        """Approve every eligible pending return (created after ``created_after``) in batches.
+
+        Rules, with per-tenant thresholds from ``return_policies``:
+        - order total at most ``auto_approve_max_amount``
+        - order placed within ``auto_approve_max_order_age_days``
+        - the customer has no rejected return with the tenant
+        Returns locked by a staff decision in progress are skipped until the next run.
+        """
+        created_after = created_after or datetime.now(timezone.utc) - timedelta(hours=24)
+        batch_size = batch_size or settings.return_auto_approval_batch_size
+        now = datetime.now(timezone.utc)
+
+        rejected = aliased(ReturnRequest)
+        max_amount = func.coalesce(ReturnPolicy.auto_approve_max_amount, settings.return_auto_approve_max_amount)
+        max_age_days = func.coalesce(
+            ReturnPolicy.auto_approve_max_order_age_days, settings.return_auto_approve_max_order_age_days
+        )
+        eligible = (
+            select(ReturnRequest.id)
+            .join(Order, Order.id == ReturnRequest.order_id)
+            .outerjoin(ReturnPolicy, ReturnPolicy.tenant_id == ReturnRequest.tenant_id)
+            .where(
+                ReturnRequest.status == ReturnStatus.pending,
+                ReturnRequest.created_date >= created_after,
+                func.coalesce(ReturnPolicy.auto_approval_enabled, True).is_(True),
+                Order.total_amount <= max_amount,
+                Order.created_date >= now - func.make_interval(0, 0, 0, max_age_days),
+                ~exists().where(
+                    and_(
+                        rejected.tenant_id == ReturnRequest.tenant_id,
+                        rejected.customer_id == ReturnRequest.customer_id,
+                        rejected.status == ReturnStatus.rejected,
+                    )
+                ),
+            )
+            .limit(batch_size)
+            .with_for_update(of=ReturnRequest, skip_locked=True)
+        )
+
+        approved = 0
+        while True:
+            rows = (
+                await self.session.execute(
+                    update(ReturnRequest)
+                    .where(ReturnRequest.id.in_(eligible.scalar_subquery()))
+                    .values(
+                        status=ReturnStatus.approved,
+                        resolution_notes=AUTO_APPROVAL_NOTE,
+                        modified_by=ReturnRequest.created_by,  # System actor
+                        modified_date=func.now(),
+                    )
+                    .returning(
+                        ReturnRequest.id, ReturnRequest.tenant_id, ReturnRequest.order_id, ReturnRequest.created_by
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            if rows:
+                await self.session.execute(
+                    insert(AuditLog),
+                    [
+                        {
+                            "id": uuid4(),
+                            "entity_type": "ReturnRequest",
+                            "entity_id": return_id,
+                            "tenant_id": tenant_id,
+                            "action": AuditAction.return_auto_approved.value,
+                            "actor_id": actor_id,
+                            "changes": json.dumps(
+                                {
+                                    "return_id": str(return_id),
+                                    "order_id": str(order_id),
+                                    "reason": "Automated approval based on rules",
+                                }
+                            ),
+                        }
+                        for return_id, tenant_id, order_id, actor_id in rows
+                    ],
+                )
+            await self.session.commit()
+            approved += len(rows)
+            if len(rows) < batch_size:
+                break
+
+        pending = await self.session.scalar(
+            select(func.count())
+            .select_from(ReturnRequest)
+            .where(ReturnRequest.status == ReturnStatus.pending, ReturnRequest.created_date >= created_after)
+        )
+        return {"approved": approved, "skipped": pending or 0}
+
+    async def verify_refunds(self, batch_size: int | None = None) -> RefundVerificationReport:
+        """Mark approved returns whose refund transaction has settled as Refunded.
+
+        Approved returns with a refund transaction are paged by id (keyset), and
+        each page is settled by one UPDATE joined to ``payment_transactions``.
+        ``PaymentService.refund_payment`` records the gateway's refund result
+        there in the same request that issues the refund, so no gateway lookups
+        are needed here. Returns locked by a staff action are skipped until the
+        next run; each batch commits on its own.
+        """
+        batch_size = batch_size or settings.return_refund_verification_batch_size
+        settled = (PaymentStatus.refunded, PaymentStatus.partially_refunded)
+        report = RefundVerificationReport()
+        started = time.monotonic()
+        cursor: UUID | None = None
+
+        while True:
+            batch_started = time.monotonic()
+            page_query = (
+                select(ReturnRequest.id)
+                .where(
+                    ReturnRequest.status == ReturnStatus.approved,
+                    ReturnRequest.refund_transaction_id.is_not(None),
+                )
+                .order_by(ReturnRequest.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            if cursor is not None:
+                page_query = page_query.where(ReturnRequest.id > cursor)
+            page = list(await self.session.scalars(page_query))
+            if not page:
+                await self.session.rollback()
+                break
+            cursor = page[-1]
+
+            verified = (
+                await self.session.execute(
+                    update(ReturnRequest)
+                    .where(
+                        ReturnRequest.id.in_(page),
+                        PaymentTransaction.id == ReturnRequest.refund_transaction_id,
+                        PaymentTransaction.status.in_(settled),
+                    )
+                    .values(
+                        status=ReturnStatus.refunded,
+                        refund_amount=PaymentTransaction.refund_amount,
+                        refund_currency=PaymentTransaction.amount_currency,
+                        modified_date=func.now(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).rowcount
+            await self.session.commit()
+
+            report.batches += 1
+            report.checked += len(page)
+            report.verified += verified
+            report.pending += len(page) - verified
+            return_refund_verifications_total.inc(verified, outcome="verified")
+            return_refund_verifications_total.inc(len(page) - verified, outcome="pending")
+            return_refund_verification_batch_seconds.observe(time.monotonic() - batch_started)
+            logger.info(
+                "return_refund_verification_progress",
+                batch=report.batches,
+                checked=report.checked,
+                verified=report.verified,
+            )
+            if len(page) < batch_size:
+                break
+
+        report.duration_seconds = time.monotonic() - started
+        return_refund_verification_throughput.set(report.per_second)
+        return report
+
+    async def check_slas(self, now: datetime | None = None, batch_size: int | None = None) -> dict[str, int]:
+        """Notify returns that crossed an SLA warning or due date since they were last notified.
+
+        Each return gets at most one warning and one breach per SLA: a
+        notification row is written with the threshold it reports, and returns
+        already holding a row for their current threshold are not selected
+        again. A return found already past its due date only gets the breach.
+        """
+        now = now or datetime.now(timezone.utc)
+        batch_size = batch_size or settings.return_sla_batch_size
+        counts = {"reminders_sent": 0, "breaches_detected": 0}
+
+        for sla_type, waiting_status, warning_date, due_date in SLA_STAGES:
+            level = case((due_date <= now, "breach"), else_="warning")
+            crossed = (
+                select(
+                    ReturnRequest.id,
+                    ReturnRequest.tenant_id,
+                    ReturnRequest.order_id,
+                    ReturnRequest.created_date,
+                    level.label("level"),
+                )
+                .where(
+                    ReturnRequest.status == waiting_status,
+                    warning_date <= now,
+                    ~exists().where(
+                        ReturnSlaNotification.return_id == ReturnRequest.id,
+                        ReturnSlaNotification.sla_type == sla_type,
+                        ReturnSlaNotification.level == level,
+                    ),
+                )
+                .limit(batch_size)
+            )
+            while True:
+                rows = (await self.session.execute(crossed)).all()
+                if not rows:
+                    break
+                # A concurrent run may have notified some of these; only rows this run inserts are reported
+                inserted = set(
+                    await self.session.scalars(
+                        pg_insert(ReturnSlaNotification)
+                        .values(
+                            [
+                                {
+                                    "id": uuid4(),
+                                    "tenant_id": row.tenant_id,
+                                    "return_id": row.id,
+                                    "sla_type": sla_type,
+                                    "level": row.level,
+                                }
+                                for row in rows
+                            ]
+                        )
+                        .on_conflict_do_nothing(constraint="uq_return_sla_notifications_return_type_level")
+                        .returning(ReturnSlaNotification.return_id)
+                    )
+                )
+                await self.session.commit()
+                for row in rows:
+                    if row.id in inserted:
+                        self._notify_sla(row, sla_type, (now - row.created_date).total_seconds() / 3600)
+                        counts["breaches_detected" if row.level == "breach" else "reminders_sent"] += 1
+                if len(rows) < batch_size:
+                    break
+
+        return counts
+
+    @staticmethod
+    def _notify_sla(row: Any, sla_type: str, elapsed_hours: float) -> None:
+        if row.level == "warning":
+            logger.warning(
+                "return_sla_reminder",
+                return_id=str(row.id),
+                sla_type=sla_type,
+                elapsed_hours=elapsed_hours,
+                tenant_id=str(row.tenant_id),
+            )
+            return
+        logger.error(
+            "return_sla_breach",
+            return_id=str(row.id),
+            sla_type=sla_type,
+            elapsed_hours=elapsed_hours,
+            tenant_id=str(row.tenant_id),
+        )
+        publish_return_sla_breach(
+            return_id=row.id,
+            tenant_id=row.tenant_id,
+            order_id=row.order_id,
+            sla_type=sla_type,
+            elapsed_hours=elapsed_hours,
+        )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Sequence
 from uuid import UUID
@@ -19,6 +20,7 @@ from app.db.models.return_request import ReturnRequest, ReturnStatus
 from app.db.models.user import User, UserRole
 from app.schemas.returns import ReturnCreate
 from app.services.payments import PaymentService
+from app.services.return_automation import ReturnAutomationService, sla_deadlines
 
 logger = structlog.get_logger(__name__)
 
@@ -62,6 +64,8 @@ class ReturnService:
                 detail="Return request already exists for this order.",
             )
 
+        policy = await ReturnAutomationService(self.session).get_policy(tenant_id)
+        now = datetime.now(timezone.utc)
         return_request = ReturnRequest(
             tenant_id=tenant_id,
             order_id=order.id,
@@ -69,7 +73,9 @@ class ReturnService:
             reason=payload.reason,
             status=ReturnStatus.pending,
             created_by=actor_id,
+            created_date=now,
             modified_by=actor_id,
+            **sla_deadlines(now, policy),
         )
         self.session.add(return_request)
         await self.session.commit()
@@ -9,6 +9,8 @@ from fastapi import HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_service
+from app.core.http_cache import SHIPPING_METHODS
 from app.db.models.shipping_method import ShippingMethod
 from app.schemas.shipping_method import ShippingMethodCreate, ShippingMethodUpdate
 
@@ -77,6 +79,7 @@ class ShippingMethodService:
         self.session.add(shipping_method)
         await self.session.commit()
         await self.session.refresh(shipping_method)
+        await cache_service.invalidate_catalog(SHIPPING_METHODS, str(tenant_id))
         return shipping_method
 
     async def update_shipping_method(
@@ -113,5 +116,6 @@ class ShippingMethodService:
 
         await self.session.commit()
         await self.session.refresh(shipping_method)
+        await cache_service.invalidate_catalog(SHIPPING_METHODS, str(tenant_id))
         return shipping_method
 
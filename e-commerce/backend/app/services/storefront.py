@@ -0,0 +1,142 @@
+"""Versioned per-tenant storefront configuration bundle."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.core.http_cache import CATEGORIES, PAYMENT_METHODS, SHIPPING_METHODS
+from app.core.serialization import dumps
+from app.db.models.payment_method import PaymentMethod
+from app.db.models.shipping_method import ShippingMethod
+from app.schemas.shared import Money
+from app.schemas.storefront import StorefrontConfig, StorefrontPaymentMethod, StorefrontShippingMethod
+from app.services.category_tree import category_tree_cache, serialize_tree
+
+settings = get_settings()
+
+BUNDLE_NAMESPACES = (CATEGORIES, PAYMENT_METHODS, SHIPPING_METHODS)
+# Bump when the bundle's shape changes so Redis copies written by older code are not served
+BUNDLE_SCHEMA_VERSION = 1
+
+
+@dataclass(slots=True)
+class StorefrontBundle:
+    """Encoded bundle and the version it was built for (``None`` when uncached)."""
+
+    version: str | None
+    body: bytes
+    built_at: float = field(default_factory=time.monotonic)
+
+
+def bundle_version(generations: list[int]) -> str:
+    seed = ":".join([str(BUNDLE_SCHEMA_VERSION), *(str(generation) for generation in generations)])
+    return hashlib.sha256(seed.encode()).hexdigest()[:16]
+
+
+class StorefrontConfigCache:
+    """Active payment methods, shipping methods and categories for checkout, in one payload.
+
+    The version is derived from the tenant's ``categories``, ``payment_methods``
+    and ``shipping_methods`` cache generations, so any master-data write yields
+    a new version. Bundles are kept per process and in Redis under their
+    version, and are built (three queries) only when neither holds the current
+    one. Without Redis the process-local bundle is reused until
+    ``storefront_config_ttl`` expires, then rebuilt unversioned.
+    """
+
+    def __init__(self) -> None:
+        self._bundles: dict[UUID, StorefrontBundle] = {}
+
+    async def get(self, session: AsyncSession, tenant_id: UUID) -> StorefrontBundle:
+        generations = [await cache_service.get_generation(namespace, str(tenant_id)) for namespace in BUNDLE_NAMESPACES]
+        version = None if any(generation is None for generation in generations) else bundle_version(generations)
+        bundle = self._bundles.get(tenant_id)
+        if (
+            bundle is not None
+            and (version is None or bundle.version == version)
+            and time.monotonic() - bundle.built_at < settings.storefront_config_ttl
+        ):
+            return bundle
+
+        if version is None:
+            bundle = StorefrontBundle(version=None, body=dumps(await self._build(session, tenant_id, None)))
+            self._bundles[tenant_id] = bundle
+            return bundle
+
+        key = f"storefront_config:{tenant_id}:{version}"
+        payload = await cache_service.get(key)
+        if payload is None:
+            payload = await self._build(session, tenant_id, version)
+            await cache_service.set(key, payload, ttl=settings.storefront_config_ttl)
+        bundle = StorefrontBundle(version=version, body=dumps(payload))
+        self._bundles[tenant_id] = bundle
+        return bundle
+
+    async def _build(self, session: AsyncSession, tenant_id: UUID, version: str | None) -> dict:
+        payment_methods = (
+            await session.execute(
+                select(PaymentMethod)
+                .where(PaymentMethod.tenant_id == tenant_id, PaymentMethod.is_active.is_(True))
+                .order_by(PaymentMethod.name)
+            )
+        ).scalars()
+        shipping_methods = (
+            await session.execute(
+                select(ShippingMethod)
+                .where(ShippingMethod.tenant_id == tenant_id, ShippingMethod.is_active.is_(True))
+                .order_by(ShippingMethod.name)
+            )
+        ).scalars()
+        tree = await category_tree_cache.get(session, tenant_id)
+
+        config = StorefrontConfig(
+            version=version,
+            paymentMethods=[
+                StorefrontPaymentMethod(
+                    id=method.id,
+                    name=method.name,
+                    type=method.type,
+                    description=method.description,
+                    requiresProcessing=method.requires_processing,
+                    processingFeePercentage=method.processing_fee_percentage,
+                    processingFeeFixed=method.processing_fee_fixed,
+                )
+                for method in payment_methods
+            ],
+            shippingMethods=[
+                StorefrontShippingMethod(
+                    id=method.id,
+                    name=method.name,
+                    description=method.description,
+                    estimatedDaysMin=method.estimated_days_min,
+                    estimatedDaysMax=method.estimated_days_max,
+                    baseCost=Money(currency=method.base_cost_currency, amount=float(method.base_cost_amount)),
+                    costPerKg=Money(currency=method.cost_per_kg_currency, amount=float(method.cost_per_kg_amount))
+                    if method.cost_per_kg_currency and method.cost_per_kg_amount
+                    else None,
+                    requiresSignature=method.requires_signature,
+                    isExpress=method.is_express,
+                )
+                for method in shipping_methods
+            ],
+            categories=serialize_tree(tree.roots, is_active=True),
+        )
+        return config.model_dump(mode="json", by_alias=True)
+
+    def invalidate(self, tenant_id: UUID | None = None) -> None:
+        """Drop this process's bundle for a tenant (all when ``None``)."""
+        if tenant_id is None:
+            self._bundles.clear()
+        else:
+            self._bundles.pop(tenant_id, None)
+
+
+storefront_config_cache = StorefrontConfigCache()
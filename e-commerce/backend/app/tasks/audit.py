@@ -0,0 +1,38 @@
+"""Audit log maintenance tasks for Celery."""
+
+from __future__ import annotations
+
+import structlog
+from celery import Task
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.services.audit_partitions import AuditPartitionService
+from app.tasks import runtime
+
+logger = structlog.get_logger(__name__)
+
+
+def get_db_session() -> AsyncSession:
+    """Get a session on the worker process's engine."""
+    return runtime.session_factory()()
+
+
+@celery_app.task(bind=True, name="audit.maintain_partitions", queue="audit.maintenance")
+def maintain_audit_partitions_task(self: Task) -> dict:
+    """Create upcoming monthly audit_logs partitions and archive those past retention."""
+    async def _process() -> dict:
+        session = get_db_session()
+        try:
+            report = await AuditPartitionService(session).run()
+        except Exception as e:
+            await session.rollback()
+            logger.error("audit_partition_maintenance_error", error=str(e))
+            raise
+        finally:
+            await session.close()
+        return report.as_dict()
+
+    result = runtime.run(_process())
+    logger.info("audit_partition_maintenance_completed", **result)
+    return result
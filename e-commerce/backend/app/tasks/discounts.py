@@ -0,0 +1,34 @@
+"""Discount tasks for Celery."""
+
+from __future__ import annotations
+
+import structlog
+from celery import Task
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.services.discounts import DiscountService
+from app.tasks import runtime
+
+logger = structlog.get_logger(__name__)
+
+
+def get_db_session() -> AsyncSession:
+    """Get a session on the worker process's engine."""
+    return runtime.session_factory()()
+
+
+@celery_app.task(bind=True, name="discounts.expire", queue="discounts.expiry")
+def expire_discounts_task(self: Task) -> dict[str, int]:
+    """Mark discounts past their validity window as Expired, in batches across all tenants."""
+    async def _process() -> dict[str, int]:
+        session = get_db_session()
+        try:
+            expired = await DiscountService(session).expire_lapsed()
+        finally:
+            await session.close()
+        return {"expired": sum(expired.values()), "tenants": len(expired)}
+
+    result = runtime.run(_process())
+    logger.info("discount_expiry_task_completed", **result)
+    return result
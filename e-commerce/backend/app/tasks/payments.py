@@ -0,0 +1,60 @@
+"""Payment tasks for Celery."""
+
+from __future__ import annotations
+
+import structlog
+from celery import Task
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.core.config import get_settings
+from app.services.payment_reconciliation import PaymentReconciliationService
+from app.services.payment_webhooks import PaymentWebhookService
+from app.tasks import runtime
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+# Upper bound on batches per run so one task cannot monopolise a worker
+MAX_WEBHOOK_BATCHES = 20
+
+
+def get_db_session() -> AsyncSession:
+    """Get a session on the worker process's engine."""
+    return runtime.session_factory()()
+
+
+@celery_app.task(bind=True, name="payments.process_webhooks", queue="payments.webhooks")
+def process_payment_webhooks_task(self: Task) -> dict[str, int]:
+    """Drain the webhook inbox in batches and apply the events to transactions."""
+    async def _process() -> dict[str, int]:
+        totals = {"claimed": 0, "applied": 0, "ignored": 0, "deferred": 0}
+        session = get_db_session()
+        try:
+            service = PaymentWebhookService(session)
+            for _ in range(MAX_WEBHOOK_BATCHES):
+                counts = await service.process_pending(settings.payment_webhook_batch_size)
+                for key, value in counts.items():
+                    totals[key] += value
+                # Stop on a short batch, or when only deferred events remain
+                if counts["claimed"] < settings.payment_webhook_batch_size or counts["deferred"] == counts["claimed"]:
+                    break
+        finally:
+            await session.close()
+        return totals
+
+    result = runtime.run(_process())
+    logger.info("payment_webhooks_task_completed", **result)
+    return result
+
+
+@celery_app.task(bind=True, name="payments.reconcile", queue="payments.reconcile")
+def reconcile_payments_task(self: Task) -> dict:
+    """Re-sync stale Pending/Processing transactions with their providers and report the outcome."""
+    async def _process() -> dict:
+        report = await PaymentReconciliationService(runtime.session_factory()).reconcile()
+        return report.as_dict()
+
+    result = runtime.run(_process())
+    logger.info("payment_reconciliation_report", **result)
+    return result
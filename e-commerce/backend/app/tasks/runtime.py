@@ -0,0 +1,81 @@
+"""Per-process async runtime for Celery workers.
+
+Each worker process keeps one event loop and one database engine for its whole
+life instead of building (and tearing down) both inside every task with
+``asyncio.run``. Pooled connections, and loop-bound clients such as the Redis
+pool, are therefore reused across tasks. ``start`` runs at
+``worker_process_init`` and ``shutdown`` at ``worker_process_shutdown``; code
+paths without those signals (eager tasks, the solo pool, scripts) start the
+runtime lazily on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import metrics, query_counter
+from app.core.config import get_settings
+from app.db.utils import ensure_async_database_url
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def start() -> None:
+    """Create this process's event loop, engine and session factory (idempotent)."""
+    global _loop, _engine, _session_factory
+    if _loop is not None and not _loop.is_closed():
+        return
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    # Forked workers must not share the parent's pooled connections, so each builds its own engine
+    _engine = create_async_engine(ensure_async_database_url(settings.database_url), pool_pre_ping=True)
+    metrics.instrument_engine(_engine.sync_engine)
+    if settings.query_debug:
+        query_counter.instrument_engine(_engine.sync_engine)
+    _session_factory = async_sessionmaker(_engine, expire_on_commit=False, class_=AsyncSession)
+    logger.info("task_runtime_started")
+
+
+def shutdown() -> None:
+    """Flush buffered audit entries, dispose of the engine and close the loop."""
+    global _loop, _engine, _session_factory
+    from app.services.audit import audit_buffer
+
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(audit_buffer.close())
+        if _engine is not None:
+            _loop.run_until_complete(_engine.dispose())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+        asyncio.set_event_loop(None)
+        _loop, _engine, _session_factory = None, None, None
+        logger.info("task_runtime_stopped")
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` to completion on the process's loop."""
+    start()
+    assert _loop is not None
+    return _loop.run_until_complete(coro)
+
+
+def session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the process's engine."""
+    start()
+    assert _session_factory is not None
+    return _session_factory
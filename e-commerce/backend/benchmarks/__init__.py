@@ -0,0 +1,4 @@
+"""Load-testing and benchmark harness for the e-commerce API.
+
+Run ``python -m benchmarks --help`` from the backend directory.
+"""
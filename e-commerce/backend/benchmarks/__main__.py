@@ -0,0 +1,158 @@
+"""Seed a synthetic dataset, run the workloads and write a JSON report.
+
+Examples::
+
+    # Against a running server (local Postgres/Redis containers)
+    python -m benchmarks --base-url http://localhost:8000 --tenants 5 --products 2000
+
+    # In-process via ASGI transport, no server required
+    python -m benchmarks --in-process --workloads browse,search --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Allow ``python benchmarks/__main__.py`` as well as ``python -m benchmarks``
+_backend_dir = Path(__file__).resolve().parent.parent
+if str(_backend_dir) not in sys.path:
+    sys.path.insert(0, str(_backend_dir))
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.db.utils import ensure_async_database_url
+from benchmarks.dataset import BenchmarkScale, seed_dataset
+from benchmarks.workloads import WORKLOADS, login_admins, run_workload
+
+DEFAULT_WORKLOADS = "browse,product_detail,search,checkout,dashboard"
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=_backend_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Drive app.main:app through httpx.ASGITransport instead of a network server",
+    )
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--products", type=int, default=500, help="Products per tenant")
+    parser.add_argument("--customers", type=int, default=50, help="Customers per tenant")
+    parser.add_argument("--orders", type=int, default=1000, help="Historical orders per tenant")
+    parser.add_argument("--workloads", default=DEFAULT_WORKLOADS, help="Comma-separated workload names")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users per workload")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per workload")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unrecorded seconds before measuring")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON report path")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.workloads.split(",")) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Unknown workloads: {', '.join(sorted(unknown))}. Available: {', '.join(WORKLOADS)}")
+    return args
+
+
+async def run(args: argparse.Namespace) -> dict:
+    settings = get_settings()
+    scale = BenchmarkScale(
+        tenants=args.tenants,
+        products_per_tenant=args.products,
+        customers_per_tenant=args.customers,
+        orders_per_tenant=args.orders,
+    )
+
+    engine = create_async_engine(ensure_async_database_url(settings.database_url))
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+            print(f"🌱 Seeding {scale.tenants} tenants x {scale.products_per_tenant} products...")
+            tenants = await seed_dataset(session, scale, seed=args.seed)
+    finally:
+        await engine.dispose()
+
+    if args.in_process:
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+    else:
+        transport = None
+        base_url = args.base_url
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: dict[str, dict] = {}
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=30.0
+    ) as client:
+        sessions = await login_admins(client, tenants)
+        for index, name in enumerate(args.workloads.split(",")):
+            print(f"🚀 {name}: {args.concurrency} users for {args.duration:g}s")
+            result = await run_workload(
+                client,
+                name,
+                sessions,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                seed=args.seed + index,
+            )
+            results[name] = result.summary()
+            summary = results[name]
+            print(
+                f"   rps={summary['rps']} p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms "
+                f"p99={summary['p99_ms']}ms errors={summary['errors']}"
+            )
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "target": "in-process" if args.in_process else args.base_url,
+        "scale": {
+            "tenants": scale.tenants,
+            "products_per_tenant": scale.products_per_tenant,
+            "customers_per_tenant": scale.customers_per_tenant,
+            "orders_per_tenant": scale.orders_per_tenant,
+        },
+        "settings": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+        },
+        "workloads": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"📄 Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
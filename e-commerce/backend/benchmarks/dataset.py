@@ -0,0 +1,292 @@
+"""Synthetic multi-tenant dataset for benchmark runs.
+
+Master data (categories, payment and shipping methods, image URLs) is shared with
+``scripts/seed_data.py`` so benchmarks exercise the same shapes as the demo tenant.
+Rows are written with multi-row INSERTs so large scales seed in seconds.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.category import Category, category_path
+from app.db.models.order import Order, OrderItem, OrderStatus
+from app.db.models.payment_method import PaymentMethod, PaymentMethodType
+from app.db.models.product import Product
+from app.db.models.shipping_method import ShippingMethod
+from app.db.models.tenant import Tenant, TenantStatus
+from app.db.models.user import AuthProvider, User, UserRole, UserStatus
+from app.services.auth import get_password_hash
+from scripts.seed_data import CATEGORIES, PAYMENT_METHODS, SHIPPING_METHODS, get_image_url
+
+ADMIN_PASSWORD = "Admin123!@#"
+CUSTOMER_PASSWORD = "Customer123!@#"
+
+PRODUCT_ADJECTIVES = ["Classic", "Royal", "Floral", "Twisted", "Antique", "Minimal", "Temple", "Vintage"]
+PRODUCT_MATERIALS = ["Gold", "Silver", "Platinum", "Rose Gold", "Diamond", "Pearl"]
+PRODUCT_NOUNS = {
+    "rings": "Ring",
+    "necklaces": "Necklace",
+    "earrings": "Earrings",
+    "bracelets": "Bracelet",
+    "bangles": "Bangle",
+    "pendants": "Pendant",
+    "mangalsutra": "Mangalsutra",
+}
+
+_BATCH_SIZE = 1000
+
+
+@dataclass(slots=True)
+class BenchmarkScale:
+    """Number of rows seeded per tenant."""
+
+    tenants: int = 3
+    products_per_tenant: int = 500
+    customers_per_tenant: int = 50
+    orders_per_tenant: int = 1000
+    history_days: int = 90
+
+
+@dataclass(slots=True)
+class SeededProduct:
+    id: UUID
+    price: float
+
+
+@dataclass(slots=True)
+class SeededTenant:
+    """Identifiers the workloads need to issue realistic requests."""
+
+    id: UUID
+    slug: str
+    admin_username: str
+    cod_payment_method_id: UUID
+    customer_ids: list[UUID] = field(default_factory=list)
+    products: list[SeededProduct] = field(default_factory=list)
+    search_terms: list[str] = field(default_factory=list)
+
+
+async def _insert_rows(session: AsyncSession, model: type, rows: list[dict]) -> None:
+    for start in range(0, len(rows), _BATCH_SIZE):
+        await session.execute(insert(model), rows[start : start + _BATCH_SIZE])
+
+
+async def seed_dataset(
+    session: AsyncSession, scale: BenchmarkScale, seed: int = 42
+) -> list[SeededTenant]:
+    """Create ``scale.tenants`` independent tenants and return their fixtures.
+
+    Every run uses a fresh tag in slugs, SKUs and usernames so repeated runs never
+    collide with each other or with the demo tenant.
+    """
+    rng = random.Random(seed)
+    run_tag = uuid4().hex[:8]
+    actor_id = uuid4()
+    now = datetime.now(timezone.utc)
+    # bcrypt is deliberately slow; hash once and share across synthetic users.
+    admin_hash = get_password_hash(ADMIN_PASSWORD)
+    customer_hash = get_password_hash(CUSTOMER_PASSWORD)
+    audit = {"created_by": actor_id, "modified_by": actor_id}
+
+    tenants: list[SeededTenant] = []
+    for index in range(scale.tenants):
+        tenant_id = uuid4()
+        slug = f"bench-{run_tag}-{index:03d}"
+        await _insert_rows(
+            session,
+            Tenant,
+            [
+                {
+                    "id": tenant_id,
+                    "name": f"Benchmark {run_tag} {index:03d}",
+                    "slug": slug,
+                    "status": TenantStatus.active,
+                    "primary_contact": f"ops@{slug}.example.com",
+                    **audit,
+                }
+            ],
+        )
+
+        admin_username = f"{slug}-admin"
+        user_rows = [
+            {
+                "id": uuid4(),
+                "email": f"{admin_username}@example.com",
+                "username": admin_username,
+                "hashed_password": admin_hash,
+                "full_name": f"{slug} Admin",
+                "role": UserRole.tenant_admin,
+                "status": UserStatus.active,
+                "auth_provider": AuthProvider.local,
+                "tenant_id": tenant_id,
+                "mfa_enabled": False,
+                **audit,
+            }
+        ]
+        customer_ids = [uuid4() for _ in range(scale.customers_per_tenant)]
+        user_rows.extend(
+            {
+                "id": customer_id,
+                "email": f"{slug}-customer-{n}@example.com",
+                "username": f"{slug}-customer-{n}",
+                "hashed_password": customer_hash,
+                "full_name": f"Customer {n}",
+                "role": UserRole.customer,
+                "status": UserStatus.active,
+                "auth_provider": AuthProvider.local,
+                "tenant_id": tenant_id,
+                "mfa_enabled": False,
+                **audit,
+            }
+            for n, customer_id in enumerate(customer_ids)
+        )
+        await _insert_rows(session, User, user_rows)
+
+        category_ids = {data["slug"]: uuid4() for data in CATEGORIES}
+        await _insert_rows(
+            session,
+            Category,
+            [
+                {
+                    "id": category_ids[data["slug"]],
+                    "tenant_id": tenant_id,
+                    "name": data["name"],
+                    "slug": f"{slug}-{data['slug']}",
+                    "description": data["description"],
+                    "path": category_path(category_ids[data["slug"]]),
+                    "is_active": True,
+                    **audit,
+                }
+                for data in CATEGORIES
+            ],
+        )
+
+        payment_method_ids = {data["type"]: uuid4() for data in PAYMENT_METHODS}
+        await _insert_rows(
+            session,
+            PaymentMethod,
+            [
+                {
+                    "id": payment_method_ids[data["type"]],
+                    "tenant_id": tenant_id,
+                    "name": data["name"],
+                    "type": data["type"],
+                    "description": data.get("description"),
+                    "is_active": True,
+                    "requires_processing": data.get("requires_processing", False),
+                    "processing_fee_percentage": data.get("processing_fee_percentage"),
+                    **audit,
+                }
+                for data in PAYMENT_METHODS
+            ],
+        )
+        await _insert_rows(
+            session,
+            ShippingMethod,
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "name": data["name"],
+                    "description": data.get("description"),
+                    "base_cost_currency": "INR",
+                    "base_cost_amount": data["base_cost"],
+                    "is_active": True,
+                    "is_express": data.get("is_express", False),
+                    "requires_signature": data.get("requires_signature", False),
+                    **audit,
+                }
+                for data in SHIPPING_METHODS
+            ],
+        )
+
+        products: list[SeededProduct] = []
+        product_rows = []
+        for n in range(scale.products_per_tenant):
+            category_slug = rng.choice(list(category_ids))
+            name = " ".join(
+                (rng.choice(PRODUCT_ADJECTIVES), rng.choice(PRODUCT_MATERIALS), PRODUCT_NOUNS[category_slug])
+            )
+            price = Decimal(rng.randrange(500, 250_000)) / 100
+            product_id = uuid4()
+            product_rows.append(
+                {
+                    "id": product_id,
+                    "tenant_id": tenant_id,
+                    "name": name,
+                    "sku": f"{slug}-{n:06d}",
+                    "description": f"{name} from the {category_slug} collection.",
+                    "price_currency": "INR",
+                    "price_amount": price,
+                    # Large stock so checkout workloads never run out mid-benchmark
+                    "inventory": 1_000_000,
+                    "image_url": get_image_url(category_slug, n),
+                    "category_id": category_ids[category_slug],
+                    **audit,
+                }
+            )
+            products.append(SeededProduct(id=product_id, price=float(price)))
+        await _insert_rows(session, Product, product_rows)
+
+        order_rows = []
+        item_rows = []
+        statuses = [OrderStatus.confirmed, OrderStatus.confirmed, OrderStatus.pending_payment, OrderStatus.cancelled]
+        for _ in range(scale.orders_per_tenant):
+            order_id = uuid4()
+            created = now - timedelta(seconds=rng.randrange(scale.history_days * 86_400))
+            lines = rng.sample(products, k=min(len(products), rng.randint(1, 4)))
+            total = Decimal("0.00")
+            for product in lines:
+                quantity = rng.randint(1, 3)
+                total += Decimal(str(product.price)) * quantity
+                item_rows.append(
+                    {
+                        "tenant_id": tenant_id,
+                        "order_id": order_id,
+                        "product_id": product.id,
+                        "quantity": quantity,
+                        "unit_price_currency": "INR",
+                        "unit_price_amount": Decimal(str(product.price)),
+                        "created_date": created,
+                        "modified_date": created,
+                        **audit,
+                    }
+                )
+            order_rows.append(
+                {
+                    "id": order_id,
+                    "tenant_id": tenant_id,
+                    "customer_id": rng.choice(customer_ids) if customer_ids else actor_id,
+                    "payment_method_id": payment_method_ids[PaymentMethodType.cash_on_delivery],
+                    "status": rng.choice(statuses),
+                    "total_currency": "INR",
+                    "total_amount": total,
+                    "created_date": created,
+                    "modified_date": created,
+                    **audit,
+                }
+            )
+        await _insert_rows(session, Order, order_rows)
+        await _insert_rows(session, OrderItem, item_rows)
+
+        tenants.append(
+            SeededTenant(
+                id=tenant_id,
+                slug=slug,
+                admin_username=admin_username,
+                cod_payment_method_id=payment_method_ids[PaymentMethodType.cash_on_delivery],
+                customer_ids=customer_ids,
+                products=products,
+                search_terms=[*PRODUCT_MATERIALS, *PRODUCT_ADJECTIVES],
+            )
+        )
+
+    await session.commit()
+    return tenants
@@ -0,0 +1,176 @@
+"""Check that the SQL issued by the test suite is served by indexes.
+
+Statement shapes are recorded by the ``query_shapes`` pytest plugin, then each
+read or write statement is planned with ``EXPLAIN`` against a migrated (and
+optionally seeded) database. Plans are generic, as for prepared statements
+reused across tenants, and built with ``enable_seqscan`` off. A sequential scan
+that survives that has no usable index, so a sequential scan on any hot table
+fails the audit. Examples::
+
+    pytest --record-query-shapes=query-shapes.jsonl
+    python -m benchmarks.query_plans query-shapes.jsonl --seed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+# Allow ``python benchmarks/query_plans.py`` as well as ``python -m benchmarks.query_plans``
+_backend_dir = Path(__file__).resolve().parent.parent
+if str(_backend_dir) not in sys.path:
+    sys.path.insert(0, str(_backend_dir))
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.core.serialization import loads
+from app.db.utils import ensure_async_database_url
+from benchmarks.dataset import BenchmarkScale, seed_dataset
+
+HOT_TABLES = frozenset(
+    {"categories", "order_items", "orders", "payment_transactions", "products", "return_requests"}
+)
+PREPARED = "query_plan_audit"
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+_FILTERED = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class CapturedStatement:
+    """One statement shape and the tests that issued it."""
+
+    statement: str
+    tests: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PlanFinding:
+    statement: str
+    tables: list[str]
+    tests: list[str]
+
+
+@dataclass(slots=True)
+class PlanAuditReport:
+    checked: int = 0
+    findings: list[PlanFinding] = field(default_factory=list)
+    errors: list[tuple[str, str]] = field(default_factory=list)  # (statement, error)
+
+    @property
+    def ok(self) -> bool:
+        return not self.findings
+
+
+def load_statements(path: str | Path) -> list[CapturedStatement]:
+    """Read a shapes file written by ``pytest --record-query-shapes``."""
+    statements = []
+    for line in Path(path).read_text().splitlines():
+        if line.strip():
+            record = loads(line)
+            statements.append(CapturedStatement(statement=record["statement"], tests=record["tests"]))
+    return statements
+
+
+def sequential_scans(plan: dict[str, Any], tables: frozenset[str] = HOT_TABLES) -> list[str]:
+    """Hot tables read by a ``Seq Scan`` node anywhere in ``plan``."""
+    found = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in tables:
+            found.append(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return sorted(set(found))
+
+
+async def _explain(driver: Any, statement: str) -> dict[str, Any]:
+    # The simple query protocol leaves $n placeholders to PREPARE instead of binding them to EXPLAIN
+    await driver.execute(f"PREPARE {PREPARED} AS {statement}")
+    try:
+        count = await driver.fetchval(
+            "SELECT cardinality(parameter_types) FROM pg_prepared_statements WHERE name = $1", PREPARED
+        )
+        execute = f"EXECUTE {PREPARED}({', '.join(['NULL'] * count)})" if count else f"EXECUTE {PREPARED}"
+        plan = await driver.fetchval(f"EXPLAIN (FORMAT JSON) {execute}")
+    finally:
+        await driver.execute(f"DEALLOCATE {PREPARED}")
+    # SQLAlchemy registers a json codec on its asyncpg connections; a bare driver returns text
+    if isinstance(plan, str):
+        plan = loads(plan)
+    return plan[0]["Plan"]
+
+
+async def audit_statements(
+    connection: AsyncConnection,
+    statements: Iterable[CapturedStatement],
+    tables: frozenset[str] = HOT_TABLES,
+) -> PlanAuditReport:
+    """Plan every explainable statement and report sequential scans of ``tables``."""
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    report = PlanAuditReport()
+    await driver.execute("SET plan_cache_mode = force_generic_plan; SET enable_seqscan = off")
+    try:
+        for captured in statements:
+            # Reads without a WHERE clause (test assertions, exports) scan the table by design
+            if not _EXPLAINABLE.match(captured.statement) or not _FILTERED.search(captured.statement):
+                continue
+            try:
+                plan = await _explain(driver, captured.statement)
+            except Exception as e:  # Statements on tables this database lacks, untyped parameters
+                report.errors.append((captured.statement, str(e)))
+                continue
+            report.checked += 1
+            scanned = sequential_scans(plan, tables)
+            if scanned:
+                report.findings.append(PlanFinding(statement=captured.statement, tables=scanned, tests=captured.tests))
+    finally:
+        await driver.execute("RESET plan_cache_mode; RESET enable_seqscan")
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.query_plans", description=__doc__.splitlines()[0])
+    parser.add_argument("shapes", help="File written by pytest --record-query-shapes")
+    parser.add_argument("--seed", action="store_true", help="Seed a small benchmark dataset and ANALYZE first")
+    parser.add_argument("--tables", default=",".join(sorted(HOT_TABLES)), help="Comma-separated hot tables")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> PlanAuditReport:
+    settings = get_settings()
+    engine = create_async_engine(ensure_async_database_url(settings.database_url))
+    try:
+        if args.seed:
+            async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+                await seed_dataset(session, BenchmarkScale(tenants=2, products_per_tenant=200, orders_per_tenant=200))
+            async with engine.begin() as connection:
+                await connection.exec_driver_sql("ANALYZE")
+        async with engine.connect() as connection:
+            return await audit_statements(
+                connection, load_statements(args.shapes), frozenset(args.tables.split(","))
+            )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    for statement, error in report.errors:
+        print(f"⚠️  not planned: {error.splitlines()[0]}\n   {statement[:200]}")
+    for finding in report.findings:
+        print(f"❌ seq scan on {', '.join(finding.tables)} ({', '.join(finding.tests[:3])})\n   {finding.statement[:500]}")
+    print(f"📄 {report.checked} statements planned, {len(report.findings)} with sequential scans")
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Concurrent HTTP workloads and latency statistics."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.dataset import ADMIN_PASSWORD, SeededTenant
+
+
+@dataclass(slots=True)
+class TenantSession:
+    """A seeded tenant plus the admin bearer token obtained at warm-up."""
+
+    tenant: SeededTenant
+    admin_token: str | None = None
+
+
+Workload = Callable[[httpx.AsyncClient, TenantSession, random.Random], Awaitable[httpx.Response]]
+
+
+async def browse(client: httpx.AsyncClient, ctx: TenantSession, rng: random.Random) -> httpx.Response:
+    """Paginated catalog listing, the storefront landing request."""
+    page = rng.randint(1, max(1, len(ctx.tenant.products) // 20))
+    return await client.get(
+        "/api/v1/products",
+        params={"page": page, "pageSize": 20},
+        headers={"X-Tenant-ID": str(ctx.tenant.id)},
+    )
+
+
+async def product_detail(client: httpx.AsyncClient, ctx: TenantSession, rng: random.Random) -> httpx.Response:
+    product = rng.choice(ctx.tenant.products)
+    return await client.get(
+        f"/api/v1/products/{product.id}", headers={"X-Tenant-ID": str(ctx.tenant.id)}
+    )
+
+
+async def search(client: httpx.AsyncClient, ctx: TenantSession, rng: random.Random) -> httpx.Response:
+    return await client.get(
+        "/api/v1/products",
+        params={"search": rng.choice(ctx.tenant.search_terms), "pageSize": 20},
+        headers={"X-Tenant-ID": str(ctx.tenant.id)},
+    )
+
+
+async def checkout(client: httpx.AsyncClient, ctx: TenantSession, rng: random.Random) -> httpx.Response:
+    """Cash-on-delivery checkout so no external payment gateway is involved."""
+    customer_id = rng.choice(ctx.tenant.customer_ids)
+    lines = rng.sample(ctx.tenant.products, k=min(len(ctx.tenant.products), rng.randint(1, 3)))
+    payload = {
+        "order": {
+            "customerId": str(customer_id),
+            "paymentMethodId": str(ctx.tenant.cod_payment_method_id),
+            "shippingAddress": "1 Benchmark Road",
+            "items": [
+                {
+                    "productId": str(product.id),
+                    "quantity": 1,
+                    "unitPrice": {"currency": "INR", "amount": product.price},
+                }
+                for product in lines
+            ],
+        }
+    }
+    return await client.post(
+        "/api/v1/orders/checkout",
+        json=payload,
+        headers={"X-Tenant-ID": str(ctx.tenant.id), "X-Actor-ID": str(customer_id)},
+    )
+
+
+async def dashboard(client: httpx.AsyncClient, ctx: TenantSession, rng: random.Random) -> httpx.Response:
+    return await client.get(
+        "/api/v1/reports/dashboard",
+        params={"period": rng.choice(["day", "week", "month"])},
+        headers={
+            "X-Tenant-ID": str(ctx.tenant.id),
+            "Authorization": f"Bearer {ctx.admin_token}",
+        },
+    )
+
+
+WORKLOADS: dict[str, Workload] = {
+    "browse": browse,
+    "product_detail": product_detail,
+    "search": search,
+    "checkout": checkout,
+    "dashboard": dashboard,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass(slots=True)
+class WorkloadResult:
+    name: str
+    concurrency: int
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "concurrency": self.concurrency,
+            "requests": requests,
+            "errors": self.errors,
+            "duration_s": round(self.elapsed, 3),
+            "rps": round(requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "mean_ms": round(sum(latencies) / requests * 1000, 2) if requests else 0.0,
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+        }
+
+
+async def login_admins(client: httpx.AsyncClient, tenants: list[SeededTenant]) -> list[TenantSession]:
+    """Obtain an admin token per tenant for authenticated workloads."""
+    sessions = []
+    for tenant in tenants:
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"username": tenant.admin_username, "password": ADMIN_PASSWORD},
+        )
+        response.raise_for_status()
+        sessions.append(TenantSession(tenant=tenant, admin_token=response.json()["access_token"]))
+    return sessions
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    name: str,
+    sessions: list[TenantSession],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    seed: int = 0,
+) -> WorkloadResult:
+    """Drive ``name`` from ``concurrency`` virtual users for ``duration`` seconds.
+
+    Requests issued during the warm-up window are sent but not recorded.
+    """
+    workload = WORKLOADS[name]
+    result = WorkloadResult(name=name, concurrency=concurrency)
+    start = time.perf_counter()
+    record_from = start + warmup
+    deadline = record_from + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(seed * 10_000 + index)
+        while True:
+            issued = time.perf_counter()
+            if issued >= deadline:
+                return
+            ctx = sessions[rng.randrange(len(sessions))]
+            try:
+                response = await workload(client, ctx, rng)
+                status_code = response.status_code
+            except httpx.HTTPError:
+                status_code = 0
+            finished = time.perf_counter()
+            if issued < record_from:
+                continue
+            result.latencies.append(finished - issued)
+            result.status_codes[status_code] = result.status_codes.get(status_code, 0) + 1
+            if status_code == 0 or status_code >= 400:
+                result.errors += 1
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - record_from
+    return result
@@ -18,6 +18,7 @@ if str(_app_dir) not in sys.path:
 
 import pandas as pd
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.core.config import get_settings
@@ -447,20 +448,6 @@ async def import_products_from_excel(excel_path: str) -> None:
         skipped_count = 0
         
         for prod_data in products_data:
-            # Check if product with same SKU already exists
-            result = await session.execute(
-                select(Product).where(
-                    Product.sku == prod_data["sku"],
-                    Product.tenant_id == tenant_id,
-                )
-            )
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                print(f"⚠️  Product with SKU {prod_data['sku']} already exists, skipping")
-                skipped_count += 1
-                continue
-            
             # Get category_id
             category_id = None
             if prod_data["category_slug"]:
@@ -468,8 +455,8 @@ async def import_products_from_excel(excel_path: str) -> None:
                 if category:
                     category_id = category.id
             
-            # Create product
-            product = Product(
+            # Create product; an SKU already present for the tenant is skipped by the unique constraint
+            values = dict(
                 tenant_id=tenant_id,
                 name=prod_data["name"],
                 sku=prod_data["sku"],
@@ -505,7 +492,16 @@ async def import_products_from_excel(excel_path: str) -> None:
                 created_by=tenant_admin_id,
                 modified_by=tenant_admin_id,
             )
-            session.add(product)
+            result = await session.execute(
+                pg_insert(Product)
+                .values(**values)
+                .on_conflict_do_nothing(constraint="uq_products_tenant_sku")
+                .returning(Product.id)
+            )
+            if result.scalar_one_or_none() is None:
+                print(f"⚠️  Product with SKU {prod_data['sku']} already exists, skipping")
+                skipped_count += 1
+                continue
             imported_count += 1
         
         await session.commit()
@@ -38,6 +38,32 @@ PRIMARY_TENANT_ADMIN_EMAIL = "admin@premiumjewelry.com"
 PRIMARY_TENANT_ADMIN_USERNAME = "premium_admin"
 SUPER_ADMIN_EMAIL = "admin@premiumcommerce.com"
 
+# Jewelry categories
+CATEGORIES = [
+    {"name": "Rings", "slug": "rings", "description": "Elegant rings for every occasion"},
+    {"name": "Necklaces", "slug": "necklaces", "description": "Beautiful necklaces and chains"},
+    {"name": "Earrings", "slug": "earrings", "description": "Stylish earrings and studs"},
+    {"name": "Bracelets", "slug": "bracelets", "description": "Charming bracelets and bangles"},
+    {"name": "Bangles", "slug": "bangles", "description": "Traditional and modern bangles"},
+    {"name": "Pendants", "slug": "pendants", "description": "Exquisite pendants and lockets"},
+    {"name": "Mangalsutra", "slug": "mangalsutra", "description": "Traditional mangalsutra designs"},
+]
+
+# Payment methods created for every seeded tenant
+PAYMENT_METHODS = [
+    {"name": "Credit Card", "type": PaymentMethodType.credit_card, "description": "Visa, Mastercard, Amex", "requires_processing": True, "processing_fee_percentage": Decimal("2.5")},
+    {"name": "PayPal", "type": PaymentMethodType.paypal, "description": "PayPal payment gateway", "requires_processing": True, "processing_fee_percentage": Decimal("3.0")},
+    {"name": "Bank Transfer", "type": PaymentMethodType.bank_transfer, "description": "Direct bank transfer", "requires_processing": False},
+    {"name": "Cash on Delivery", "type": PaymentMethodType.cash_on_delivery, "description": "Pay when you receive", "requires_processing": False},
+]
+
+# Shipping methods created for every seeded tenant
+SHIPPING_METHODS = [
+    {"name": "Standard Shipping", "description": "5-7 business days", "base_cost": Decimal("5.99"), "estimated_days": 5, "is_express": False},
+    {"name": "Express Shipping", "description": "2-3 business days", "base_cost": Decimal("12.99"), "estimated_days": 2, "is_express": True},
+    {"name": "Overnight Shipping", "description": "Next business day", "base_cost": Decimal("24.99"), "estimated_days": 1, "is_express": True, "requires_signature": True},
+]
+
 # Image URL mapping based on product category/type
 IMAGE_URLS_BY_CATEGORY = {
     "rings": [
@@ -298,18 +324,8 @@ async def seed_data() -> None:
         print("\n📦 Creating master data for tenant1...")
         
         # Categories - Jewelry Categories
-        categories_data = [
-            {"name": "Rings", "slug": "rings", "description": "Elegant rings for every occasion"},
-            {"name": "Necklaces", "slug": "necklaces", "description": "Beautiful necklaces and chains"},
-            {"name": "Earrings", "slug": "earrings", "description": "Stylish earrings and studs"},
-            {"name": "Bracelets", "slug": "bracelets", "description": "Charming bracelets and bangles"},
-            {"name": "Bangles", "slug": "bangles", "description": "Traditional and modern bangles"},
-            {"name": "Pendants", "slug": "pendants", "description": "Exquisite pendants and lockets"},
-            {"name": "Mangalsutra", "slug": "mangalsutra", "description": "Traditional mangalsutra designs"},
-        ]
-        
         created_categories = {}
-        for cat_data in categories_data:
+        for cat_data in CATEGORIES:
             # Check if category already exists
             result = await session.execute(
                 select(Category).where(Category.slug == cat_data["slug"], Category.tenant_id == tenant1_id)
@@ -896,15 +912,8 @@ async def seed_data() -> None:
         print("\n📦 Creating payment and shipping methods for tenant1...")
         
         # Payment Methods
-        payment_methods_data = [
-            {"name": "Credit Card", "type": PaymentMethodType.credit_card, "description": "Visa, Mastercard, Amex", "requires_processing": True, "processing_fee_percentage": Decimal("2.5")},
-            {"name": "PayPal", "type": PaymentMethodType.paypal, "description": "PayPal payment gateway", "requires_processing": True, "processing_fee_percentage": Decimal("3.0")},
-            {"name": "Bank Transfer", "type": PaymentMethodType.bank_transfer, "description": "Direct bank transfer", "requires_processing": False},
-            {"name": "Cash on Delivery", "type": PaymentMethodType.cash_on_delivery, "description": "Pay when you receive", "requires_processing": False},
-        ]
-        
         created_payment_methods = []
-        for pm_data in payment_methods_data:
+        for pm_data in PAYMENT_METHODS:
             # Check if payment method already exists
             result = await session.execute(
                 select(PaymentMethod).where(PaymentMethod.name == pm_data["name"], PaymentMethod.tenant_id == tenant1_id)
@@ -931,14 +940,8 @@ async def seed_data() -> None:
         print(f"✅ Created/Found {len(created_payment_methods)} payment methods")
         
         # Shipping Methods
-        shipping_methods_data = [
-            {"name": "Standard Shipping", "description": "5-7 business days", "base_cost": Decimal("5.99"), "estimated_days": 5, "is_express": False},
-            {"name": "Express Shipping", "description": "2-3 business days", "base_cost": Decimal("12.99"), "estimated_days": 2, "is_express": True},
-            {"name": "Overnight Shipping", "description": "Next business day", "base_cost": Decimal("24.99"), "estimated_days": 1, "is_express": True, "requires_signature": True},
-        ]
-        
         created_shipping_methods = []
-        for sm_data in shipping_methods_data:
+        for sm_data in SHIPPING_METHODS:
             # Check if shipping method already exists
             result = await session.execute(
                 select(ShippingMethod).where(ShippingMethod.name == sm_data["name"], ShippingMethod.tenant_id == tenant1_id)
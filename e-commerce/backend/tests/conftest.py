@@ -9,8 +9,9 @@ from uuid import UUID, uuid4
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core import query_counter
 from app.core.config import get_settings
 from app.db.base import Base
 from app.db.models.tenant import Tenant, TenantStatus
@@ -36,6 +37,21 @@ TEST_DATABASE_URL = settings.database_url.replace("ecommerce_db", "test_db")
 # Create test engine
 test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 TestSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+query_counter.instrument_engine(test_engine.sync_engine)
+
+pytest_plugins = ["query_budget", "query_shapes"]
+
+
+@pytest.fixture
+def db_engine() -> AsyncEngine:
+    """The instrumented test engine, for tests that open their own connections."""
+    return test_engine
+
+
+@pytest.fixture
+def session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the test engine, for code that opens its own sessions."""
+    return TestSessionLocal
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -0,0 +1,41 @@
+"""Pytest plugin enforcing per-test SQL query budgets.
+
+Usage::
+
+    @pytest.mark.query_budget(4, max_repeats=1)
+    async def test_list_products(client, ...):
+        ...
+
+Only statements issued while the test body runs are counted; fixture setup
+(schema creation, seeding users and tenants) is excluded. When the body also
+logs in or seeds rows, budget just the request instead::
+
+    with query_budget(2, max_repeats=1):
+        response = await client.get("/api/v1/products", headers=headers)
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.query_counter import assert_query_budget, record_queries
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, max_repeats=None): fail when the test body issues more SQL "
+        "statements than budgeted or repeats one statement shape more than max_repeats times",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):  # type: ignore[no-untyped-def]
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    with record_queries() as log:
+        result = yield
+    assert_query_budget(log, *marker.args, **marker.kwargs)
+    return result
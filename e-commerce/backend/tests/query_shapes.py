@@ -0,0 +1,59 @@
+"""Pytest plugin recording the SQL statement shapes issued by tests.
+
+Usage::
+
+    pytest --record-query-shapes=query-shapes.jsonl
+    python -m benchmarks.query_plans query-shapes.jsonl
+
+Only statements issued while a test body runs are recorded. Shapes are merged
+into an existing file, so tests run one at a time accumulate into one file.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.core.query_counter import record_queries, statement_shape
+from app.core.serialization import dumps, loads
+
+_shapes: dict[str, dict] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--record-query-shapes",
+        metavar="PATH",
+        default=None,
+        help="Write the SQL statement shapes issued by tests to PATH (JSON lines) for benchmarks.query_plans",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):  # type: ignore[no-untyped-def]
+    if item.config.getoption("record_query_shapes") is None:
+        return (yield)
+
+    with record_queries() as log:
+        try:
+            return (yield)
+        finally:
+            for statement in log.statements:
+                record = _shapes.setdefault(statement_shape(statement), {"statement": statement, "tests": []})
+                if item.nodeid not in record["tests"]:
+                    record["tests"].append(item.nodeid)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    path = session.config.getoption("record_query_shapes")
+    if path is None or not _shapes:
+        return
+    target = Path(path)
+    if target.exists():
+        for line in target.read_text().splitlines():
+            if line.strip():
+                record = loads(line)
+                merged = _shapes.setdefault(statement_shape(record["statement"]), record)
+                merged["tests"] = sorted(set(merged["tests"]) | set(record["tests"]))
+    target.write_bytes(b"".join(dumps(record) + b"\n" for record in _shapes.values()))
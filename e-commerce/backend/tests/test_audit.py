@@ -0,0 +1,114 @@
+"""Tests for the buffered audit log writer."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, insert, select, text
+
+from app.db.models.audit_log import AuditAction, AuditLog
+from app.services.audit import AuditBuffer, AuditService
+from app.services import audit_partitions
+from app.services.audit_partitions import AuditPartitionService
+
+
+async def count_logs(session, entity_id) -> int:
+    return await session.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.entity_id == entity_id))
+
+
+@pytest.mark.asyncio
+async def test_log_action_buffers_entries_and_flushes_in_batches(
+    db_session, db_engine, test_tenant, admin_user
+) -> None:
+    buffer = AuditBuffer(engine=db_engine, batch_size=2, flush_interval_ms=50)
+    service = AuditService(db_session, buffer=buffer)
+    entity_id = uuid4()
+
+    for _ in range(3):
+        await service.log_action("Product", entity_id, test_tenant.id, AuditAction.update, admin_user.id, {"a": 1})
+    # Nothing was written through, or committed on, the caller's session
+    assert not db_session.new
+
+    await asyncio.sleep(0.2)
+    assert buffer.pending == 0
+    assert await count_logs(db_session, entity_id) == 3
+    pool = db_engine.pool
+    await buffer.close()
+    # The engine was passed in, so closing does not dispose (replace) its pool
+    assert db_engine.pool is pool
+
+
+@pytest.mark.asyncio
+async def test_rejected_entry_does_not_block_the_entries_behind_it(
+    db_session, db_engine, test_tenant, admin_user
+) -> None:
+    buffer = AuditBuffer(engine=db_engine, batch_size=10, flush_interval_ms=60_000)
+    service = AuditService(db_session, buffer=buffer)
+    entity_id, tenant_id, actor_id = uuid4(), test_tenant.id, admin_user.id
+
+    await service.log_action("Product", entity_id, tenant_id, AuditAction.create, actor_id)
+    # Longer than the user_agent column, so PostgreSQL rejects this row on every attempt
+    await service.log_action("Product", entity_id, tenant_id, AuditAction.view, actor_id, user_agent="x" * 600)
+    await service.log_action("Product", entity_id, tenant_id, AuditAction.update, actor_id)
+
+    assert await buffer.flush() == 2
+    assert buffer.pending == 0
+    actions = await db_session.scalars(select(AuditLog.action).where(AuditLog.entity_id == entity_id))
+    assert sorted(actions) == ["CREATE", "UPDATE"]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_strict_log_action_joins_the_callers_transaction(
+    db_session, db_engine, test_tenant, admin_user
+) -> None:
+    buffer = AuditBuffer(engine=db_engine)
+    service = AuditService(db_session, buffer=buffer)
+    entity_id, tenant_id, actor_id = uuid4(), test_tenant.id, admin_user.id
+
+    await service.log_action("Order", entity_id, tenant_id, AuditAction.delete, actor_id, strict=True)
+    await db_session.rollback()
+    assert await count_logs(db_session, entity_id) == 0
+
+    await service.log_action("Order", entity_id, tenant_id, AuditAction.delete, actor_id, strict=True)
+    await db_session.commit()
+    assert await count_logs(db_session, entity_id) == 1
+    assert buffer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_partitions_take_over_default_rows_and_expire(db_session, test_tenant, admin_user, tmp_path) -> None:
+    entity_id = uuid4()
+    base = {"entity_type": "Product", "entity_id": entity_id, "tenant_id": test_tenant.id, "actor_id": admin_user.id}
+    await db_session.execute(
+        insert(AuditLog),
+        [
+            {**base, "id": uuid4(), "action": "CREATE", "created_date": datetime(2024, 1, 15, tzinfo=timezone.utc)},
+            {**base, "id": uuid4(), "action": "UPDATE", "created_date": datetime.now(timezone.utc)},
+        ],
+    )
+    await db_session.commit()
+
+    service = AuditPartitionService(db_session, archive_dir=tmp_path)
+    created = await service.ensure_partitions(months_ahead=1, today=date(2024, 1, 10))
+    assert created == ["audit_logs_p2024_01", "audit_logs_p2024_02"]
+    assert await db_session.scalar(text("SELECT count(*) FROM audit_logs_p2024_01")) == 1
+    assert await db_session.scalar(text("SELECT count(*) FROM audit_logs_default")) == 1
+
+    # Listing defaults to the recent window, which excludes the 2024 entry
+    logs, total = await AuditService(db_session).list_audit_logs(tenant_id=test_tenant.id)
+    assert total == 1 and logs[0].action == "UPDATE"
+
+    # Expired months are never kept silently when they cannot be archived
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(audit_partitions, "HAS_PYARROW", False)
+        with pytest.raises(RuntimeError, match="audit_logs_p2024_01, audit_logs_p2024_02"):
+            await service.archive_expired(retention_months=12)
+
+    report = await service.archive_expired(retention_months=12)
+    assert report.archived == {"audit_logs_p2024_01": 1, "audit_logs_p2024_02": 0}
+    assert (tmp_path / "audit_logs_p2024_01.parquet").exists()
+    assert await count_logs(db_session, entity_id) == 1
@@ -0,0 +1,143 @@
+"""Tests for the compiled discount index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.core.cache import cache_service
+from app.core.config import get_settings
+from app.db.models.category import Category
+from app.db.models.discount import Discount, DiscountScope, DiscountType
+from app.db.models.product import Product
+from app.schemas.discount import DiscountCreate, DiscountUpdate
+from app.services.discount_engine import CartLine, DiscountIndexCache, compile_index
+from app.services.discounts import DiscountService
+
+
+def make_discount(code: str, discount_type: DiscountType, scope: DiscountScope, value: str, **kwargs) -> Discount:
+    return Discount(
+        id=uuid4(),
+        code=code,
+        name=code.title(),
+        discount_type=discount_type,
+        discount_value=Decimal(value),
+        discount_currency=kwargs.pop("discount_currency", "USD"),
+        scope=scope,
+        valid_from=kwargs.pop("valid_from", datetime.now(timezone.utc) - timedelta(days=1)),
+        current_uses=kwargs.pop("current_uses", 0),
+        **kwargs,
+    )
+
+
+def test_price_picks_best_discount_across_scopes() -> None:
+    shoes, shirts = uuid4(), uuid4()
+    sneaker, tee = uuid4(), uuid4()
+    tenant_id = uuid4()
+    index = compile_index(
+        tenant_id,
+        [
+            make_discount("ORDER5", DiscountType.percentage, DiscountScope.order, "5"),
+            make_discount(
+                "SNEAKER20", DiscountType.percentage, DiscountScope.product, "20", product_ids=[str(sneaker)]
+            ),
+            make_discount("SHIRTS15", DiscountType.fixed_amount, DiscountScope.category, "15", category_id=shirts),
+            make_discount(
+                "BIGSPEND", DiscountType.fixed_amount, DiscountScope.cart, "50",
+                minimum_order_amount=Decimal("500"), minimum_order_currency="USD",
+            ),
+            make_discount("SHIPFREE", DiscountType.free_shipping, DiscountScope.order, "0"),
+            make_discount("USEDUP", DiscountType.percentage, DiscountScope.order, "90", max_uses=1, current_uses=1),
+            make_discount(
+                "LATER", DiscountType.percentage, DiscountScope.order, "80",
+                valid_from=datetime.now(timezone.utc) + timedelta(days=1),
+            ),
+        ],
+    )
+    lines = [
+        CartLine(sneaker, 2, Decimal("100.00"), shoes),
+        CartLine(tee, 3, Decimal("20.00"), shirts),
+    ]
+
+    pricing = index.price(lines, "USD")
+    assert pricing.subtotal == Decimal("260.00")
+    assert pricing.discount.code == "SNEAKER20"
+    assert pricing.discount_amount == Decimal("40.00")
+    assert pricing.total == Decimal("220.00")
+    assert pricing.free_shipping.code == "SHIPFREE"
+
+    only_coupon = index.price(lines, "USD", codes=["shirts15"])
+    assert (only_coupon.discount.code, only_coupon.discount_amount) == ("SHIRTS15", Decimal("15"))
+
+    # The minimum order unlocks the cart-wide fixed discount
+    big = index.price([CartLine(sneaker, 6, Decimal("100.00"), shoes)], "USD")
+    assert big.discount.code == "SNEAKER20" and big.discount_amount == Decimal("120.00")
+    assert index.price(lines, "USD", codes=["BIGSPEND", "USEDUP", "LATER"]).discount is None
+
+    # Sub-cent unit prices round to the nearest cent instead of truncating
+    assert index.price([CartLine(tee, 1, Decimal("19.999"), shirts)], "USD").subtotal == Decimal("20.00")
+
+
+@pytest.mark.asyncio
+async def test_index_is_reused_within_ttl_when_redis_is_down(db_session, test_tenant, monkeypatch) -> None:
+    async def no_generation(namespace: str, tenant_id: str) -> None:
+        return None
+
+    monkeypatch.setattr(cache_service, "get_generation", no_generation)
+    cache = DiscountIndexCache()
+
+    index = await cache.get(db_session, test_tenant.id)
+    assert await cache.get(db_session, test_tenant.id) is index
+
+    monkeypatch.setattr(get_settings(), "discount_index_ttl", 0)
+    assert await cache.get(db_session, test_tenant.id) is not index
+
+
+@pytest.mark.asyncio
+async def test_price_cart_resolves_categories_and_sees_discount_writes(db_session, test_tenant, admin_user) -> None:
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    category = Category(id=uuid4(), tenant_id=test_tenant.id, name="Rings", slug="rings", **audit)
+    db_session.add(category)
+    await db_session.flush()
+    product = Product(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        name="Band",
+        sku="RING-1",
+        price_currency="USD",
+        price_amount=Decimal("80.00"),
+        inventory=5,
+        category_id=category.id,
+        **audit,
+    )
+    db_session.add(product)
+    await db_session.commit()
+
+    service = DiscountService(db_session)
+    discount = await service.create_discount(
+        test_tenant.id,
+        admin_user.id,
+        DiscountCreate(
+            code="rings10",
+            name="Rings",
+            discount_type=DiscountType.percentage,
+            discount_value=Decimal("10"),
+            scope=DiscountScope.category,
+            category_id=category.id,
+            valid_from=datetime.now(timezone.utc) - timedelta(hours=1),
+        ),
+    )
+    lines = [CartLine(product.id, 2, Decimal("80.00"))]
+
+    pricing = await service.price_cart(test_tenant.id, "usd", lines)
+    assert pricing.discount.code == "RINGS10"
+    assert (pricing.discount_amount, pricing.total) == (Decimal("16.00"), Decimal("144.00"))
+
+    await service.update_discount(
+        test_tenant.id, discount.id, admin_user.id, DiscountUpdate(discount_value=Decimal("25"))
+    )
+    pricing = await service.price_cart(test_tenant.id, "USD", lines)
+    assert pricing.discount_amount == Decimal("40.00")
@@ -0,0 +1,129 @@
+"""Tests for response compression and conditional GET."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.core.cache import cache_service
+from app.core.http_cache import EntityTag, _parse_if_none_match
+from app.core.query_counter import record_queries
+from app.db.models.discount import Discount, DiscountScope, DiscountType
+from app.db.models.product import Product
+from app.main import app
+from app.services.discount_engine import discount_expiry_cache
+
+
+def test_if_none_match_parsing() -> None:
+    assert _parse_if_none_match('"a", W/"b"') == {'"a"', '"b"'}
+    assert _parse_if_none_match(None) == set()
+    assert EntityTag().headers == {}
+    assert EntityTag(value='"a"').headers["ETag"] == '"a"'
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_returns_304_without_query(
+    client: AsyncClient, db_session, test_tenant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def generation(namespace: str, tenant_id: str) -> int:
+        return 7
+
+    monkeypatch.setattr(cache_service, "get_generation", generation)
+    product = Product(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        name="Cached Product",
+        sku="CACHED-001",
+        price_amount=Decimal("10.00"),
+        price_currency="USD",
+        inventory=1,
+        created_by=uuid4(),
+        modified_by=uuid4(),
+    )
+    db_session.add(product)
+    await db_session.commit()
+    headers = {"X-Tenant-ID": str(test_tenant.id)}
+
+    first = await client.get(f"/api/v1/products/{product.id}", headers=headers)
+    assert first.status_code == 200
+    with record_queries() as log:
+        response = await client.get(
+            f"/api/v1/products/{product.id}", headers={**headers, "If-None-Match": first.headers["ETag"]}
+        )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert response.content == b""
+    assert log.count == 0
+
+
+@pytest.mark.asyncio
+async def test_wildcard_if_none_match_does_not_hide_missing_resource(
+    client: AsyncClient, test_tenant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def generation(namespace: str, tenant_id: str) -> int:
+        return 7
+
+    monkeypatch.setattr(cache_service, "get_generation", generation)
+
+    response = await client.get(
+        f"/api/v1/products/{uuid4()}",
+        headers={"X-Tenant-ID": str(test_tenant.id), "If-None-Match": "*"},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_discount_etag_changes_when_a_discount_expires(
+    client: AsyncClient, db_session, test_tenant, admin_user, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def generation(namespace: str, tenant_id: str) -> int:
+        return 7
+
+    monkeypatch.setattr(cache_service, "get_generation", generation)
+    discount_expiry_cache.invalidate()
+    db_session.add(
+        Discount(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            code="BRIEF",
+            name="Brief",
+            discount_type=DiscountType.percentage,
+            discount_value=Decimal("10"),
+            scope=DiscountScope.order,
+            valid_from=datetime.now(timezone.utc) - timedelta(hours=1),
+            valid_until=datetime.now(timezone.utc) + timedelta(seconds=1),
+            created_by=admin_user.id,
+            modified_by=admin_user.id,
+        )
+    )
+    await db_session.commit()
+    headers = {"X-Tenant-ID": str(test_tenant.id)}
+
+    first = await client.get("/api/v1/discounts", headers=headers)
+    assert first.json()["items"][0]["status"] == "Active"
+    cached = await client.get("/api/v1/discounts", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+
+    # No write bumps the generation, yet the expired discount is not answered from the stale tag
+    await asyncio.sleep(1.1)
+    response = await client.get("/api/v1/discounts", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert response.json()["items"][0]["status"] == "Expired"
+
+
+def test_large_responses_are_gzipped() -> None:
+    client = TestClient(app)
+
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
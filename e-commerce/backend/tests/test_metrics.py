@@ -0,0 +1,52 @@
+"""Tests for the instrumentation subsystem."""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry, http_requests_total
+from app.main import app
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5.0, route="/a")
+
+    output = registry.render()
+
+    assert '# TYPE latency_seconds histogram' in output
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+
+
+def test_counter_rejects_unknown_labels() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+
+    assert counter.value(kind="a") == 3
+    try:
+        counter.inc(other="b")
+    except ValueError:
+        pass
+    else:  # pragma: no cover - assertion path
+        raise AssertionError("Expected ValueError for unknown label")
+
+
+def test_metrics_endpoint_records_route_template() -> None:
+    client = TestClient(app)
+    before = http_requests_total.value(method="GET", route="/health", status="200")
+
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert http_requests_total.value(method="GET", route="/health", status="200") == before + 1
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/health"' in response.text
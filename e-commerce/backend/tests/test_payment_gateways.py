@@ -0,0 +1,117 @@
+"""Tests for the per-tenant payment gateway registry and its resilience layer."""
+
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+import stripe
+
+from app.db.models.payment_transaction import PaymentProvider
+from app.services.payment_gateways import (
+    UNAVAILABLE,
+    GatewayCredentials,
+    GatewayRegistry,
+    PaymentGateway,
+    PaymentResult,
+    ProviderHealth,
+    ResilientGateway,
+    StripeGateway,
+)
+from app.services.payment_gateways.resilience import CircuitBreaker, CircuitState
+
+
+class ScriptedGateway(PaymentGateway):
+    """Gateway double whose status lookups fail, hang or succeed on demand."""
+
+    def __init__(self) -> None:
+        self.mode = "ok"
+        self.calls = 0
+        self.unblock: asyncio.Event | None = None
+
+    async def get_payment_status(self, transaction_id):
+        self.calls += 1
+        if self.mode == "error":
+            raise ConnectionError("connection reset")
+        if self.mode == "hang":
+            self.unblock = asyncio.Event()
+            await self.unblock.wait()
+        return PaymentResult(success=True, transaction_id=transaction_id, status="succeeded")
+
+    async def create_payment_intent(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def confirm_payment(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def refund_payment(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+
+def test_registry_caches_clients_per_tenant_and_credentials() -> None:
+    tenant_a, tenant_b, tenant_c = uuid4(), uuid4(), uuid4()
+    keys = {tenant_a: "sk_test_a", tenant_b: "sk_test_a", tenant_c: "sk_test_c"}
+    registry = GatewayRegistry(lambda tenant_id, provider: GatewayCredentials(secret=keys[tenant_id]))
+    global_key = stripe.api_key
+
+    gateway_a = registry.get(tenant_a, PaymentProvider.stripe)
+
+    assert isinstance(gateway_a, ResilientGateway)
+    assert isinstance(gateway_a.inner, StripeGateway)
+    assert registry.get(tenant_a, PaymentProvider.stripe) is gateway_a
+    # Same account, same pooled client; a different account gets its own
+    assert registry.get(tenant_b, PaymentProvider.stripe) is gateway_a
+    assert registry.get(tenant_c, PaymentProvider.stripe) is not gateway_a
+    assert stripe.api_key == global_key
+
+    keys[tenant_c] = "sk_test_rotated"
+    previous = registry.get(tenant_c, PaymentProvider.stripe)
+    registry.invalidate(tenant_c)
+    assert registry.get(tenant_c, PaymentProvider.stripe) is not previous
+    assert registry.get(tenant_a, PaymentProvider.stripe) is gateway_a
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_on_failures_and_recovers_after_trial() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker("Test", failure_rate=0.5, min_calls=4, recovery_seconds=30, clock=lambda: now[0])
+    inner = ScriptedGateway()
+    gateway = ResilientGateway(inner, ProviderHealth("Test", bulkhead_size=5, breaker=breaker))
+
+    inner.mode = "error"
+    for _ in range(4):
+        result = await gateway.get_payment_status("pi_1")
+        assert result.status == UNAVAILABLE and result.retryable
+    assert breaker.state == CircuitState.OPEN
+
+    # Open circuit: rejected without reaching the provider
+    result = await gateway.get_payment_status("pi_1")
+    assert result.status == UNAVAILABLE and inner.calls == 4
+
+    now[0] = 31.0
+    inner.mode = "ok"
+    result = await gateway.get_payment_status("pi_1")
+    assert result.success and breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_and_holds_slot_until_call_returns(monkeypatch) -> None:
+    inner = ScriptedGateway()
+    inner.mode = "hang"
+    health = ProviderHealth("Test", bulkhead_size=1)
+    monkeypatch.setattr(health.timeout("get_payment_status"), "current", 0.05)
+    gateway = ResilientGateway(inner, health)
+
+    slow = asyncio.create_task(gateway.get_payment_status("pi_slow"))
+    await asyncio.sleep(0.01)
+    rejected = await gateway.get_payment_status("pi_other")
+    assert rejected.status == UNAVAILABLE and inner.calls == 1
+
+    timed_out = await slow
+    assert timed_out.status == UNAVAILABLE
+    # The abandoned call still occupies the slot until it actually finishes
+    assert health.in_flight == 1
+    inner.unblock.set()
+    await asyncio.sleep(0.01)
+    assert health.in_flight == 0
@@ -0,0 +1,121 @@
+"""Tests for batched payment reconciliation."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.order import Order, OrderStatus
+from app.db.models.payment_method import PaymentMethod, PaymentMethodType
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.services import payment_transitions
+from app.services.payment_gateways import PaymentGateway, PaymentResult
+from app.services.payment_reconciliation import PaymentReconciliationService
+
+
+class ListingGateway(PaymentGateway):
+    """Gateway double answering list lookups from a fixed status table."""
+
+    def __init__(self, statuses: dict[str, str]) -> None:
+        self.statuses = statuses
+        self.calls: list[list[str]] = []
+
+    async def list_payment_statuses(self, transaction_ids, created_after=None, created_before=None, limiter=None):
+        self.calls.append(sorted(transaction_ids))
+        return {
+            transaction_id: PaymentResult(success=False, transaction_id=transaction_id, status=self.statuses[transaction_id])
+            for transaction_id in transaction_ids
+            if transaction_id in self.statuses
+        }
+
+    async def create_payment_intent(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def confirm_payment(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def get_payment_status(self, transaction_id):  # pragma: no cover
+        raise NotImplementedError
+
+    async def refund_payment(self, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_reconcile_pages_stale_transactions(
+    db_session, session_factory, test_tenant, admin_user, monkeypatch
+) -> None:
+    monkeypatch.setattr(payment_transitions, "publish_payment_succeeded", lambda **kw: None)
+    monkeypatch.setattr(payment_transitions, "publish_payment_failed", lambda **kw: None)
+
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    db_session.add(method)
+    await db_session.flush()
+
+    old = datetime.now(timezone.utc) - timedelta(hours=2)
+    references = {"pi_paid": old, "pi_waiting": old + timedelta(seconds=1), "pi_lost": old + timedelta(seconds=2)}
+    references["pi_fresh"] = datetime.now(timezone.utc)
+    orders = {}
+    for offset, (reference, created) in enumerate(references.items()):
+        order = Order(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            customer_id=admin_user.id,
+            payment_method_id=method.id,
+            total_currency="USD",
+            total_amount=Decimal("10.00"),
+            **audit,
+        )
+        orders[reference] = order
+        db_session.add(order)
+        db_session.add(
+            PaymentTransaction(
+                id=uuid4(),
+                tenant_id=test_tenant.id,
+                order_id=order.id,
+                payment_method_id=method.id,
+                provider=PaymentProvider.stripe,
+                provider_transaction_id=reference,
+                provider_payment_intent_id=reference,
+                amount_currency="USD",
+                amount=Decimal("10.00"),
+                status=PaymentStatus.pending,
+                created_date=created,
+                **audit,
+            )
+        )
+    await db_session.commit()
+
+    gateway = ListingGateway(
+        {"pi_paid": "succeeded", "pi_waiting": "requires_payment_method", "pi_fresh": "succeeded"}
+    )
+    service = PaymentReconciliationService(
+        session_factory, gateways={PaymentProvider.stripe: gateway}, limiters={}
+    )
+    report = await service.reconcile(batch_size=2)
+
+    stripe_report = report.providers["Stripe"]
+    assert gateway.calls == [["pi_paid", "pi_waiting"], ["pi_lost"]]
+    assert (stripe_report.scanned, stripe_report.updated, stripe_report.unchanged, stripe_report.unresolved) == (
+        3,
+        1,
+        1,
+        1,
+    )
+    assert stripe_report.transitions == {"Pending->Succeeded": 1}
+    assert report.as_dict()["totals"]["updated"] == 1
+
+    statuses = dict(
+        (await db_session.execute(select(PaymentTransaction.provider_transaction_id, PaymentTransaction.status))).all()
+    )
+    assert statuses["pi_paid"] == PaymentStatus.succeeded
+    assert statuses["pi_fresh"] == PaymentStatus.pending
+    order_status = await db_session.scalar(select(Order.status).where(Order.id == orders["pi_paid"].id))
+    assert order_status == OrderStatus.confirmed
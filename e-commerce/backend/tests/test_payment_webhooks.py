@@ -0,0 +1,121 @@
+"""Tests for payment webhook verification and inbox processing."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.db.models.order import Order, OrderStatus
+from app.db.models.payment_method import PaymentMethod, PaymentMethodType
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.services import payment_transitions
+from app.services.payment_webhooks import (
+    PaymentWebhookService,
+    parse_razorpay_event,
+    parse_stripe_event,
+    verify_razorpay_signature,
+    verify_stripe_signature,
+)
+
+SECRET = "whsec_test"
+
+
+def _stripe_header(payload: bytes, timestamp: int, secret: str = SECRET) -> str:
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def _stripe_event(event_type: str, intent_id: str, **obj) -> bytes:
+    return json.dumps(
+        {"id": f"evt_{uuid4().hex}", "type": event_type, "data": {"object": {"id": intent_id, **obj}}}
+    ).encode()
+
+
+def test_stripe_signature_verification() -> None:
+    payload = _stripe_event("payment_intent.succeeded", "pi_123")
+    header = _stripe_header(payload, 1_700_000_000)
+
+    assert verify_stripe_signature(payload, header, SECRET, tolerance=300, now=1_700_000_100)
+    assert not verify_stripe_signature(payload + b" ", header, SECRET, tolerance=300, now=1_700_000_100)
+    assert not verify_stripe_signature(payload, header, "other", tolerance=300, now=1_700_000_100)
+    # Replayed outside the tolerance window
+    assert not verify_stripe_signature(payload, header, SECRET, tolerance=300, now=1_700_001_000)
+    assert not verify_stripe_signature(payload, None, SECRET)
+
+
+def test_razorpay_signature_and_parsing() -> None:
+    payload = json.dumps(
+        {
+            "event": "payment.captured",
+            "payload": {"payment": {"entity": {"id": "pay_1", "order_id": "order_1"}}},
+        }
+    ).encode()
+    signature = hmac.new(SECRET.encode(), payload, hashlib.sha256).hexdigest()
+
+    assert verify_razorpay_signature(payload, signature, SECRET)
+    assert not verify_razorpay_signature(payload, signature[:-1] + "0", SECRET)
+
+    event = parse_razorpay_event(payload, None)
+    assert event.reference == "order_1"
+    # Without the event-id header, redeliveries of the same body share an ID
+    assert event.event_id == parse_razorpay_event(payload, None).event_id
+
+
+@pytest.mark.asyncio
+async def test_process_pending_applies_events_once(db_session, test_tenant, admin_user, monkeypatch) -> None:
+    published: list[str] = []
+    monkeypatch.setattr(payment_transitions, "publish_payment_succeeded", lambda **kw: published.append("succeeded"))
+    monkeypatch.setattr(payment_transitions, "publish_payment_failed", lambda **kw: published.append("failed"))
+
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    order = Order(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        customer_id=admin_user.id,
+        payment_method_id=method.id,
+        total_currency="USD",
+        total_amount=Decimal("50.00"),
+        **audit,
+    )
+    transaction = PaymentTransaction(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        order_id=order.id,
+        payment_method_id=method.id,
+        provider=PaymentProvider.stripe,
+        provider_transaction_id="pi_abc",
+        provider_payment_intent_id="pi_abc",
+        amount_currency="USD",
+        amount=Decimal("50.00"),
+        status=PaymentStatus.pending,
+        **audit,
+    )
+    db_session.add(method)
+    await db_session.flush()
+    db_session.add_all([order, transaction])
+    await db_session.commit()
+
+    service = PaymentWebhookService(db_session)
+    succeeded = parse_stripe_event(_stripe_event("payment_intent.succeeded", "pi_abc"))
+    assert await service.record(succeeded)
+    assert not await service.record(succeeded)  # provider redelivery
+    # Arrives after success; must not regress the transaction
+    assert await service.record(parse_stripe_event(_stripe_event("payment_intent.processing", "pi_abc")))
+
+    counts = await service.process_pending()
+
+    assert counts == {"claimed": 2, "applied": 1, "ignored": 0, "deferred": 0}
+    await db_session.refresh(transaction)
+    await db_session.refresh(order)
+    assert transaction.status == PaymentStatus.succeeded
+    assert order.status == OrderStatus.confirmed
+    assert published == ["succeeded"]
+    assert (await service.process_pending())["claimed"] == 0
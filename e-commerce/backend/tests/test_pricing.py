@@ -0,0 +1,86 @@
+"""Tests for the jewelry pricing engine."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.db.models.product import Product
+from app.schemas.pricing import MetalRateUpsert
+from app.services.pricing import PricingService, compute_price
+
+
+def test_compute_price_applies_wastage_charges_and_gst() -> None:
+    breakdown = compute_price(
+        rate_per_gram=Decimal("6000.00"),
+        weight=Decimal("10.255"),
+        wastage_percent=Decimal("8"),
+        making_charges=Decimal("1500.00"),
+        stone_charges=Decimal("250.00"),
+        gst_percent=Decimal("3"),
+    )
+
+    assert breakdown.metal_value == Decimal("61530.00")
+    assert breakdown.wastage_value == Decimal("4922.40")
+    assert breakdown.subtotal == Decimal("68202.40")
+    assert (breakdown.gst_amount, breakdown.total) == (Decimal("2046.07"), Decimal("70248.47"))
+
+
+@pytest.mark.asyncio
+async def test_rate_change_reprices_matching_products_in_one_update(db_session, test_tenant, admin_user) -> None:
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    ring = Product(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        name="Ring",
+        sku="GR-22",
+        price_currency="INR",
+        price_amount=Decimal("1.00"),
+        weight=Decimal("4.500"),
+        material="gold",
+        purity="22k",
+        wastage_percent=Decimal("10"),
+        making_charges=Decimal("800.00"),
+        gst_percent=Decimal("3"),
+        **audit,
+    )
+    chain = Product(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        name="Chain",
+        sku="GC-18",
+        price_currency="INR",
+        price_amount=Decimal("999.00"),
+        weight=Decimal("8.000"),
+        material="Gold",
+        purity="18K",
+        **audit,
+    )
+    db_session.add_all([ring, chain])
+    await db_session.commit()
+
+    service = PricingService(db_session)
+    rate, repriced = await service.set_rate(
+        test_tenant.id, admin_user.id, MetalRateUpsert(material="Gold", purity="22k", rate_per_gram=Decimal("6500"))
+    )
+    assert (rate.material, rate.purity, repriced) == ("Gold", "22K", 1)
+
+    await db_session.refresh(ring)
+    await db_session.refresh(chain)
+    expected = compute_price(
+        Decimal("6500"), Decimal("4.500"), Decimal("10"), None, Decimal("800.00"), None, Decimal("3")
+    )
+    assert ring.price_amount == expected.total == Decimal("33964.25")
+    assert chain.price_amount == Decimal("999.00")  # No 18K rate yet
+
+    # Setting the same rate again is an upsert that changes nothing
+    _, repriced = await service.set_rate(
+        test_tenant.id, admin_user.id, MetalRateUpsert(material="GOLD", purity="22K", rate_per_gram=Decimal("6500"))
+    )
+    assert repriced == 0
+    assert len(await service.list_rates(test_tenant.id)) == 1
+
+    breakdown = await service.get_price(test_tenant.id, ring.id)
+    assert breakdown.rate_based and breakdown.total == expected.total
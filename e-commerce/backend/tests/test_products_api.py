@@ -7,6 +7,7 @@ from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 
+from app.core.query_counter import query_budget
 from app.db.models.product import Product
 
 
@@ -23,14 +24,15 @@ async def test_list_products(client: AsyncClient, test_tenant, admin_user) -> No
     )
     token = login_response.json()["access_token"]
 
-    response = await client.get(
-        "/api/v1/products",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "X-Tenant-ID": str(test_tenant.id),
-            "X-Actor-ID": str(admin_user.id),
-        },
-    )
+    with query_budget(2, max_repeats=1):
+        response = await client.get(
+            "/api/v1/products",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "X-Tenant-ID": str(test_tenant.id),
+                "X-Actor-ID": str(admin_user.id),
+            },
+        )
     assert response.status_code == 200
     data = response.json()
     assert "items" in data
@@ -104,14 +106,15 @@ async def test_get_product(client: AsyncClient, test_tenant, admin_user, db_sess
     )
     token = login_response.json()["access_token"]
 
-    response = await client.get(
-        f"/api/v1/products/{product.id}",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "X-Tenant-ID": str(test_tenant.id),
-            "X-Actor-ID": str(admin_user.id),
-        },
-    )
+    with query_budget(1):
+        response = await client.get(
+            f"/api/v1/products/{product.id}",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "X-Tenant-ID": str(test_tenant.id),
+                "X-Actor-ID": str(admin_user.id),
+            },
+        )
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == str(product.id)
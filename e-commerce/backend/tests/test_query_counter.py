@@ -0,0 +1,44 @@
+"""Tests for the per-request query counter and N+1 detection."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.query_counter import (
+    QueryBudgetExceeded,
+    QueryLog,
+    assert_query_budget,
+    statement_shape,
+)
+
+
+def test_statement_shape_ignores_parameters() -> None:
+    first = statement_shape("SELECT * FROM products WHERE id = $1 AND tenant_id = $2")
+    second = statement_shape("SELECT *  FROM products\nWHERE id = $7 AND tenant_id = $8")
+    in_list = statement_shape("SELECT * FROM products WHERE id IN ($1, $2, $3)")
+
+    assert first == second
+    assert in_list == "SELECT * FROM products WHERE id IN (?)"
+
+
+def test_repeated_shapes_are_flagged() -> None:
+    log = QueryLog(
+        statements=[
+            "SELECT * FROM orders WHERE id = $1",
+            *[f"SELECT * FROM products WHERE id = ${i}" for i in range(1, 6)],
+        ]
+    )
+
+    repeated = log.repeated(threshold=3)
+
+    assert repeated == [("SELECT * FROM products WHERE id = ?", 5)]
+
+
+def test_assert_query_budget() -> None:
+    log = QueryLog(statements=["SELECT 1", "SELECT 1", "SELECT 2"])
+
+    assert_query_budget(log, max_queries=3)
+    with pytest.raises(QueryBudgetExceeded):
+        assert_query_budget(log, max_queries=2)
+    with pytest.raises(QueryBudgetExceeded):
+        assert_query_budget(log, max_queries=10, max_repeats=1)
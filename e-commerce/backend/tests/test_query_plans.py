@@ -0,0 +1,37 @@
+"""Tests for the index-usage audit over captured query shapes."""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.query_counter import record_queries
+from app.db.models.return_request import ReturnStatus
+from app.services.orders import OrderService
+from app.services.products import ProductService
+from app.services.reports import ReportsService
+from app.services.returns import ReturnService
+from benchmarks.query_plans import CapturedStatement, audit_statements
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_plan_index_scans(db_session, db_engine, test_tenant) -> None:
+    """Listing, history and report queries are all served by the composite indexes."""
+    with record_queries() as log:
+        await ProductService(db_session).list_products(test_tenant.id, page=1, page_size=20)
+        await OrderService(db_session).list_tenant_orders(test_tenant.id)
+        await OrderService(db_session).list_customer_orders(test_tenant.id, uuid4())
+        await ReturnService(db_session).list_returns(test_tenant.id, status_filter=ReturnStatus.pending)
+        await ReportsService(db_session).get_sales_summary(test_tenant.id)
+        await ReportsService(db_session).get_order_stats(test_tenant.id)
+    await db_session.commit()
+
+    unindexed = "SELECT orders.id FROM orders WHERE orders.total_currency = $1::VARCHAR"
+    statements = [CapturedStatement(statement) for statement in log.statements]
+    async with db_engine.connect() as connection:
+        report = await audit_statements(connection, [*statements, CapturedStatement(unindexed, ["adhoc"])])
+
+    assert report.errors == []
+    assert report.checked >= 10
+    assert [(finding.statement, finding.tables) for finding in report.findings] == [(unindexed, ["orders"])]
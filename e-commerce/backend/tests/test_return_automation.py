@@ -0,0 +1,211 @@
+"""Tests for set-based returns automation."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.audit_log import AuditAction, AuditLog
+from app.db.models.order import Order
+from app.db.models.payment_method import PaymentMethod, PaymentMethodType
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.db.models.return_request import ReturnRequest, ReturnStatus
+from app.schemas.returns import ReturnPolicyUpdate
+from app.services.return_automation import ReturnAutomationService, sla_deadlines
+
+
+@pytest.mark.asyncio
+async def test_auto_approve_applies_rules_and_tenant_policy(db_session, test_tenant, test_user, admin_user) -> None:
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    db_session.add(method)
+    await db_session.flush()
+
+    returns = {}
+    for key, customer, amount, status in (
+        ("small", test_user, "100.00", ReturnStatus.pending),
+        ("large", test_user, "500.00", ReturnStatus.pending),
+        ("flagged", admin_user, "50.00", ReturnStatus.pending),
+        ("rejected", admin_user, "20.00", ReturnStatus.rejected),
+    ):
+        order = Order(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            customer_id=customer.id,
+            payment_method_id=method.id,
+            total_currency="USD",
+            total_amount=Decimal(amount),
+            **audit,
+        )
+        db_session.add(order)
+        await db_session.flush()
+        returns[key] = ReturnRequest(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            order_id=order.id,
+            customer_id=customer.id,
+            reason="Does not fit",
+            status=status,
+            **audit,
+        )
+        db_session.add(returns[key])
+    await db_session.commit()
+
+    service = ReturnAutomationService(db_session)
+    assert await service.auto_approve(batch_size=1) == {"approved": 1, "skipped": 2}
+
+    # A tenant policy raises the amount threshold for the next run
+    policy = ReturnPolicyUpdate(auto_approve_max_amount=Decimal("1000"))
+    await service.update_policy(test_tenant.id, admin_user.id, policy)
+    assert await service.auto_approve() == {"approved": 1, "skipped": 1}
+
+    statuses = dict((await db_session.execute(select(ReturnRequest.id, ReturnRequest.status))).all())
+    assert statuses[returns["small"].id] == statuses[returns["large"].id] == ReturnStatus.approved
+    assert statuses[returns["flagged"].id] == ReturnStatus.pending
+    logged = await db_session.scalars(
+        select(AuditLog.entity_id).where(AuditLog.action == AuditAction.return_auto_approved.value)
+    )
+    assert set(logged) == {returns["small"].id, returns["large"].id}
+
+
+@pytest.mark.asyncio
+async def test_verify_refunds_settles_approved_returns_in_batches(db_session, test_tenant, test_user, admin_user) -> None:
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    db_session.add(method)
+    await db_session.flush()
+
+    returns = {}
+    for key, transaction_status, refunded in (
+        ("full", PaymentStatus.refunded, "40.00"),
+        ("partial", PaymentStatus.partially_refunded, "15.00"),
+        ("waiting", PaymentStatus.succeeded, None),
+    ):
+        order = Order(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            customer_id=test_user.id,
+            payment_method_id=method.id,
+            total_currency="USD",
+            total_amount=Decimal("40.00"),
+            **audit,
+        )
+        transaction = PaymentTransaction(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            order_id=order.id,
+            payment_method_id=method.id,
+            provider=PaymentProvider.manual,
+            amount_currency="USD",
+            amount=Decimal("40.00"),
+            refund_amount=Decimal(refunded) if refunded else None,
+            status=transaction_status,
+            **audit,
+        )
+        db_session.add_all([order, transaction])
+        await db_session.flush()
+        returns[key] = ReturnRequest(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            order_id=order.id,
+            customer_id=test_user.id,
+            reason="Damaged",
+            status=ReturnStatus.approved,
+            refund_transaction_id=transaction.id,
+            **audit,
+        )
+        db_session.add(returns[key])
+    await db_session.commit()
+
+    report = await ReturnAutomationService(db_session).verify_refunds(batch_size=2)
+    assert (report.batches, report.checked, report.verified, report.pending) == (2, 3, 2, 1)
+
+    rows = {
+        row.id: row
+        for row in (
+            await db_session.execute(
+                select(ReturnRequest.id, ReturnRequest.status, ReturnRequest.refund_amount).execution_options(
+                    populate_existing=True
+                )
+            )
+        ).all()
+    }
+    assert rows[returns["full"].id].status == ReturnStatus.refunded
+    assert rows[returns["partial"].id].refund_amount == Decimal("15.00")
+    assert rows[returns["waiting"].id].status == ReturnStatus.approved
+
+
+@pytest.mark.asyncio
+async def test_check_slas_notifies_each_threshold_once(db_session, test_tenant, test_user, admin_user) -> None:
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    db_session.add(method)
+    await db_session.flush()
+
+    service = ReturnAutomationService(db_session)
+    policy = await service.update_policy(
+        test_tenant.id, admin_user.id, ReturnPolicyUpdate(acknowledgement_sla_hours=10, resolution_sla_hours=20)
+    )
+    now = datetime.now(timezone.utc)
+    returns = {}
+    for key, age_hours, status in (
+        ("fresh", 1, ReturnStatus.pending),
+        ("warned", 9, ReturnStatus.pending),
+        ("late", 30, ReturnStatus.pending),
+        ("resolving", 17, ReturnStatus.approved),
+    ):
+        order = Order(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            customer_id=test_user.id,
+            payment_method_id=method.id,
+            total_currency="USD",
+            total_amount=Decimal("25.00"),
+            **audit,
+        )
+        db_session.add(order)
+        await db_session.flush()
+        created = now - timedelta(hours=age_hours)
+        returns[key] = ReturnRequest(
+            id=uuid4(),
+            tenant_id=test_tenant.id,
+            order_id=order.id,
+            customer_id=test_user.id,
+            reason="Wrong size",
+            status=status,
+            created_date=created,
+            **sla_deadlines(created, policy),
+            **audit,
+        )
+        db_session.add(returns[key])
+    await db_session.commit()
+
+    assert await service.check_slas(now=now, batch_size=1) == {"reminders_sent": 2, "breaches_detected": 1}
+    # Nothing new crossed, so nothing is re-notified
+    assert await service.check_slas(now=now) == {"reminders_sent": 0, "breaches_detected": 0}
+    later = now + timedelta(hours=2)
+    assert await service.check_slas(now=later) == {"reminders_sent": 0, "breaches_detected": 1}
+
+    # Extending the SLAs clears notifications whose thresholds are now in the future...
+    await service.update_policy(
+        test_tenant.id, admin_user.id, ReturnPolicyUpdate(acknowledgement_sla_hours=100, resolution_sla_hours=200)
+    )
+    assert await service.check_slas(now=later) == {"reminders_sent": 0, "breaches_detected": 0}
+    # ...so they are reported again once the SLAs tighten and the thresholds pass
+    await service.update_policy(
+        test_tenant.id, admin_user.id, ReturnPolicyUpdate(acknowledgement_sla_hours=10, resolution_sla_hours=20)
+    )
+    assert await service.check_slas(now=later) == {"reminders_sent": 1, "breaches_detected": 2}
+
+    notes = await db_session.scalars(select(ReturnRequest.resolution_notes))
+    assert set(notes) == {None}
@@ -0,0 +1,45 @@
+"""Tests for orjson/pydantic-core serialization helpers."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import orjson
+
+from app.core.serialization import dumps, loads
+from app.schemas.product import ProductListResponse, ProductRead, product_list_serializer
+
+
+def _product() -> ProductRead:
+    actor = uuid4()
+    now = datetime.now(timezone.utc)
+    return ProductRead(
+        id=uuid4(),
+        tenantId=uuid4(),
+        name="Gold Ring",
+        sku="RING-001",
+        price={"currency": "INR", "amount": 999.5},
+        inventory=3,
+        stoneType="Diamond",
+        audit={"createdBy": actor, "createdDate": now, "modifiedBy": actor, "modifiedDate": now},
+    )
+
+
+def test_list_serializer_matches_alias_dump() -> None:
+    response = ProductListResponse(items=[_product(), _product()], page=1, page_size=20, total=2)
+
+    encoded = product_list_serializer.to_json(response)
+
+    assert orjson.loads(encoded) == response.model_dump(mode="json", by_alias=True)
+    assert b'"pageSize":20' in encoded
+    assert b'"stoneType":"Diamond"' in encoded
+
+
+def test_cache_encoding_round_trip() -> None:
+    product_id = uuid4()
+    encoded = dumps({"id": product_id, "price": Decimal("12.50"), 1: "one"})
+
+    assert isinstance(encoded, bytes)
+    assert loads(encoded) == {"id": str(product_id), "price": "12.50", "1": "one"}
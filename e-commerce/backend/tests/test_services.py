@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
 
+from app.db.models.category import Category
+from app.db.models.discount import Discount, DiscountScope, DiscountStatus, DiscountType
+from app.db.models.discount_redemption import DiscountRedemption
+from app.db.models.order import Order, OrderStatus
+from app.db.models.payment_method import PaymentMethod, PaymentMethodType
+from app.db.models.payment_transaction import PaymentProvider, PaymentStatus, PaymentTransaction
+from app.core.cache import cache_service
+from app.core.metrics import coupon_lookups_total
 from app.db.models.product import Product
+from app.services import coupon_lookup, payments
+from app.services.discounts import DiscountService
+from app.services.payment_gateways import PaymentResult
+from app.services.payments import PaymentService
+from app.services.categories import CategoryService
+from app.services.category_tree import category_tree_cache
 from app.services.products import ProductService
+from app.services.storefront import storefront_config_cache
 
 
 @pytest.mark.asyncio
@@ -60,6 +79,26 @@ async def test_product_service_create_product(db_session, test_tenant, admin_use
     assert product.inventory == 50
 
 
+@pytest.mark.asyncio
+async def test_product_service_sku_is_unique_per_tenant(db_session, test_tenant, admin_user) -> None:
+    """Tenants may reuse an SKU; a repeat within a tenant is a 409 from the constraint, not a pre-check."""
+    from app.core.query_counter import record_queries
+    from app.schemas.product import ProductCreate
+    from app.schemas.shared import Money
+
+    service = ProductService(db_session)
+    payload = ProductCreate(name="Ring", sku="RING-001", price=Money(currency="USD", amount=10), inventory=1)
+    await service.create_product(test_tenant.id, admin_user.id, payload)
+    other = await service.create_product(uuid4(), admin_user.id, payload)
+    assert other.sku == "RING-001"
+
+    with record_queries() as log, pytest.raises(HTTPException) as exc:
+        await service.create_product(test_tenant.id, admin_user.id, payload)
+    assert exc.value.status_code == 409
+    assert not any("FROM products" in statement for statement in log.statements)
+    assert (await db_session.execute(select(func.count()).select_from(Product))).scalar_one() == 2
+
+
 @pytest.mark.asyncio
 async def test_product_service_get_product(db_session, test_tenant, admin_user) -> None:
     """Test ProductService.get_product."""
@@ -139,3 +178,336 @@ async def test_product_service_reserve_inventory_insufficient(db_session, test_t
 
     assert exc_info.value.status_code == 400
 
+
+@pytest.mark.asyncio
+async def test_payment_service_confirm_releases_connection_during_gateway_call(
+    db_session, test_tenant, admin_user, monkeypatch
+) -> None:
+    """The provider round trip runs outside any database transaction."""
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    method = PaymentMethod(
+        id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit
+    )
+    order = Order(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        customer_id=admin_user.id,
+        payment_method_id=method.id,
+        total_currency="USD",
+        total_amount=Decimal("10.00"),
+        **audit,
+    )
+    transaction = PaymentTransaction(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        order_id=order.id,
+        payment_method_id=method.id,
+        provider=PaymentProvider.stripe,
+        provider_transaction_id="pi_1",
+        provider_payment_intent_id="pi_1",
+        amount_currency="USD",
+        amount=Decimal("10.00"),
+        status=PaymentStatus.processing,
+        **audit,
+    )
+    db_session.add(method)
+    await db_session.flush()
+    db_session.add_all([order, transaction])
+    await db_session.commit()
+
+    seen_in_transaction = []
+
+    class Gateway:
+        async def confirm_payment(self, payment_intent_id, payment_method_id=None):
+            seen_in_transaction.append(db_session.in_transaction())
+            return PaymentResult(success=True, transaction_id="ch_1", status="succeeded")
+
+    monkeypatch.setattr(payments.gateway_registry, "get", lambda tenant_id, provider: Gateway())
+    monkeypatch.setattr(payments, "publish_payment_succeeded", lambda **kw: None)
+
+    confirmed = await PaymentService(db_session).confirm_payment(
+        test_tenant.id, transaction.id, "pm_card", admin_user.id
+    )
+
+    assert seen_in_transaction == [False]
+    assert confirmed.status == PaymentStatus.succeeded
+    assert confirmed.provider_transaction_id == "ch_1"
+    await db_session.refresh(order)
+    assert order.status == OrderStatus.confirmed
+
+
+@pytest.mark.asyncio
+async def test_discount_service_apply_never_oversells(
+    db_session, session_factory, test_tenant, admin_user, test_user
+) -> None:
+    """Concurrent redemptions stop exactly at max_uses and at the per-customer limit."""
+    discount = Discount(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        code="FLASH10",
+        name="Flash",
+        discount_type=DiscountType.percentage,
+        discount_value=Decimal("10"),
+        scope=DiscountScope.order,
+        valid_from=datetime.now(timezone.utc) - timedelta(hours=1),
+        max_uses=3,
+        max_uses_per_customer=1,
+        created_by=admin_user.id,
+        modified_by=admin_user.id,
+    )
+    db_session.add(discount)
+    await db_session.commit()
+
+    async def redeem(customer_id):
+        async with session_factory() as session:
+            try:
+                await DiscountService(session).apply_discount(
+                    test_tenant.id, "flash10", Decimal("50.00"), "USD", customer_id
+                )
+            except HTTPException as exc:
+                return exc.detail
+            return "ok"
+
+    outcomes = await asyncio.gather(*(redeem(test_user.id) for _ in range(3)))
+    assert sorted(outcomes) == ["Discount usage limit reached for this customer."] * 2 + ["ok"]
+
+    outcomes = await asyncio.gather(*(redeem(None) for _ in range(6)))
+    assert outcomes.count("ok") == 2
+
+    await db_session.refresh(discount)
+    assert (discount.current_uses, discount.status, discount.is_active) == (3, DiscountStatus.inactive, False)
+    redemptions = await db_session.scalar(
+        select(func.count()).select_from(DiscountRedemption).where(DiscountRedemption.discount_id == discount.id)
+    )
+    assert redemptions == 3
+
+
+@pytest.mark.asyncio
+async def test_discount_service_derives_expiry_on_read_and_sweeps_it(db_session, test_tenant, admin_user) -> None:
+    """Listing never writes; the sweeper persists expiry in a set-based update."""
+    now = datetime.now(timezone.utc)
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    for code, valid_until in (("CURRENT", now + timedelta(days=1)), ("LAPSED", now - timedelta(minutes=1))):
+        db_session.add(
+            Discount(
+                id=uuid4(),
+                tenant_id=test_tenant.id,
+                code=code,
+                name=code.title(),
+                discount_type=DiscountType.percentage,
+                discount_value=Decimal("5"),
+                scope=DiscountScope.order,
+                valid_from=now - timedelta(days=1),
+                valid_until=valid_until,
+                **audit,
+            )
+        )
+    await db_session.commit()
+
+    service = DiscountService(db_session)
+    expired, total = await service.list_discounts(test_tenant.id, status=DiscountStatus.expired)
+    assert total == 1 and expired[0].code == "LAPSED"
+    assert expired[0].status == DiscountStatus.active  # Derived, not written
+    active, _ = await service.list_discounts(test_tenant.id, is_active=True)
+    assert [discount.code for discount in active] == ["CURRENT"]
+
+    assert await service.expire_lapsed(batch_size=1) == {test_tenant.id: 1}
+    await db_session.refresh(expired[0])
+    assert (expired[0].status, expired[0].is_active) == (DiscountStatus.expired, False)
+
+
+class MemoryCache:
+    """In-process stand-in for the Redis calls made by coupon lookups."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+        self.generation = 1
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=3600):
+        self.values[key] = value
+        return True
+
+    async def get_generation(self, namespace, tenant_id):
+        return self.generation
+
+    async def bump_generation(self, namespace, tenant_id):
+        self.generation += 1
+
+    async def increment(self, key, ttl):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def get_counters(self, *keys):
+        return [self.values.get(key, 0) for key in keys]
+
+
+@pytest.mark.asyncio
+async def test_discount_service_caches_coupon_lookups_and_throttles_guessing(
+    db_session, test_tenant, admin_user, monkeypatch
+) -> None:
+    """Unknown codes are answered from cache, and repeated misses are refused with 429."""
+    memory = MemoryCache()
+    for name in ("get", "set", "get_generation", "bump_generation", "increment", "get_counters"):
+        monkeypatch.setattr(cache_service, name, getattr(memory, name))
+    monkeypatch.setattr(coupon_lookup.settings, "coupon_attempt_limit_per_ip", 3)
+
+    service = DiscountService(db_session)
+    database_lookups = coupon_lookups_total.value(result="database")
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            await service.apply_discount(test_tenant.id, "GUESS1", Decimal("10"), "USD", client_ip="203.0.113.9")
+        assert exc.value.status_code == 404
+    assert coupon_lookups_total.value(result="database") == database_lookups + 1
+
+    with pytest.raises(HTTPException) as exc:
+        await service.apply_discount(test_tenant.id, "GUESS2", Decimal("10"), "USD", client_ip="203.0.113.9")
+    assert exc.value.status_code == 429 and "Retry-After" in exc.value.headers
+
+    # Creating the code bumps the generation, so the negative entry no longer applies
+    discount = Discount(
+        id=uuid4(),
+        tenant_id=test_tenant.id,
+        code="GUESS1",
+        name="Guess",
+        discount_type=DiscountType.fixed_amount,
+        discount_value=Decimal("2"),
+        discount_currency="USD",
+        scope=DiscountScope.order,
+        valid_from=datetime.now(timezone.utc) - timedelta(hours=1),
+        created_by=admin_user.id,
+        modified_by=admin_user.id,
+    )
+    db_session.add(discount)
+    await db_session.commit()
+    await memory.bump_generation("discounts", str(test_tenant.id))
+
+    _, amount = await service.apply_discount(test_tenant.id, "guess1", Decimal("10"), "USD", client_ip="198.51.100.1")
+    assert amount == Decimal("2")
+    assert (await service.get_discount_by_code(test_tenant.id, "GUESS1")).id == discount.id
+
+
+@pytest.mark.asyncio
+async def test_category_service_maintains_paths_and_lists_products_by_subtree(
+    db_session, test_tenant, admin_user
+) -> None:
+    """Paths follow re-parenting and product listing includes descendant categories."""
+    from app.schemas.category import CategoryCreate, CategoryUpdate
+
+    category_tree_cache.invalidate()
+    service = CategoryService(db_session)
+    jewelry = await service.create_category(test_tenant.id, admin_user.id, CategoryCreate(name="Jewelry", slug="jewelry"))
+    rings = await service.create_category(
+        test_tenant.id, admin_user.id, CategoryCreate(name="Rings", slug="rings", parent_id=jewelry.id)
+    )
+    gold = await service.create_category(
+        test_tenant.id, admin_user.id, CategoryCreate(name="Gold", slug="gold", parent_id=rings.id)
+    )
+    watches = await service.create_category(test_tenant.id, admin_user.id, CategoryCreate(name="Watches", slug="watches"))
+    assert gold.path == f"/{jewelry.id}/{rings.id}/{gold.id}/"
+
+    for index, category in enumerate((jewelry, rings, gold, watches)):
+        db_session.add(
+            Product(
+                id=uuid4(),
+                tenant_id=test_tenant.id,
+                name=f"Product {index}",
+                sku=f"CAT-{index}",
+                price_currency="USD",
+                price_amount=Decimal("10.00"),
+                inventory=1,
+                category_id=category.id,
+                created_by=admin_user.id,
+                modified_by=admin_user.id,
+            )
+        )
+    await db_session.commit()
+
+    products = ProductService(db_session)
+    _, total = await products.list_products(test_tenant.id, page=1, page_size=10, category_id=jewelry.id)
+    assert total == 3
+    _, total = await products.list_products(
+        test_tenant.id, page=1, page_size=10, category_id=jewelry.id, include_subcategories=False
+    )
+    assert total == 1
+
+    # Moving Rings under Watches re-paths its whole subtree and refreshes the cached tree
+    await service.update_category(test_tenant.id, rings.id, admin_user.id, CategoryUpdate(parent_id=watches.id))
+    paths = dict((await db_session.execute(select(Category.id, Category.path))).all())
+    assert paths[gold.id] == f"/{watches.id}/{rings.id}/{gold.id}/"
+    tree = await service.get_tree(test_tenant.id)
+    assert [node.name for node in tree.roots] == ["Jewelry", "Watches"]
+    assert [node.name for node in tree.ancestors(gold.id)] == ["Watches", "Rings"]
+    _, total = await products.list_products(test_tenant.id, page=1, page_size=10, category_id=watches.id)
+    assert total == 3
+
+    with pytest.raises(HTTPException) as exc:
+        await service.update_category(test_tenant.id, watches.id, admin_user.id, CategoryUpdate(parent_id=gold.id))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_category_tree_is_reused_within_ttl_when_redis_is_down(db_session, test_tenant, monkeypatch) -> None:
+    """Without a cache generation the tree is rebuilt only once category_tree_ttl passes."""
+    from app.core.config import get_settings
+
+    async def no_generation(namespace, tenant_id):
+        return None
+
+    monkeypatch.setattr(cache_service, "get_generation", no_generation)
+    category_tree_cache.invalidate()
+
+    tree = await category_tree_cache.get(db_session, test_tenant.id)
+    assert await category_tree_cache.get(db_session, test_tenant.id) is tree
+
+    monkeypatch.setattr(get_settings(), "category_tree_ttl", 0)
+    assert await category_tree_cache.get(db_session, test_tenant.id) is not tree
+
+
+@pytest.mark.asyncio
+async def test_storefront_config_is_built_once_per_version(db_session, test_tenant, admin_user, monkeypatch) -> None:
+    """The bundle is served from cache until a master-data write moves it to a new version."""
+    from app.core.serialization import loads
+    from app.schemas.payment_method import PaymentMethodCreate
+    from app.services.payment_methods import PaymentMethodService
+
+    memory = MemoryCache()
+    for name in ("get", "set", "get_generation", "bump_generation"):
+        monkeypatch.setattr(cache_service, name, getattr(memory, name))
+    storefront_config_cache.invalidate()
+    category_tree_cache.invalidate()
+    audit = {"created_by": admin_user.id, "modified_by": admin_user.id}
+    db_session.add_all(
+        [
+            PaymentMethod(id=uuid4(), tenant_id=test_tenant.id, name="Card", type=PaymentMethodType.credit_card, **audit),
+            PaymentMethod(
+                id=uuid4(), tenant_id=test_tenant.id, name="Old", type=PaymentMethodType.cash_on_delivery, is_active=False, **audit
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    first = await storefront_config_cache.get(db_session, test_tenant.id)
+    assert await storefront_config_cache.get(db_session, test_tenant.id) is first
+    payload = loads(first.body)
+    assert payload["version"] == first.version
+    assert [method["name"] for method in payload["paymentMethods"]] == ["Card"]
+    assert payload["shippingMethods"] == [] and payload["categories"] == []
+    assert memory.values[f"storefront_config:{test_tenant.id}:{first.version}"] == payload
+
+    await PaymentMethodService(db_session).create_payment_method(
+        test_tenant.id, admin_user.id, PaymentMethodCreate(name="Wallet", type=PaymentMethodType.digital_wallet)
+    )
+    second = await storefront_config_cache.get(db_session, test_tenant.id)
+    assert second.version != first.version
+    assert [method["name"] for method in loads(second.body)["paymentMethods"]] == ["Card", "Wallet"]
+
+    async def no_generation(namespace, tenant_id):
+        return None
+
+    # Without Redis the last bundle is served until storefront_config_ttl passes
+    monkeypatch.setattr(cache_service, "get_generation", no_generation)
+    assert await storefront_config_cache.get(db_session, test_tenant.id) is second
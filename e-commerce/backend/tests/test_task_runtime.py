@@ -0,0 +1,30 @@
+"""Tests for the Celery worker's per-process async runtime."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import text
+
+from app.tasks import runtime
+
+
+def test_runtime_reuses_loop_and_engine_across_tasks(monkeypatch) -> None:
+    monkeypatch.setattr(
+        runtime.settings, "database_url", runtime.settings.database_url.replace("ecommerce_db", "test_db")
+    )
+
+    async def task() -> tuple[asyncio.AbstractEventLoop, int]:
+        async with runtime.session_factory()() as session:
+            backend_pid = await session.scalar(text("select pg_backend_pid()"))
+        return asyncio.get_running_loop(), backend_pid
+
+    try:
+        first_loop, first_pid = runtime.run(task())
+        second_loop, second_pid = runtime.run(task())
+        assert first_loop is second_loop
+        # The pooled connection survives between tasks
+        assert first_pid == second_pid
+    finally:
+        runtime.shutdown()
+    assert first_loop.is_closed()